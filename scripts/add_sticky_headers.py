@@ -4,7 +4,9 @@ Add sticky headers to long tables (>20 rows)
 Issue 4.2 from UI/UX Audit
 """
 import re
-from pathlib import Path
+import sys
+
+from codemod import Rule, main as codemod_main
 
 def count_table_rows(content, table_start_pos):
     """Count approximate rows in a table"""
@@ -23,12 +25,8 @@ def count_table_rows(content, table_start_pos):
 
     return 0
 
-def add_sticky_header(file_path):
+def add_sticky_header(content, file_path=None):
     """Add stickyHeader: true to tables with many rows"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
     modifications = 0
 
     # Find all table component embeds
@@ -57,33 +55,14 @@ def add_sticky_header(file_path):
 
             content = content[:match.start()] + new_embed + content[match.end():]
             modifications += 1
-            print(f"  Added sticky header to table with {row_count} rows")
-
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return modifications
-
-    return 0
-
-def main():
-    templates_dir = Path('templates')
-    total_modifications = 0
-    files_modified = 0
-
-    # Process all Twig templates
-    for twig_file in templates_dir.rglob('*.twig'):
-        # Skip PDF templates
-        if 'pdf' in str(twig_file).lower():
-            continue
 
-        modifications = add_sticky_header(twig_file)
-        if modifications > 0:
-            print(f"Modified {twig_file.relative_to(templates_dir)}: {modifications} tables")
-            total_modifications += modifications
-            files_modified += 1
+    return content, modifications
 
-    print(f"\nTotal: {total_modifications} sticky headers added to {files_modified} files")
+RULES = [
+    # Skip PDF templates
+    Rule('table-sticky-header', 'templates', '*.twig', add_sticky_header,
+         skip=lambda rel: 'pdf' in str(rel).lower()),
+]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
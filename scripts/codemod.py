@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Shared codemod engine for the template/CSS fixer scripts.
+
+A fixer (fix_*.py, standardize_*.py, add_sticky_headers.py) declares its
+rewrites as Rule objects: the tree and glob they apply to, and a pure
+function `(text, path) -> (new_text, count)` (or `(new_text, count, notes)`
+when it has sites to report for manual review).
+
+run() visits every file any of the rules matches exactly once, applies the
+applicable rules in the order given, spreads the files over a process pool,
+and writes each changed file atomically (temp file next to it + rename), so
+an interrupted run never leaves a half-written template. With dry_run it
+writes nothing and returns a unified diff per changed file instead.
+
+ClassMigration renames class-name tokens (FA -> BI icons, bi-* -> Aurora
+fa-icon--*) from a mapping in one linear pass and collects the names of
+the same family it has no mapping for.
+
+Every fixer's command line comes from main(): --dry-run, --jobs N.
+ui_audit_sweep.py runs all fixers' rules in one pass.
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+PARALLEL_MIN = 64  # fewer files than this are not worth a pool
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    root: str  # directory relative to the repo root
+    pattern: str  # glob below `root`
+    apply: Callable[[str, Path], tuple]
+    recursive: bool = True  # rglob (False: only files directly in `root`)
+    skip: Callable[[Path], bool] | None = None  # gets the repo-relative path
+
+    def files(self, base: Path) -> list[Path]:
+        top = base / self.root
+        if not top.is_dir():
+            return []
+        found = top.rglob(self.pattern) if self.recursive else top.glob(self.pattern)
+        return [p for p in found
+                if p.is_file() and not (self.skip and self.skip(p.relative_to(base)))]
+
+
+class ClassMigration:
+    """One-pass rename of class-name tokens through a {old: new} mapping.
+
+    The mapping keys form one alternation, longest first, bounded so a key
+    only matches a whole token (`fa-file` never rewrites `fa-file-alt`); each
+    hit is dispatched through the dict. Other tokens starting with `family`
+    are left alone and reported as unmapped. `prefixes` ({'fas': 'bi'}) are
+    style tokens renamed only where a mapped token follows them, so a
+    half-migrated `bi-<unmapped>` never loses its `bi`. With `paired=True`
+    a token is only touched right after one of the prefixes (`bi bi-x`); bare
+    tokens are data, e.g. icon names a macro still prefixes itself.
+    """
+
+    def __init__(self, mapping: dict[str, str], family: str, prefixes: dict[str, str] | None = None,
+                 paired: bool = False):
+        self.mapping = dict(mapping)
+        self.prefixes = dict(prefixes or {})
+        keys = "|".join(map(re.escape, sorted(self.mapping, key=len, reverse=True))) or "(?!)"
+        fam = re.escape(family)
+        styles = "|".join(map(re.escape, sorted(self.prefixes, key=len, reverse=True))) or "(?!)"
+        if paired:
+            alternatives = [rf"(?P<pair>(?:{styles})\s+(?:{keys}))(?![\w-])",
+                            rf"(?:{styles})\s+(?P<miss>{fam}[a-z0-9-]+)(?![\w-])"]
+        else:
+            alternatives = [rf"(?P<prefix>{styles})(?=\s+(?:{keys})(?![\w-]))",
+                            rf"(?P<hit>{keys})(?![\w-])", rf"(?P<miss>{fam}[a-z0-9-]+)(?![\w-])"]
+        self.pattern = re.compile(r"(?<![\w-])(?:" + "|".join(alternatives) + ")")
+
+    def apply(self, text: str) -> tuple[str, dict[str, int], set[str]]:
+        """(new text, {old: rewrites}, unmapped family tokens)."""
+        counts: dict[str, int] = {}
+        unmapped: set[str] = set()
+
+        def dispatch(m: re.Match) -> str:
+            if m.lastgroup == "miss":
+                unmapped.add(m.group("miss"))
+                return m.group(0)
+            if m.lastgroup == "pair":
+                style, sep, token = re.split(r"(\s+)", m.group(0), maxsplit=1)
+                counts[token] = counts.get(token, 0) + 1
+                return f"{self.prefixes[style]}{sep}{self.mapping[token]}"
+            token = m.group(0)
+            counts[token] = counts.get(token, 0) + 1
+            return (self.prefixes if m.lastgroup == "prefix" else self.mapping)[token]
+
+        return self.pattern.sub(dispatch, text), counts, unmapped
+
+
+@dataclass
+class FileResult:
+    path: Path
+    counts: dict[str, int] = field(default_factory=dict)  # rule -> rewrites
+    notes: list[str] = field(default_factory=list)
+    diff: str = ""
+    changed: bool = False
+    error: str = ""
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace `path` with `text` via a temp file in the same directory."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+            fh.write(text)
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def rewrite(path: Path, rules: list[Rule], base: Path = ROOT, dry_run: bool = False) -> FileResult:
+    """Apply `rules` in order to one file; write it (or diff it) if it changed."""
+    result = FileResult(path)
+    try:
+        with open(path, encoding="utf-8", newline="") as fh:
+            original = fh.read()
+    except (OSError, UnicodeDecodeError) as exc:
+        result.error = str(exc)
+        return result
+    text = original
+    for rule in rules:
+        try:
+            text, count, *rest = rule.apply(text, path)
+        except Exception as exc:  # a broken rule must not take the sweep down
+            result.error = f"{rule.name}: {exc!r}"
+            return result
+        if count:
+            result.counts[rule.name] = count
+        for notes in rest:
+            result.notes.extend(f"{rule.name}: {n}" for n in notes)
+    if text == original:
+        return result
+    result.changed = True
+    rel = path.relative_to(base).as_posix()
+    if dry_run:
+        result.diff = "".join(difflib.unified_diff(
+            original.splitlines(keepends=True), text.splitlines(keepends=True),
+            fromfile=f"a/{rel}", tofile=f"b/{rel}"))
+    else:
+        try:
+            write_atomic(path, text)
+        except OSError as exc:
+            result.changed = False
+            result.error = str(exc)
+    return result
+
+
+# Rules handed to forked workers (functions in them need not pickle).
+_WORKER_RULES: list[Rule] = []
+
+
+def _visit(job: tuple[str, tuple[int, ...], str, bool]) -> FileResult:
+    path, which, base, dry_run = job
+    return rewrite(Path(path), [_WORKER_RULES[i] for i in which], Path(base), dry_run)
+
+
+def plan(rules: list[Rule], base: Path = ROOT) -> dict[Path, tuple[int, ...]]:
+    """{file: indexes of the rules that apply to it}, files in path order."""
+    todo: dict[Path, list[int]] = {}
+    for i, rule in enumerate(rules):
+        for path in rule.files(base):
+            todo.setdefault(path, []).append(i)
+    return {path: tuple(todo[path]) for path in sorted(todo)}
+
+
+def run(rules: list[Rule], base: Path = ROOT, dry_run: bool = False,
+        jobs: int | None = None) -> list[FileResult]:
+    """One pass over every file the rules match; results in path order."""
+    global _WORKER_RULES
+    todo = plan(rules, base)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(todo) >= PARALLEL_MIN and "fork" in multiprocessing.get_all_start_methods():
+        _WORKER_RULES = list(rules)
+        try:
+            jobs_in = [(str(p), which, str(base), dry_run) for p, which in todo.items()]
+            with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("fork")) as pool:
+                return list(pool.map(_visit, jobs_in, chunksize=max(1, len(jobs_in) // (4 * jobs))))
+        finally:
+            _WORKER_RULES = []
+    return [rewrite(p, [rules[i] for i in which], base, dry_run) for p, which in todo.items()]
+
+
+def report(results: list[FileResult], rules: list[Rule], base: Path = ROOT, dry_run: bool = False) -> int:
+    """Print per-file changes (diffs in dry-run mode) and totals; return the exit code."""
+    totals = {rule.name: 0 for rule in rules}
+    changed = errors = 0
+    for r in results:
+        rel = r.path.relative_to(base)
+        if r.error:
+            errors += 1
+            print(f"ERROR {rel}: {r.error}")
+        if r.changed:
+            changed += 1
+            detail = ", ".join(f"{name}: {n}" for name, n in r.counts.items())
+            if dry_run:
+                sys.stdout.write(r.diff)
+            else:
+                print(f"Fixed {rel}" + (f" ({detail})" if detail else ""))
+        for name, n in r.counts.items():
+            totals[name] += n
+        for note in r.notes:
+            print(f"  {rel}: {note}")
+    print(f"\n{'DRY RUN - ' if dry_run else ''}{changed} of {len(results)} file(s) "
+          f"{'would change' if dry_run else 'changed'}")
+    for name, n in totals.items():
+        print(f"  {name}: {n}")
+    return 1 if errors else 0
+
+
+def parse_args(description: str | None, argv: list[str] | None = None,
+               ap: argparse.ArgumentParser | None = None) -> argparse.Namespace:
+    ap = ap or argparse.ArgumentParser(description=description,
+                                       formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dry-run", action="store_true", help="print a unified diff, write nothing")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    return ap.parse_args(argv)
+
+
+def main(rules: list[Rule], description: str | None = None, argv: list[str] | None = None) -> int:
+    args = parse_args(description, argv)
+    results = run(rules, dry_run=args.dry_run, jobs=args.jobs)
+    return report(results, rules, dry_run=args.dry_run)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Find UI concepts that are translated differently across domains.
+
+Every EN message of the catalogue (via translation_memory.py) is cut into
+character 3-gram shingles and summarised by a MinHash signature; the
+signatures are banded into locality-sensitive hash buckets, so only messages
+that share a bucket are ever compared, never all pairs. Candidates whose
+shingle sets overlap by at least --threshold (Jaccard), and messages equal up
+to case and trailing punctuation, form a cluster of near-identical EN
+sources ("Save changes", "Save Changes."). A cluster is reported when its DE
+translations, shingled the same way, split into groups that are not
+near-identical themselves ("Änderungen speichern" vs "Speichern").
+
+Signatures and buckets are pickled to var/cache/translation_variants.pickle;
+a run only hashes EN messages it has not seen and drops the ones that are
+gone.
+
+Usage:
+    python3 scripts/find_translation_variants.py [--threshold 0.8] [--limit 50]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import random
+import re
+import sys
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+
+import translation_memory
+
+CACHE = translation_memory.ROOT / 'var' / 'cache' / 'translation_variants.pickle'
+FORMAT = 2
+HASHES = 32
+# 8 bands x 4 rows: a pair shares a bucket with p = 1 - (1 - J**4)**8,
+# about 0.985 at J = 0.8 (the default threshold) and 0.999 at J = 0.9
+BANDS = 8
+ROWS = HASHES // BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x1505)  # fixed: cached signatures must stay comparable
+_COEFFS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(HASHES)]
+
+
+def normalize(text):
+    text = re.sub(r'\s+', ' ', text.lower()).strip()
+    return text.rstrip('.:!… ')
+
+
+@lru_cache(maxsize=None)
+def shingles(text):
+    padded = f" {normalize(text)} "
+    return frozenset(padded[i:i + 3] for i in range(max(1, len(padded) - 2)))
+
+
+def signature(text):
+    xs = [zlib.crc32(s.encode('utf-8')) for s in shingles(text)]
+    return tuple(min([(a * x + b) % _PRIME for x in xs]) for a, b in _COEFFS)
+
+
+def band_keys(sig):
+    return [(band, sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def jaccard(a, b):
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+class Index:
+    """MinHash signatures and LSH buckets of the EN messages seen so far."""
+
+    def __init__(self, signatures=None, buckets=None):
+        self.signatures = signatures or {}  # message -> signature
+        self.buckets = buckets or {}  # (band, rows) -> {message}
+
+    def sync(self, messages):
+        """Make the index hold exactly `messages`."""
+        for text in self.signatures.keys() - messages:
+            for band in band_keys(self.signatures.pop(text)):
+                self.buckets[band].discard(text)
+                if not self.buckets[band]:
+                    del self.buckets[band]
+        for text in messages - self.signatures.keys():
+            sig = self.signatures[text] = signature(text)
+            for band in band_keys(sig):
+                self.buckets.setdefault(band, set()).add(text)
+
+    def candidates(self):
+        pairs = set()
+        for members in self.buckets.values():
+            if len(members) > 1:
+                ordered = sorted(members)
+                pairs.update((a, b) for i, a in enumerate(ordered) for b in ordered[i + 1:])
+        return pairs
+
+
+def load_index(cache=CACHE):
+    try:
+        with open(cache, 'rb') as fh:
+            fmt, signatures, buckets = pickle.load(fh)
+        if fmt == FORMAT:
+            return Index(signatures, buckets)
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+        pass
+    return Index()
+
+
+def save_index(index, cache=CACHE):
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as fh:
+        pickle.dump((FORMAT, index.signatures, index.buckets), fh, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache)
+
+
+def group(items, similar):
+    """Connected components of `items` under the `similar` pairs (union-find)."""
+    parent = {item: item for item in items}
+
+    def find(item):
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for a, b in similar:
+        parent[find(a)] = find(b)
+    groups = defaultdict(list)
+    for item in items:
+        groups[find(item)].append(item)
+    return list(groups.values())
+
+
+def variants(memory, threshold=0.8, cache=CACHE):
+    """[(EN messages, {DE message: [(domain, key), ...]})] for every cluster
+    of near-identical EN messages whose DE translations diverge."""
+    uses = defaultdict(lambda: defaultdict(list))  # EN -> DE -> [(domain, key)]
+    for domain in sorted(memory.domains):
+        en, de = memory.domains[domain]
+        for key, source in en.items():
+            target = de.get(key)
+            if target and normalize(source) and not translation_memory.is_placeholder(source + target):
+                uses[source][target].append((domain, key))
+
+    sources = {source for source in uses if len(normalize(source)) >= 3}  # shorter: exact only
+    index = load_index(cache)
+    index.sync(sources)
+    save_index(index, cache)
+
+    def near(a, b):
+        return jaccard(a, b) >= threshold
+
+    def likely(a, b):  # the signature estimate is within noise of the threshold
+        sa, sb = index.signatures[a], index.signatures[b]
+        return sum(x == y for x, y in zip(sa, sb)) >= (threshold - 0.25) * HASHES
+
+    by_normal = defaultdict(list)
+    for source in uses:
+        by_normal[normalize(source)].append(source)
+    similar = [(a, b) for a, b in index.candidates() if likely(a, b) and near(a, b)]
+    similar += [(same[0], other) for same in by_normal.values() for other in same[1:]]
+    found = []
+    for cluster in group(sorted(uses), similar):
+        translations = defaultdict(list)
+        for source in cluster:
+            for target, where in uses[source].items():
+                translations[target].extend(where)
+        if len(translations) < 2:
+            continue
+        targets = sorted(translations)
+        de_groups = group(targets, [(a, b) for i, a in enumerate(targets) for b in targets[i + 1:]
+                                    if near(a, b)])
+        if len(de_groups) > 1:
+            found.append((sorted(cluster), dict(translations)))
+    found.sort(key=lambda item: (-sum(map(len, item[1].values())), item[0]))
+    return found
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--threshold', type=float, default=0.8, help='Jaccard similarity for "near-identical"')
+    ap.add_argument('--limit', type=int, default=50, help='clusters to print (0: all)')
+    args = ap.parse_args()
+
+    found = variants(translation_memory.load(), args.threshold)
+    print(f"Found {len(found)} EN message clusters with divergent DE translations\n")
+    for sources, translations in found[:args.limit or None]:
+        print(' | '.join(sources))
+        for target, where in sorted(translations.items(), key=lambda item: -len(item[1])):
+            sample = ', '.join(f"{domain}:{key}" for domain, key in where[:3])
+            more = f" (+{len(where) - 3})" if len(where) > 3 else ''
+            print(f"    {len(where):3d}x {target}    [{sample}{more}]")
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,15 +2,13 @@
 """
 Fix missing ARIA labels on btn-close buttons
 """
-import os
 import re
-from pathlib import Path
+import sys
 
-def fix_close_buttons(file_path):
-    """Add aria-label to close buttons"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from codemod import Rule, main as codemod_main
 
+def fix_close_buttons(content, file_path=None):
+    """Add aria-label to close buttons"""
     original_content = content
 
     # Fix alert close buttons
@@ -34,22 +32,9 @@ def fix_close_buttons(file_path):
         content
     )
 
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    return False
-
-def main():
-    templates_dir = Path('templates')
-    fixed_count = 0
-
-    for twig_file in templates_dir.rglob('*.twig'):
-        if fix_close_buttons(twig_file):
-            print(f"Fixed: {twig_file}")
-            fixed_count += 1
+    return content, int(content != original_content)
 
-    print(f"\nTotal files fixed: {fixed_count}")
+RULES = [Rule('aria-close-label', 'templates', '*.twig', fix_close_buttons)]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
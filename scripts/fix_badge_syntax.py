@@ -4,7 +4,9 @@ Fix badge syntax for Bootstrap 5 consistency
 Converts old badge-{variant} to bg-{variant} format
 """
 import re
-from pathlib import Path
+import sys
+
+from codemod import Rule, main as codemod_main
 
 # Badge variant conversions (Bootstrap 4 → Bootstrap 5)
 BADGE_CONVERSIONS = [
@@ -32,12 +34,8 @@ CONDITIONAL_BADGE_PATTERNS = [
     ),
 ]
 
-def fix_badges_in_file(file_path):
+def fix_badges_in_file(content, file_path=None):
     """Convert badge syntax to Bootstrap 5 format"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
     replacements_made = 0
 
     # Fix simple badge class conversions
@@ -54,31 +52,13 @@ def fix_badges_in_file(file_path):
             content = re.sub(pattern, replacement, content, flags=re.DOTALL)
             replacements_made += matches
 
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return replacements_made
-
-    return 0
-
-def main():
-    templates_dir = Path('templates')
-    total_replacements = 0
-    files_modified = 0
+    return content, replacements_made
 
-    # Process all Twig templates
-    for twig_file in templates_dir.rglob('*.twig'):
-        # Skip the badge component itself
-        if twig_file.name == '_badge.html.twig':
-            continue
-
-        replacements = fix_badges_in_file(twig_file)
-        if replacements > 0:
-            print(f"Fixed {twig_file.relative_to(templates_dir)}: {replacements} replacements")
-            total_replacements += replacements
-            files_modified += 1
-
-    print(f"\nTotal: {total_replacements} badge syntax fixes in {files_modified} files")
+RULES = [
+    # Skip the badge component itself
+    Rule('badge-bs5-syntax', 'templates', '*.twig', fix_badges_in_file,
+         skip=lambda rel: rel.name == '_badge.html.twig'),
+]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
@@ -5,14 +5,12 @@ Standardize card headers for consistency
 - Always include mb-0 class to prevent extra spacing
 """
 import re
-from pathlib import Path
+import sys
 
-def fix_card_headers(file_path):
-    """Standardize card header heading levels and spacing"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from codemod import Rule, main as codemod_main
 
-    original_content = content
+def fix_card_headers(content, file_path=None):
+    """Standardize card header heading levels and spacing"""
     replacements_made = 0
 
     # Pattern 1: <h4 ... in card-header → <h5 ...
@@ -82,31 +80,13 @@ def fix_card_headers(file_path):
     content = re.sub(r'</h4>', '</h5>', content)
     content = re.sub(r'</h6>', '</h5>', content)
 
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return replacements_made
-
-    return 0
-
-def main():
-    templates_dir = Path('templates')
-    total_replacements = 0
-    files_modified = 0
-
-    # Process all Twig templates
-    for twig_file in templates_dir.rglob('*.twig'):
-        # Skip component templates (they're already correct)
-        if twig_file.name == '_card.html.twig':
-            continue
-
-        replacements = fix_card_headers(twig_file)
-        if replacements > 0:
-            print(f"Fixed {twig_file.relative_to(templates_dir)}: {replacements} headers")
-            total_replacements += replacements
-            files_modified += 1
+    return content, replacements_made
 
-    print(f"\nTotal: {total_replacements} card header fixes in {files_modified} files")
+RULES = [
+    # Skip component templates (they're already correct)
+    Rule('card-header-h5', 'templates', '*.twig', fix_card_headers,
+         skip=lambda rel: rel.name == '_card.html.twig'),
+]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
@@ -3,7 +3,9 @@
 Fix hardcoded colors for dark mode compatibility
 """
 import re
-from pathlib import Path
+import sys
+
+from codemod import Rule, main as codemod_main
 
 # Color mapping for dark mode compatibility
 COLOR_REPLACEMENTS = {
@@ -47,12 +49,8 @@ COLOR_REPLACEMENTS = {
     r'background:\s*#60a5fa': 'background: var(--color-primary, #60a5fa)',
 }
 
-def fix_colors_in_file(file_path):
+def fix_colors_in_file(content, file_path=None):
     """Replace hardcoded colors with CSS variables"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
     replacements_made = 0
 
     for pattern, replacement in COLOR_REPLACEMENTS.items():
@@ -61,29 +59,12 @@ def fix_colors_in_file(file_path):
             content = re.sub(pattern, replacement, content)
             replacements_made += matches
 
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return replacements_made
-
-    return 0
-
-def main():
-    assets_dir = Path('assets/styles')
-    total_replacements = 0
-    files_modified = 0
-
-    for css_file in assets_dir.glob('*.css'):
-        if css_file.name == 'dark-mode.css':
-            continue  # Skip dark mode file
-
-        replacements = fix_colors_in_file(css_file)
-        if replacements > 0:
-            print(f"Fixed {css_file.name}: {replacements} replacements")
-            total_replacements += replacements
-            files_modified += 1
+    return content, replacements_made
 
-    print(f"\nTotal: {total_replacements} color replacements in {files_modified} files")
+RULES = [
+    Rule('dark-mode-color-vars', 'assets/styles', '*.css', fix_colors_in_file, recursive=False,
+         skip=lambda rel: rel.name == 'dark-mode.css'),  # Skip dark mode file
+]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
@@ -14,9 +14,9 @@ All buggy calls are single-line — safe to process line-by-line.
 
 import re
 import sys
-from pathlib import Path
 
-TEMPLATES_DIR = Path("/Users/michaelbanda/Nextcloud/www/Little-ISMS-Helper/templates")
+from codemod import Rule, main as codemod_main
+
 EMBED_PATH = "_components/_fa_alert.html.twig"
 
 
@@ -207,11 +207,11 @@ def get_indent(line: str) -> str:
     return m.group(1) if m else ''
 
 
-def process_file(filepath: Path) -> tuple[int, list[str]]:
+def convert_alerts(content: str, filepath=None) -> tuple[str, int, list[str]]:
     """
-    Process a single file. Returns (count_converted, skipped_messages).
+    Convert one template. Returns (new_content, count_converted, skipped_messages).
     """
-    lines = filepath.read_text(encoding='utf-8').split('\n')
+    lines = content.split('\n')
     new_lines = []
     converted = 0
     skipped = []
@@ -270,51 +270,13 @@ def process_file(filepath: Path) -> tuple[int, list[str]]:
         converted += 1
 
     if converted > 0:
-        filepath.write_text('\n'.join(new_lines), encoding='utf-8')
-
-    return converted, skipped
-
-
-def main():
-    # Get affected files first
-    affected = []
-    for f in sorted(TEMPLATES_DIR.rglob('*.html.twig')):
-        content = f.read_text(encoding='utf-8')
-        if any(line_needs_conversion(line) for line in content.split('\n')):
-            count = sum(1 for line in content.split('\n') if line_needs_conversion(line))
-            affected.append((f, count))
-
-    print(f"Found {len(affected)} files with sites to convert\n")
-
-    total_files = 0
-    total_sites = 0
-    all_skipped = []
-
-    for filepath, num in affected:
-        rel = filepath.relative_to(TEMPLATES_DIR.parent)
-        print(f"[{filepath.name}] {num} site(s)...", end=' ', flush=True)
-
-        count, skipped = process_file(filepath)
-        total_sites += count
-        if count > 0:
-            total_files += 1
-            print(f"OK ({count} converted)")
-        else:
-            print(f"(0 converted)")
+        content = '\n'.join(new_lines)
 
-        for s in skipped:
-            all_skipped.append(f"  {rel}: {s}")
-            print(f"  SKIP: {s}")
+    return content, converted, skipped
 
-    print(f"\n{'='*60}")
-    print(f"Files converted: {total_files}")
-    print(f"Sites converted: {total_sites}")
 
-    if all_skipped:
-        print(f"\nSKIPPED ({len(all_skipped)}):")
-        for s in all_skipped:
-            print(s)
+RULES = [Rule('fa-alert-embed-body', 'templates', '*.html.twig', convert_alerts)]
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
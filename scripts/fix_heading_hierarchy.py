@@ -5,9 +5,9 @@ Changes start and end tags together to avoid mismatches.
 """
 
 import re
-import os
 import sys
-from pathlib import Path
+
+from codemod import Rule, parse_args, report, run
 
 def fix_heading_in_content(content: str, old_tag: str, new_tag: str, context_pattern: str = None) -> tuple:
     """
@@ -45,62 +45,43 @@ def validate_heading_balance(content: str) -> list:
     return issues
 
 
-def main():
-    rules = [
-        {'old_tag': 'h2', 'new_tag': 'h3', 'context_pattern': r'card-header'}
-    ]
-
-    templates_dir = Path('templates')
-    twig_files = list(templates_dir.rglob('*.twig'))
-    print(f"Found {len(twig_files)} Twig files")
-
-    dry_run = '--dry-run' in sys.argv
-    results = []
+HEADING_RULES = [
+    {'old_tag': 'h2', 'new_tag': 'h3', 'context_pattern': r'card-header'}
+]
 
-    for filepath in sorted(twig_files):
-        if '.bak' in str(filepath):
-            continue
 
-        try:
-            content = filepath.read_text(encoding='utf-8')
-            original = content
-            total_changes = 0
-            details = []
+def fix_headings(content: str, file_path=None) -> tuple:
+    total_changes = 0
+    for rule in HEADING_RULES:
+        content, count = fix_heading_in_content(
+            content, rule['old_tag'], rule['new_tag'], rule.get('context_pattern')
+        )
+        total_changes += count
+    return content, total_changes
 
-            for rule in rules:
-                content, count = fix_heading_in_content(
-                    content, rule['old_tag'], rule['new_tag'], rule.get('context_pattern')
-                )
-                if count > 0:
-                    total_changes += count
-                    details.append(f"{rule['old_tag']}>{rule['new_tag']}: {count}")
 
-            if total_changes > 0:
-                if not dry_run:
-                    filepath.write_text(content, encoding='utf-8')
-                results.append({'file': str(filepath), 'changes': total_changes, 'details': details})
+RULES = [
+    Rule('card-header-h2-h3', 'templates', '*.twig', fix_headings,
+         skip=lambda rel: '.bak' in str(rel)),
+]
 
-        except Exception as e:
-            print(f"ERROR: {filepath}: {e}")
 
-    print(f"\n{'DRY RUN - ' if dry_run else ''}Results:")
-    print("-" * 60)
-
-    for r in results:
-        print(f"{r['file']}: {', '.join(r['details'])}")
-
-    print("-" * 60)
-    print(f"Total: {sum(r['changes'] for r in results)} changes in {len(results)} files")
+def main():
+    args = parse_args(__doc__)
+    results = run(RULES, dry_run=args.dry_run, jobs=args.jobs)
+    print(f"Found {len(results)} Twig files")
+    rc = report(results, RULES, dry_run=args.dry_run)
 
-    if not dry_run and results:
+    changed = [r.path for r in results if r.changed]
+    if not args.dry_run and changed:
         print("\nValidating...")
-        for r in results:
-            content = Path(r['file']).read_text(encoding='utf-8')
-            issues = validate_heading_balance(content)
+        for path in changed:
+            issues = validate_heading_balance(path.read_text(encoding='utf-8'))
             if issues:
-                print(f"  WARNING {r['file']}: {issues}")
+                print(f"  WARNING {path}: {issues}")
         print("Done!")
+    return rc
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 """
 Improve context-sensitive German translations.
+
+A value is replaced from CONTEXT_TRANSLATIONS, or, when it still looks like
+untranslated English, by the wording the rest of the catalogue already uses
+for that EN message (translation_memory.py).
 """
 import re
 import sys
 from pathlib import Path
 
+import translation_memory
+from find_untranslated_de import is_likely_english
+
 # Context-aware translation mappings
 CONTEXT_TRANSLATIONS = {
     # Actions & Buttons
@@ -220,32 +227,40 @@ CONTEXT_TRANSLATIONS = {
     'Confirmation Required': 'Bestätigung erforderlich',
 }
 
-def improve_line(line):
+# YAML key: value pairs
+KEY_VALUE = re.compile(r'^(\s*)([\w.]+):\s*(["\']?)(.+?)(["\']?)\s*$')
+
+
+def improve_line(line, memory=None):
     """Improve a single line if it contains untranslated English."""
-    # Match YAML key: value pairs
-    match = re.match(r'^(\s*)([\w.]+):\s*(["\']?)(.+?)(["\']?)\s*$', line)
+    if ':' not in line:
+        return line
+    match = KEY_VALUE.match(line)
     if not match:
         return line
 
     indent, key, quote_start, value, quote_end = match.groups()
 
-    # Check if value is in our translation dictionary
-    if value in CONTEXT_TRANSLATIONS:
-        new_value = CONTEXT_TRANSLATIONS[value]
+    # Check if value is in our translation dictionary, then in the memory
+    new_value = CONTEXT_TRANSLATIONS.get(value)
+    if new_value is None and memory is not None and is_likely_english(value):
+        new_value = memory.exact.get(value)
+    if new_value is not None:
         # Preserve quotes if they were there
-        if quote_start or any(c in new_value for c in [':', ',', '#', '-']):
+        if quote_start or any(c in new_value for c in [':', ',', '#', '-', "'", '%']):
+            new_value = new_value.replace("'", "''")
             return f"{indent}{key}: '{new_value}'\n"
         else:
             return f"{indent}{key}: {new_value}\n"
 
     return line
 
-def improve_file(file_path):
+def improve_file(file_path, memory=None):
     """Improve translations in a single file."""
     with open(file_path, 'r', encoding='utf-8') as f:
         lines = f.readlines()
 
-    improved_lines = [improve_line(line) for line in lines]
+    improved_lines = [improve_line(line, memory) for line in lines]
 
     changes = sum(1 for old, new in zip(lines, improved_lines) if old != new)
 
@@ -257,12 +272,13 @@ def improve_file(file_path):
 
 def main():
     translations_dir = Path('translations')
+    memory = translation_memory.load(translations_dir)
 
     total_changes = 0
     files_changed = 0
 
     for yaml_file in sorted(translations_dir.glob('*.de.yaml')):
-        changes = improve_file(yaml_file)
+        changes = improve_file(yaml_file, memory)
         if changes > 0:
             print(f"{yaml_file.name}: {changes} improvements")
             total_changes += changes
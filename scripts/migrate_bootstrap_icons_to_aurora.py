@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migrate Bootstrap-Icons classes to Aurora icon classes
+(the cleanup scripts/quality/check_no_bi_classes.py guards)
+
+`bi bi-<name>` becomes `fa-icon fa-icon--<name>` wherever fairy-aurora-icons.css
+defines `.fa-icon--<name>` (canonical name or Bootstrap-name alias). bi-*
+names without an Aurora class are left alone and listed for manual mapping.
+Same scope as the gate: templates, src/ PHP (not src/Lifecycle) and the
+Stimulus controllers. Only `bi bi-<name>` pairs are rewritten: a bare
+`bi-<name>` is an icon name that a macro such as _alert.html.twig strips
+and prefixes itself. One pass per file via codemod.ClassMigration.
+"""
+import re
+import sys
+
+from codemod import ROOT, ClassMigration, Rule, main as codemod_main
+
+ICONS_CSS = ROOT / 'assets' / 'styles' / 'fairy-aurora-icons.css'
+SKIP_DIRS = {'vendor', 'node_modules', 'var', '.claude', 'Fixtures', 'migrations', 'docs'}
+
+
+def aurora_mapping():
+    css = ICONS_CSS.read_text(encoding='utf-8') if ICONS_CSS.is_file() else ''
+    names = set(re.findall(r"\.fa-icon--([a-z0-9][a-z0-9-]*)", css))
+    return {f'bi-{name}': f'fa-icon--{name}' for name in names}
+
+
+BI_TO_AURORA = ClassMigration(aurora_mapping(), 'bi-', prefixes={'bi': 'fa-icon'}, paired=True)
+
+
+def migrate_icons(content, file_path=None):
+    if 'bi' not in content:
+        return content, 0
+    content, counts, unmapped = BI_TO_AURORA.apply(content)
+    notes = [f"no Aurora icon for: {', '.join(sorted(unmapped))}"] if unmapped else []
+    return content, sum(counts.values()), notes
+
+
+def skipped(rel):
+    return bool(SKIP_DIRS & set(rel.parts)) or rel.as_posix().startswith('src/Lifecycle/')
+
+
+RULES = [
+    Rule('bi-to-aurora-twig', 'templates', '*.html.twig', migrate_icons, skip=skipped),
+    Rule('bi-to-aurora-php', 'src', '*.php', migrate_icons, skip=skipped),
+    Rule('bi-to-aurora-js', 'assets/controllers', '*.js', migrate_icons, skip=skipped),
+]
+
+if __name__ == '__main__':
+    sys.exit(codemod_main(RULES, __doc__))
@@ -2,9 +2,16 @@
 """
 Migrate FontAwesome icons to Bootstrap Icons
 Issue 6.1 from UI/UX Audit - Standardize on Bootstrap Icons only
+
+One pass per template (codemod.ClassMigration): every mapped fa-* class
+token is replaced through the mapping, fas/far/fab before an fa-* class
+becomes bi, and fa-* tokens without a mapping are collected for review.
+Dry run (unified diff) unless --execute is given.
 """
-import re
-from pathlib import Path
+import argparse
+import sys
+
+from codemod import ClassMigration, Rule, parse_args, report, run
 
 # FontAwesome to Bootstrap Icons mapping
 FA_TO_BI_MAPPING = {
@@ -118,57 +125,25 @@ FA_TO_BI_MAPPING = {
     'fa-xs': '',
 }
 
-def find_fontawesome_icons(file_path):
-    """Find all FontAwesome icon usage in a file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find all fa-* class names
-    fa_pattern = r'(?:fas|far|fab|fa)\s+(fa-[a-z0-9\-]+)'
-    matches = re.findall(fa_pattern, content)
-
-    # Also find standalone fa-* classes
-    standalone_pattern = r'class="[^"]*\b(fa-[a-z0-9\-]+)\b[^"]*"'
-    standalone_matches = re.findall(standalone_pattern, content)
-
-    all_icons = set(matches + standalone_matches)
-    return all_icons
+UNMAPPED = "⚠️  Unmapped icons: "
+FA_TO_BI = ClassMigration(FA_TO_BI_MAPPING, 'fa-', prefixes={'fas': 'bi', 'far': 'bi', 'fab': 'bi'})
 
-def migrate_icons(file_path, dry_run=True):
+def migrate_icons(content, file_path=None):
     """Migrate FontAwesome icons to Bootstrap Icons"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
-    replacements = []
-
-    # Replace FontAwesome style classes (fas, far, fab) with bi
-    content = re.sub(r'\b(fas|far|fab)\s+', 'bi ', content)
-
-    # Replace individual FontAwesome icon classes
-    for fa_icon, bi_icon in FA_TO_BI_MAPPING.items():
-        if fa_icon in content:
-            content = content.replace(fa_icon, bi_icon)
-            replacements.append((fa_icon, bi_icon))
-
-    # Check for unmapped icons by parsing the updated content
-    fa_pattern = r'(?:fas|far|fab|fa)\s+(fa-[a-z0-9\-]+)'
-    remaining_fa_matches = re.findall(fa_pattern, content)
-    standalone_pattern = r'class="[^"]*\b(fa-[a-z0-9\-]+)\b[^"]*"'
-    remaining_standalone = re.findall(standalone_pattern, content)
-    remaining_fa = set(remaining_fa_matches + remaining_standalone)
-    unmapped = [icon for icon in remaining_fa if icon not in FA_TO_BI_MAPPING]
+    content, counts, unmapped = FA_TO_BI.apply(content)
+    notes = [f"{fa_icon} → {FA_TO_BI_MAPPING.get(fa_icon, 'bi') or '(removed)'} ×{n}"
+             for fa_icon, n in sorted(counts.items())]
+    if unmapped:
+        notes.append(UNMAPPED + ', '.join(sorted(unmapped)))
+    return content, sum(counts.values()), notes
 
-    if not dry_run and content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-    return replacements, unmapped
+RULES = [Rule('fa-to-bi', 'templates', '*.twig', migrate_icons)]
 
 def main():
-    import sys
-
-    dry_run = '--execute' not in sys.argv
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--execute', action='store_true', help='write the changes (default: dry run)')
+    args = parse_args(__doc__, ap=ap)
+    dry_run = args.dry_run or not args.execute
 
     if dry_run:
         print("=== FontAwesome to Bootstrap Icons Migration (DRY RUN) ===\n")
@@ -176,31 +151,14 @@ def main():
     else:
         print("=== FontAwesome to Bootstrap Icons Migration (EXECUTING) ===\n")
 
-    templates_dir = Path('templates')
-    total_replacements = 0
-    files_modified = 0
-    all_unmapped = set()
-
-    for twig_file in templates_dir.rglob('*.twig'):
-        fa_icons = find_fontawesome_icons(twig_file)
+    results = run(RULES, dry_run=dry_run, jobs=args.jobs)
+    rc = report(results, RULES, dry_run=dry_run)
 
-        if fa_icons:
-            replacements, unmapped = migrate_icons(twig_file, dry_run=dry_run)
-
-            if replacements:
-                print(f"\n{twig_file.relative_to(templates_dir)}:")
-                for fa_icon, bi_icon in replacements:
-                    print(f"  {fa_icon} → {bi_icon}")
-                total_replacements += len(replacements)
-                files_modified += 1
-
-            if unmapped:
-                print(f"  ⚠️  Unmapped icons: {', '.join(unmapped)}")
-                all_unmapped.update(unmapped)
-
-    print(f"\n\n=== Summary ===")
-    print(f"Files with FontAwesome icons: {files_modified}")
-    print(f"Total icon replacements: {total_replacements}")
+    all_unmapped = set()
+    for r in results:
+        for note in r.notes:
+            _, _, listed = note.partition(UNMAPPED)
+            all_unmapped.update(i for i in listed.split(', ') if i)
 
     if all_unmapped:
         print(f"\n⚠️  Unmapped FontAwesome icons ({len(all_unmapped)}):")
@@ -216,6 +174,7 @@ def main():
     print("\n📋 Icon Library Reference:")
     print("  - Bootstrap Icons: https://icons.getbootstrap.com/")
     print("  - Browse all 2000+ Bootstrap Icons for alternatives")
+    return rc
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -7,7 +7,13 @@ Usage:
       --manifest fixtures/audit/eu_catalog_manifest.yaml \
       --workbook /Users/michaelbanda/Downloads/ISA6_DE_6.0.2.xlsx \
       --out var/audit
+  Edition/language comparison in one run (each workbook opened once, sheets
+  parsed in parallel, candidate rows merged + deduplicated):
+      --workbook ISA6_DE_6.0.2.xlsx --workbook ISA6_EN_6.0.2.xlsx \
+      --sheet Informationssicherheit --sheet "Information Security"
 Outputs per pair: var/audit/<framework>_dossier.json
+Reruns only rebuild dossiers whose inputs (or this code) changed, tracked in
+var/audit/.input_manifest.json; --force rebuilds everything.
 Plus (LOCAL audit artifacts, var/ is gitignored): var/audit/tisax_catalog.json,
 var/audit/tisax_workbook_mappings_candidate.csv
 """
@@ -23,6 +29,7 @@ _project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
+from scripts.quality.mapping_audit import input_manifest
 from scripts.quality.mapping_audit import io as audit_io
 from scripts.quality.mapping_audit import metrics
 from scripts.quality.mapping_audit import synthesis
@@ -55,6 +62,19 @@ EU_PAIRS = {
 }
 
 
+def _code_version():
+    """Digest of the code that shapes dossier content (this CLI + mapping_audit)."""
+    pkg = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mapping_audit")
+    sources = [os.path.abspath(__file__)]
+    sources += [os.path.join(pkg, f) for f in os.listdir(pkg) if f.endswith(".py")]
+    return input_manifest.code_version(sources)
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
 def _pct_int(row):
     try:
         return int(float(row.get("mapping_percentage") or 0))  # tolerate "100.0"
@@ -97,7 +117,7 @@ def build_dossier(framework, csv_files, mappings_dir, catalog):
     }
 
 
-def write_tisax_candidate(records, out_dir):
+def write_tisax_candidate(rows, out_dir):
     # LOCAL audit artifact only (out_dir is var/, gitignored). Any later import into
     # shipped fixtures/ must carry criterion-number -> clause mappings ONLY (no evidence prose).
     path = os.path.join(out_dir, "tisax_workbook_mappings_candidate.csv")
@@ -105,14 +125,10 @@ def write_tisax_candidate(records, out_dir):
         w = csv.writer(fh)
         w.writerow(["source_framework", "source_requirement_id", "target_framework",
                     "target_requirement_id", "source_catalog", "evidence_hint"])
-        for rec in records:
-            ev = " | ".join(rec["evidence"])
-            for std_label, clause in rec["references"]:
-                code = tx.normalize_standard(std_label)
-                if code is None:
-                    continue
-                w.writerow(["TISAX", rec["criterion"], code, clause,
-                            "vda_isa_6.0.2_workbook", ev])
+        for row in rows:
+            w.writerow(["TISAX", row["source_requirement_id"], row["target_framework"],
+                        row["target_requirement_id"], "|".join(row["catalogs"]),
+                        row["evidence_hint"]])
     return path
 
 
@@ -138,7 +154,13 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--mappings-dir", default="fixtures/mappings/public")
     ap.add_argument("--manifest", default="fixtures/audit/eu_catalog_manifest.yaml")
-    ap.add_argument("--workbook", default="")
+    ap.add_argument("--workbook", action="append", default=[],
+                    help="VDA-ISA xlsx; repeat to compare editions/languages in one run")
+    ap.add_argument("--sheet", action="append", default=[],
+                    help="sheet to extract (repeatable, default: Informationssicherheit)")
+    ap.add_argument("--workers", type=int, default=0, help="sheet-parse processes (0 = CPU count)")
+    ap.add_argument("--force", action="store_true",
+                    help="rebuild every dossier even if its inputs are unchanged")
     ap.add_argument("--out", default="var/audit")
     ap.add_argument("--synthesize", default="", help="path to workflow_results.json")
     ap.add_argument("--library-dir", default="", help="audit EU library YAML mappings from this dir")
@@ -146,16 +168,23 @@ def main():
 
     os.makedirs(args.out, exist_ok=True)
     catalog = audit_io.read_catalog_manifest(args.manifest)
+    cache = input_manifest.InputManifest(
+        os.path.join(args.out, input_manifest.MANIFEST_NAME), _code_version(), force=args.force)
 
     for framework, csv_files in EU_PAIRS.items():
-        dossier = build_dossier(framework, csv_files, args.mappings_dir, catalog)
         out = os.path.join(args.out, f"{framework.lower()}_dossier.json")
-        audit_io.write_dossier(out, dossier)
+        inputs = [os.path.join(args.mappings_dir, f) for f in csv_files] + [args.manifest]
+        if cache.fresh([out], inputs, csv_files):
+            dossier, tag = _load_json(out), " (cached)"
+        else:
+            dossier, tag = build_dossier(framework, csv_files, args.mappings_dir, catalog), ""
+            audit_io.write_dossier(out, dossier)
+            cache.record([out], inputs, csv_files)
         c = dossier["coverage"]
         print(f"{framework}: coverage {c['coverage_pct']}% "
               f"({c['mapped_count']}/{c['catalog_count']}), "
               f"{len(dossier['suspects'])} suspect, "
-              f"provenance {dossier['provenance']['complete_pct']}%")
+              f"provenance {dossier['provenance']['complete_pct']}%{tag}")
 
     if args.library_dir:
         for fn in LIBRARY_EU:
@@ -163,36 +192,68 @@ def main():
             if not os.path.exists(path):
                 print(f"LIB {fn}: MISSING")
                 continue
-            meta, rows = lib.read_library_mapping(path)
             label = fn.replace(".yaml", "")
-            dossier = build_library_dossier(label, meta, rows)
-            audit_io.write_dossier(os.path.join(args.out, f"lib_{label}_dossier.json"), dossier)
-            print(f"LIB {meta['source_framework']}->{meta['target_framework']}: "
+            out = os.path.join(args.out, f"lib_{label}_dossier.json")
+            if cache.fresh([out], [path]):
+                dossier, tag = _load_json(out), " (cached)"
+            else:
+                meta, rows = lib.read_library_mapping(path)
+                dossier, tag = build_library_dossier(label, meta, rows), ""
+                audit_io.write_dossier(out, dossier)
+                cache.record([out], [path])
+            print(f"LIB {dossier['source_framework']}->{dossier['target_framework']}: "
                   f"{dossier['row_count']} rows, {len(dossier['suspects'])} suspect, "
-                  f"provenance {dossier['provenance']['complete_pct']}%, rels {dossier['relationship_histogram']}")
+                  f"provenance {dossier['provenance']['complete_pct']}%, "
+                  f"rels {dossier['relationship_histogram']}{tag}")
 
     if args.synthesize and os.path.exists(args.synthesize):
-        with open(args.synthesize, encoding="utf-8") as fh:
-            wf_results = json.load(fh)
-        rows = synthesis.build_backlog(wf_results)
-        synthesis.write_backlog_csv(os.path.join(args.out, "eu_mapping_backlog.csv"), rows)
-        table = synthesis.build_finding_table(wf_results)
-        os.makedirs("docs/compliance", exist_ok=True)
-        with open("docs/compliance/eu-mapping-audit-findings.md", "w", encoding="utf-8") as fh:
-            fh.write("# EU Mapping Audit — Findings\n\n")
-            fh.write(f"_Generated {len(rows)} backlog rows._\n\n")
-            fh.write(table)
-        print(f"backlog rows: {len(rows)} -> var/audit/eu_mapping_backlog.csv")
-        print("finding table -> docs/compliance/eu-mapping-audit-findings.md")
-
-    if args.workbook and os.path.exists(args.workbook):
-        recs = tx.extract_workbook(args.workbook)
-        tisax_cat = sorted({r["criterion"] for r in recs})
-        audit_io.write_dossier(os.path.join(args.out, "tisax_catalog.json"),
+        backlog = os.path.join(args.out, "eu_mapping_backlog.csv")
+        findings = "docs/compliance/eu-mapping-audit-findings.md"
+        if cache.fresh([backlog, findings], [args.synthesize]):
+            print(f"backlog: unchanged (cached) -> {backlog}")
+        else:
+            with open(args.synthesize, encoding="utf-8") as fh:
+                wf_results = json.load(fh)
+            rows = synthesis.build_backlog(wf_results)
+            synthesis.write_backlog_csv(backlog, rows)
+            table = synthesis.build_finding_table(wf_results)
+            os.makedirs("docs/compliance", exist_ok=True)
+            with open(findings, "w", encoding="utf-8") as fh:
+                fh.write("# EU Mapping Audit — Findings\n\n")
+                fh.write(f"_Generated {len(rows)} backlog rows._\n\n")
+                fh.write(table)
+            cache.record([backlog, findings], [args.synthesize])
+            print(f"backlog rows: {len(rows)} -> var/audit/eu_mapping_backlog.csv")
+            print("finding table -> docs/compliance/eu-mapping-audit-findings.md")
+
+    workbooks = [wb for wb in args.workbook if os.path.exists(wb)]
+    sheets = args.sheet or ["Informationssicherheit"]
+    tisax_outputs = [os.path.join(args.out, "tisax_catalog.json"),
+                     os.path.join(args.out, "tisax_workbook_mappings_candidate.csv")]
+    if workbooks and cache.fresh(tisax_outputs, workbooks, sheets):
+        tisax = _load_json(tisax_outputs[0])
+        print(f"TISAX: {tisax['criterion_count']} criteria (cached) -> {tisax_outputs[1]}")
+    elif workbooks:
+        results, missing = tx.extract_batch(workbooks, sheets, workers=args.workers or None)
+        for wb, sheet in missing:
+            print(f"TISAX: sheet {sheet!r} not in {os.path.basename(wb)}, skipped")
+        editions = {}
+        for (wb, sheet), recs in results.items():
+            editions.setdefault(tx.catalog_label(wb, sheet), set()).update(r["criterion"] for r in recs)
+        tisax_cat = sorted(set().union(*editions.values()))
+        audit_io.write_dossier(tisax_outputs[0],
                                {"framework": "TISAX", "requirements": tisax_cat,
-                                "criterion_count": len(tisax_cat)})
-        cand = write_tisax_candidate(recs, args.out)
-        print(f"TISAX: {len(tisax_cat)} criteria, candidate rows -> {cand}")
+                                "criterion_count": len(tisax_cat),
+                                "editions": {k: sorted(v) for k, v in editions.items()}})
+        cand_rows = tx.merge_candidates(results)
+        cand = write_tisax_candidate(cand_rows, args.out)
+        cache.record(tisax_outputs, workbooks, sheets)
+        print(f"TISAX: {len(tisax_cat)} criteria from {len(results)} sheet(s) in "
+              f"{len(workbooks)} workbook(s), {len(cand_rows)} candidate rows -> {cand}")
+
+    cache.save()
+    print(f"cache: {cache.hits} hit(s), {cache.built} rebuilt"
+          + (" (--force)" if args.force else ""))
 
 
 if __name__ == "__main__":
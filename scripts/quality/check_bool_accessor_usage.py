@@ -14,6 +14,9 @@ gate only inspects PHP call sites.
 
 Output: FAIL one line per bad call site, anchored to the call (not the
 entity definition).
+
+Entity accessors and call sites are mapped per file (gate_runner.facts,
+cached by content) and joined against the forbidden names afterwards.
 """
 from __future__ import annotations
 
@@ -22,6 +25,8 @@ import re
 import sys
 from pathlib import Path
 
+from gate_runner.facts import map_files
+
 ROOT = Path(__file__).resolve().parents[2]
 ENTITY_DIR = ROOT / "src" / "Entity"
 SEARCH_DIRS = [ROOT / "src", ROOT / "templates"]
@@ -33,33 +38,40 @@ RE_BOOL_PROP = re.compile(
 RE_GET_METHOD = re.compile(r"public\s+function\s+get([A-Z]\w*)\s*\(")
 RE_IS_METHOD = re.compile(r"public\s+function\s+is([A-Z]\w*)\s*\(")
 RE_HAS_METHOD = re.compile(r"public\s+function\s+has([A-Z]\w*)\s*\(")
+RE_GET_CALL = re.compile(r"->get(\w+)\s*\(")
+RE_IS_CALL = re.compile(r"->is(\w+)\s*\(")
 
 
 def cap(s: str) -> str:
     return s[:1].upper() + s[1:]
 
 
-def parse_entity(path: Path) -> dict[str, dict[str, bool]]:
-    """Return {Cap(prop): {'is': bool, 'get': bool, 'has': bool}} for each bool prop."""
-    try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return {}
+def entity_accessors(text: str) -> tuple[tuple[str, bool, bool, bool], ...]:
+    """(Cap(prop), has is(), has get(), has has()) for each bool prop."""
     bool_props = set(RE_BOOL_PROP.findall(text))
     if not bool_props:
-        return {}
+        return ()
     get_methods = {m.group(1) for m in RE_GET_METHOD.finditer(text)}
     is_methods = {m.group(1) for m in RE_IS_METHOD.finditer(text)}
     has_methods = {m.group(1) for m in RE_HAS_METHOD.finditer(text)}
-    out: dict[str, dict[str, bool]] = {}
-    for prop in bool_props:
-        capped = cap(prop)
-        out[capped] = {
-            "is": capped in is_methods,
-            "get": capped in get_methods,
-            "has": capped in has_methods,
-        }
-    return out
+    return tuple(
+        (capped, capped in is_methods, capped in get_methods, capped in has_methods)
+        for capped in sorted(cap(prop) for prop in bool_props)
+    )
+
+
+def call_sites(text: str) -> tuple[tuple[int, str, str], ...]:
+    """(line, 'get'|'is', Name) for every ->getName( / ->isName( call outside comment lines."""
+    out: list[tuple[int, str, str]] = []
+    for idx, raw in enumerate(text.splitlines(), start=1):
+        if "->" not in raw:
+            continue
+        s = raw.lstrip()
+        if s.startswith("//") or s.startswith("*") or s.startswith("#"):
+            continue
+        out.extend((idx, "get", m.group(1)) for m in RE_GET_CALL.finditer(raw))
+        out.extend((idx, "is", m.group(1)) for m in RE_IS_CALL.finditer(raw))
+    return tuple(out)
 
 
 def is_skipped(path: Path) -> bool:
@@ -90,58 +102,40 @@ def main() -> int:
     # canonical for that name — skip. Only flag mismatches for unambiguous cases.
     accessor_universe: dict[str, dict[str, set[Path]]] = {}
     # accessor_universe[CapName]['is'/'get'/'has'] = set of entity files
-    for entity_path in sorted(ENTITY_DIR.rglob("*.php")):
-        for capped, accessors in parse_entity(entity_path).items():
+    entities = map_files(entity_accessors, sorted(ENTITY_DIR.rglob("*.php")))
+    for entity_path, props in entities.items():
+        for capped, has_is, has_get, has_has in props:
             registry = accessor_universe.setdefault(capped, {"is": set(), "get": set(), "has": set()})
-            for kind, present in accessors.items():
+            for kind, present in (("is", has_is), ("get", has_get), ("has", has_has)):
                 if present:
                     registry[kind].add(entity_path)
 
     # Build forbidden-method sets:
     #   getX is forbidden if NO entity has getX accessor but SOME entity has isX
     #   isX  is forbidden if NO entity has isX  accessor but SOME entity has getX
-    forbid_get: set[str] = set()
-    forbid_is: set[str] = set()
+    forbid: dict[str, set[str]] = {"get": set(), "is": set()}
     for capped, reg in accessor_universe.items():
         if reg["is"] and not reg["get"] and not reg["has"]:
-            forbid_get.add(capped)
+            forbid["get"].add(capped)
         if reg["get"] and not reg["is"] and not reg["has"]:
-            forbid_is.add(capped)
-
-    re_bad_get = re.compile(
-        r"->get(" + "|".join(re.escape(p) for p in sorted(forbid_get)) + r")\s*\("
-    ) if forbid_get else None
-    re_bad_is = re.compile(
-        r"->is(" + "|".join(re.escape(p) for p in sorted(forbid_is)) + r")\s*\("
-    ) if forbid_is else None
+            forbid["is"].add(capped)
+    other = {"get": "is", "is": "get"}
 
     violations: list[tuple[Path, int, str]] = []
-    if re_bad_get or re_bad_is:
-        for search_root in SEARCH_DIRS:
-            for f in sorted(search_root.rglob("*.php")):
-                if is_skipped(f):
-                    continue
-                # Skip Entity defining files (they declare the methods themselves)
-                if f.is_relative_to(ENTITY_DIR):
-                    continue
-                try:
-                    text = f.read_text(encoding="utf-8", errors="ignore")
-                except OSError:
-                    continue
-                for idx, raw in enumerate(text.splitlines(), start=1):
-                    s = raw.lstrip()
-                    if s.startswith("//") or s.startswith("*") or s.startswith("#"):
-                        continue
-                    if re_bad_get:
-                        for m in re_bad_get.finditer(raw):
-                            violations.append(
-                                (f, idx, f"->get{m.group(1)}() — entity only exposes is{m.group(1)}()")
-                            )
-                    if re_bad_is:
-                        for m in re_bad_is.finditer(raw):
-                            violations.append(
-                                (f, idx, f"->is{m.group(1)}() — entity only exposes get{m.group(1)}()")
-                            )
+    if forbid["get"] or forbid["is"]:
+        files = [
+            f
+            for search_root in SEARCH_DIRS
+            for f in sorted(search_root.rglob("*.php"))
+            # Skip Entity defining files (they declare the methods themselves)
+            if not is_skipped(f) and not f.is_relative_to(ENTITY_DIR)
+        ]
+        for f, calls in map_files(call_sites, files).items():
+            for idx, kind, name in calls:
+                if name in forbid[kind]:
+                    violations.append(
+                        (f, idx, f"->{kind}{name}() — entity only exposes {other[kind]}{name}()")
+                    )
 
     def _rel(p: Path) -> Path:
         try:
@@ -25,6 +25,9 @@ This gate FAILS (above baseline) on three static defect classes:
 STATIC by design. The dynamic check "does every mapping target a requirementId the
 loader actually produces" lives in `app:audit-catalog-mappings`, not here.
 
+PHP, fixture and competitor-source facts are mapped per file
+(gate_runner.facts, cached by content) and joined in compute_violations().
+
 Baseline-gated like the other scripts/quality/check_*.py gates.
 """
 from __future__ import annotations
@@ -34,6 +37,8 @@ import re
 import sys
 from pathlib import Path
 
+from gate_runner.facts import map_files
+
 ROOT = Path(__file__).resolve().parents[2]
 LOADER_SERVICE = ROOT / "src" / "Service" / "ComplianceFrameworkLoaderService.php"
 
@@ -118,25 +123,33 @@ def collect_registry_codes(text: str) -> list[str]:
     return RE_CODE_ARROW.findall(avail)
 
 
-def collect_loader_codes() -> set[str]:
-    """getFrameworkCode() return values across src/ (literal + self::CODE resolved)."""
-    codes: set[str] = set()
-    for php in (ROOT / "src").rglob("*.php"):
-        try:
-            t = php.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
-            continue
-        if "function getFrameworkCode" not in t:
-            continue
-        m = RE_GETCODE_LITERAL.search(t)
+def php_facts(text: str) -> tuple[str | None, tuple[str, ...]]:
+    """(getFrameworkCode() value or None, raw code/setCode/findOneBy codes)."""
+    loader: str | None = None
+    if "function getFrameworkCode" in text:
+        m = RE_GETCODE_LITERAL.search(text)
         if m:
-            codes.add(m.group(1))
-            continue
-        if RE_GETCODE_CONST.search(t):
-            cm = RE_CONST_CODE.search(t)
+            loader = m.group(1)
+        elif RE_GETCODE_CONST.search(text):
+            cm = RE_CONST_CODE.search(text)
             if cm:
-                codes.add(cm.group(1))
-    return codes
+                loader = cm.group(1)
+    codes = tuple(m for rx in (RE_CODE_ARROW, RE_SETCODE, RE_FINDONEBY_CODE) for m in rx.findall(text))
+    return loader, codes
+
+
+def yaml_codes(text: str) -> tuple[str, ...]:
+    return tuple(m.group(1) for m in map(RE_YAML_CODE.match, text.splitlines()) if m)
+
+
+def competitor_lines(text: str) -> tuple[int, ...]:
+    return tuple(idx for idx, line in enumerate(text.splitlines(), 1) if COMPETITOR_RE.search(line))
+
+
+def collect_loader_codes() -> set[str]:
+    """getFrameworkCode() return values across src/ (literal + self::CODE resolved)."""
+    facts = map_files(php_facts, (ROOT / "src").rglob("*.php"))
+    return {loader for loader, _codes in facts.values() if loader is not None}
 
 
 def collect_code_occurrences() -> dict[str, set[str]]:
@@ -149,29 +162,19 @@ def collect_code_occurrences() -> dict[str, set[str]]:
     # NOTE: migrations/ is deliberately NOT scanned — historical migrations
     # legitimately reference retired alias codes. Collision detection is about
     # LIVE config: src/ + fixtures/.
-    for php in (ROOT / "src").rglob("*.php"):
-        try:
-            t = php.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
-            continue
-        for rx in (RE_CODE_ARROW, RE_SETCODE, RE_FINDONEBY_CODE):
-            for m in rx.findall(t):
-                add(m)
+    for _loader, codes in map_files(php_facts, (ROOT / "src").rglob("*.php")).values():
+        for raw in codes:
+            add(raw)
     base = ROOT / "fixtures"
     if base.is_dir():
-        for y in base.rglob("*.yaml"):
-            try:
-                for line in y.read_text(encoding="utf-8", errors="ignore").splitlines():
-                    m = RE_YAML_CODE.match(line)
-                    if m:
-                        add(m.group(1))
-            except OSError:
-                continue
+        for codes in map_files(yaml_codes, base.rglob("*.yaml")).values():
+            for raw in codes:
+                add(raw)
     return groups
 
 
 def find_competitors() -> list[tuple[Path, int]]:
-    hits: list[tuple[Path, int]] = []
+    files: list[Path] = []
     seen: set[Path] = set()
     for sub, pat in COMPETITOR_GLOBS:
         base = ROOT / sub
@@ -181,13 +184,8 @@ def find_competitors() -> list[tuple[Path, int]]:
             if not f.is_file() or f in seen:
                 continue
             seen.add(f)
-            try:
-                for idx, line in enumerate(f.read_text(encoding="utf-8", errors="ignore").splitlines(), 1):
-                    if COMPETITOR_RE.search(line):
-                        hits.append((f, idx))
-            except OSError:
-                continue
-    return hits
+            files.append(f)
+    return [(f, idx) for f, lines in map_files(competitor_lines, files).items() for idx in lines]
 
 
 def compute_violations() -> list[str]:
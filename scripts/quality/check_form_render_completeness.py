@@ -25,6 +25,9 @@ Whitelist (the gate skips):
   - {% include '_components/_auto_form.html.twig' %}
   - templates under _components/  (design-system showcases)
 
+FormType fields and per-template render facts are mapped per file
+(gate_runner.facts, cached by content) and joined afterwards.
+
 Exit 0 = clean / all baselined, Exit 1 = new violations.
 """
 from __future__ import annotations
@@ -34,6 +37,8 @@ import re
 import sys
 from pathlib import Path
 
+from gate_runner.facts import map_files
+
 ROOT = Path(__file__).resolve().parents[2]
 FORMS_DIR = ROOT / "src" / "Form"
 TEMPLATES_DIR = ROOT / "templates"
@@ -59,11 +64,13 @@ ALIASES = {
 }
 
 
-def collect_form_fields() -> dict[str, set[str]]:
-    out: dict[str, set[str]] = {}
-    for ft in FORMS_DIR.rglob("*Type.php"):
-        text = ft.read_text(encoding="utf-8", errors="ignore")
-        fields = set(RE_ADD.findall(text))
+def form_type_fields(text: str) -> frozenset[str]:
+    return frozenset(RE_ADD.findall(text))
+
+
+def collect_form_fields() -> dict[str, frozenset[str]]:
+    out: dict[str, frozenset[str]] = {}
+    for ft, fields in map_files(form_type_fields, FORMS_DIR.rglob("*Type.php")).items():
         if fields:
             out[ft.stem] = fields
     return out
@@ -101,22 +108,25 @@ def rendered_fields(text: str) -> set[str]:
     return out
 
 
+def template_facts(text: str) -> frozenset[str] | None:
+    """Fields a form template renders explicitly; None when the template has
+    no form_start/form_end pair, uses a catch-all or renders no field."""
+    if not RE_FORM_START.search(text) or not RE_FORM_END.search(text):
+        return None
+    if template_uses_catchall(text):
+        return None
+    return frozenset(rendered_fields(text)) or None
+
+
 def scan() -> list[tuple[Path, str, list[str]]]:
     form_fields = collect_form_fields()
+    templates = [tpl for tpl in TEMPLATES_DIR.rglob("*.html.twig")
+                 if tpl.relative_to(TEMPLATES_DIR).parts[:1] != ("_components",)]
     findings: list[tuple[Path, str, list[str]]] = []
-    for tpl in TEMPLATES_DIR.rglob("*.html.twig"):
-        rel_parts = tpl.relative_to(TEMPLATES_DIR).parts
-        if rel_parts and rel_parts[0] == "_components":
-            continue
-        text = tpl.read_text(encoding="utf-8", errors="ignore")
-        if not RE_FORM_START.search(text) or not RE_FORM_END.search(text):
-            continue
-        if template_uses_catchall(text):
-            continue
-        rendered = rendered_fields(text)
-        if not rendered:
+    for tpl, rendered in map_files(template_facts, templates).items():
+        if rendered is None:
             continue
-        candidates = candidates_for(rel_parts)
+        candidates = candidates_for(tpl.relative_to(TEMPLATES_DIR).parts)
         matched = next((c for c in candidates if c in form_fields), None)
         if matched is None:
             continue
@@ -21,6 +21,10 @@ Scope:
 Conservative — only flags MORE args than expected (false-negative on
 under-arity since macros accept missing positional args as null).
 
+Macro arities and per-template imports/calls are mapped per file
+(gate_runner.facts, cached by content); scan() resolves aliases against the
+component macros afterwards.
+
 Exit 0 = clean / baselined, Exit 1 = new violations.
 """
 from __future__ import annotations
@@ -30,6 +34,8 @@ import re
 import sys
 from pathlib import Path
 
+from gate_runner.facts import map_files
+
 ROOT = Path(__file__).resolve().parents[2]
 COMP_DIR = ROOT / "templates" / "_components"
 TEMPLATES_DIR = ROOT / "templates"
@@ -50,19 +56,23 @@ RE_IMPORT = re.compile(
 )
 
 
+def macro_arities(text: str) -> dict[str, int]:
+    """macro_name -> positional-arg-count for one component file."""
+    macros: dict[str, int] = {}
+    for m in RE_MACRO_DEF.finditer(text):
+        name = m.group(1)
+        arg_str = m.group(2).strip()
+        arity = 0 if not arg_str else len([
+            a for a in _split_args(arg_str) if a.strip()
+        ])
+        macros[name] = arity
+    return macros
+
+
 def collect_macros() -> dict[str, dict[str, int]]:
     """component_path -> { macro_name -> positional-arg-count }."""
     out: dict[str, dict[str, int]] = {}
-    for comp in COMP_DIR.glob("*.html.twig"):
-        text = comp.read_text(encoding="utf-8", errors="ignore")
-        macros: dict[str, int] = {}
-        for m in RE_MACRO_DEF.finditer(text):
-            name = m.group(1)
-            arg_str = m.group(2).strip()
-            arity = 0 if not arg_str else len([
-                a for a in _split_args(arg_str) if a.strip()
-            ])
-            macros[name] = arity
+    for comp, macros in map_files(macro_arities, COMP_DIR.glob("*.html.twig")).items():
         if macros:
             rel = f"_components/{comp.name}"
             out[rel] = macros
@@ -117,14 +127,26 @@ def find_calls(text: str, alias_to_path: dict[str, str]) -> list[tuple[str, str,
     return out
 
 
+def template_calls(text: str) -> tuple[tuple[tuple[str, str], ...], tuple[tuple[str, str, int, int], ...]]:
+    """((import path, alias), ...) and (alias, macroName, positional count, line)
+    for every call through an imported alias, comments stripped."""
+    text = _strip_comments(text)
+    imports = tuple(RE_IMPORT.findall(text))
+    if not imports:
+        return (), ()
+    calls = tuple(
+        (alias, name, len([a for a in _split_args(args) if a.strip()]), line)
+        for alias, name, args, line in find_calls(text, {alias: path for path, alias in imports})
+    )
+    return imports, calls
+
+
 def scan() -> list[tuple[Path, int, str, str, int, int]]:
     macros = collect_macros()
     findings: list[tuple[Path, int, str, str, int, int]] = []
-    for tpl in TEMPLATES_DIR.rglob("*.html.twig"):
-        raw = tpl.read_text(encoding="utf-8", errors="ignore")
-        text = _strip_comments(raw)
+    for tpl, (imports, calls) in map_files(template_calls, TEMPLATES_DIR.rglob("*.html.twig")).items():
         alias_to_path: dict[str, str] = {}
-        for path, alias in RE_IMPORT.findall(text):
+        for path, alias in imports:
             # Normalize import path to match macros dict keys
             norm = path.lstrip("./")
             if norm in macros:
@@ -133,13 +155,13 @@ def scan() -> list[tuple[Path, int, str, str, int, int]]:
                 alias_to_path[alias] = f"_components/{Path(path).name}"
         if not alias_to_path:
             continue
-        for alias, name, args, line in find_calls(text, alias_to_path):
-            comp_path = alias_to_path[alias]
+        for alias, name, count, line in calls:
+            comp_path = alias_to_path.get(alias)
+            if comp_path is None:
+                continue
             arity = macros[comp_path].get(name)
             if arity is None:
                 continue
-            positional = [a for a in _split_args(args) if a.strip()]
-            count = len(positional)
             if count > arity:
                 findings.append((tpl, line, comp_path, name, arity, count))
     return findings
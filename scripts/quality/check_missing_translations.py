@@ -7,8 +7,16 @@ which cold-started the Symfony kernel 12 times sequentially (~12-24s on CI).
 This direct YAML-diff implementation runs in <1s.
 
 Compares the key-sets of <domain>.de.yaml and <domain>.en.yaml for every
-high-priority domain. A "missing" key in DE = key exists in EN but not DE.
-The reverse (EN missing keys present in DE) is also reported.
+domain. A "missing" key in DE = key exists in EN but not DE.
+
+Keys are read with gate_runner.catalogue (Symfony's YAML 1.2 scalars, list
+items included), like every other translation gate. Each catalogue's key set
+is mapped through gate_runner.facts: cached by content hash, so only the
+files of changed domain pairs are parsed again, and cold files are parsed in
+a pool of --jobs worker processes (default: GATE_JOBS, else the CPU count).
+The full catalogue is therefore the default; ALL_DOMAINS=0 (or --targeted)
+restricts the run to HIGH_PRIORITY_DOMAINS. Known gaps are baselined
+(--baseline, `<domain>:<key>` per line); a new one fails the gate.
 
 Trade-off vs the original:
   - Loses static template-side "is this key still referenced?" scan
@@ -17,17 +25,19 @@ Trade-off vs the original:
   - For "are the two locales in sync?" the YAML diff is authoritative.
 
 Usage:
-    python3 scripts/quality/check_missing_translations.py
-    ALL_DOMAINS=1 python3 scripts/quality/check_missing_translations.py
+    python3 scripts/quality/check_missing_translations.py \
+        --baseline scripts/quality/baselines/missing_translations.txt
+    ALL_DOMAINS=0 python3 scripts/quality/check_missing_translations.py
 """
 from __future__ import annotations
 
+import argparse
 import os
 import sys
 from pathlib import Path
-from typing import Any, Iterable
 
-import yaml
+from gate_runner.catalogue import CatalogueError, catalogue_keys, parsed
+from gate_runner.facts import map_files
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -53,33 +63,6 @@ SKIP_DOMAINS = {
 }
 
 
-def flatten(data: Any, prefix: str = "") -> Iterable[str]:
-    """Yield every dot-notated leaf-key (Symfony translator semantics)."""
-    if isinstance(data, dict):
-        for k, v in data.items():
-            child = f"{prefix}.{k}" if prefix else str(k)
-            if isinstance(v, (dict, list)):
-                yield from flatten(v, child)
-            else:
-                yield child
-    elif isinstance(data, list):
-        # Lists in translation YAML are rare but valid (numbered alternatives).
-        for i, item in enumerate(data):
-            child = f"{prefix}.{i}"
-            if isinstance(item, (dict, list)):
-                yield from flatten(item, child)
-            else:
-                yield child
-
-
-def keys_of(path: Path) -> set[str]:
-    if not path.exists():
-        return set()
-    with path.open(encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    return set(flatten(data))
-
-
 def discover_domains() -> list[str]:
     domains: list[str] = []
     for de_file in sorted(TRANSLATIONS_DIR.glob("*.de.yaml")):
@@ -92,12 +75,41 @@ def discover_domains() -> list[str]:
     return domains
 
 
+def load_baseline(path: Path | None) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    return {
+        s.strip() for s in path.read_text(encoding="utf-8").splitlines()
+        if s.strip() and not s.strip().startswith("#")
+    }
+
+
+def missing_keys(domains: list[str], jobs: int | None = None) -> dict[str, list[str]]:
+    """{domain: EN keys its DE catalogue lacks} for the domains with gaps."""
+    paths = [TRANSLATIONS_DIR / f"{d}.{locale}.yaml" for d in domains for locale in ("de", "en")]
+    keys = parsed(map_files(catalogue_keys, paths, jobs=jobs))
+    out: dict[str, list[str]] = {}
+    for domain in domains:
+        de_keys = keys.get(TRANSLATIONS_DIR / f"{domain}.de.yaml", frozenset())
+        en_keys = keys.get(TRANSLATIONS_DIR / f"{domain}.en.yaml", frozenset())
+        if en_keys - de_keys:
+            out[domain] = sorted(en_keys - de_keys)
+    return out
+
+
 def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--baseline", type=Path, default=None)
+    ap.add_argument("--write-baseline", type=Path, default=None)
+    ap.add_argument("--targeted", action="store_true", help="only HIGH_PRIORITY_DOMAINS")
+    ap.add_argument("--jobs", type=int, default=None, help="parser processes (default: GATE_JOBS or CPU count)")
+    args = ap.parse_args()
+
     if not TRANSLATIONS_DIR.is_dir():
         print(f"ERROR: translations/ not found at {TRANSLATIONS_DIR}", file=sys.stderr)
         return 2
 
-    all_mode = os.environ.get("ALL_DOMAINS") == "1"
+    all_mode = not args.targeted and os.environ.get("ALL_DOMAINS", "1") != "0"
     if all_mode:
         domains = discover_domains()
         print(f"Mode: ALL_DOMAINS ({len(domains)} domains)")
@@ -108,31 +120,43 @@ def main() -> int:
             and (TRANSLATIONS_DIR / f"{d}.de.yaml").exists()
             and (TRANSLATIONS_DIR / f"{d}.en.yaml").exists()
         ]
-        print(
-            f"Mode: targeted ({len(domains)} high-priority domains; "
-            f"use ALL_DOMAINS=1 for full check)"
-        )
+        print(f"Mode: targeted ({len(domains)} high-priority domains)")
 
-    total_violations = 0
-    checked = 0
+    jobs = args.jobs or (None if "GATE_JOBS" in os.environ else os.cpu_count())
+    try:
+        missing = missing_keys(domains, jobs)
+    except CatalogueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
 
-    for domain in domains:
-        checked += 1
-        de_keys = keys_of(TRANSLATIONS_DIR / f"{domain}.de.yaml")
-        en_keys = keys_of(TRANSLATIONS_DIR / f"{domain}.en.yaml")
+    if args.write_baseline is not None:
+        args.write_baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.write_baseline.open("w", encoding="utf-8") as fh:
+            fh.write("# check_missing_translations.py baseline\n# Format: <domain>:<key>   (EN key missing in DE)\n")
+            for domain, keys in missing.items():
+                for k in keys:
+                    fh.write(f"{domain}:{k}\n")
+        n = sum(map(len, missing.values()))
+        print(f"check_missing_translations: wrote {n} entries to {args.write_baseline}")
+        return 0
 
-        missing_in_de = sorted(en_keys - de_keys)
-        if missing_in_de:
+    baseline = load_baseline(args.baseline)
+    total_violations = 0
+    baselined = 0
+    for domain, keys in missing.items():
+        new = [k for k in keys if f"{domain}:{k}" not in baseline]
+        baselined += len(keys) - len(new)
+        if new:
             print(
                 f"FAIL domain '{domain}': "
-                f"{len(missing_in_de)} missing German translation key(s)"
+                f"{len(new)} missing German translation key(s)"
             )
-            for k in missing_in_de[:5]:
+            for k in new[:5]:
                 print(f"  - {k}")
-            total_violations += len(missing_in_de)
+            total_violations += len(new)
 
     print()
-    print(f"Translation check: {checked} domain(s) checked.")
+    print(f"Translation check: {len(domains)} domain(s) checked, {baselined} missing key(s) baselined.")
 
     if total_violations == 0:
         print("OK  Gate 6 — No missing translation keys in checked domains.")
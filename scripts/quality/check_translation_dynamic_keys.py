@@ -14,6 +14,22 @@ diffs against the committed file: a NEW prefix that hasn't been documented
 fails the build.
 
 The registry is sorted, one entry per line: `prefix.<short>` + the count.
+
+Completion check: the catalogue is loaded once into a key trie per domain
+and locale (segment by segment), so every completion of a prefix — the key
+segments that can follow `prefix.` — is enumerated in O(prefix length +
+completions). For each prefix whose domain is known (the |trans / ->trans
+call it feeds, or the template's trans_default_domain) and for each domain
+that defines an unattributed prefix, the gate flags
+
+  - completions one locale of the domain has and another lacks,
+  - a trans-fed prefix that completes to nothing in its domain,
+  - an enum in src/Enum whose values the prefix is keyed by (named like the
+    prefix — IncidentStatus ~ incident.status — with at least half of its
+    cases among the completions) but which has a case without a key.
+
+Findings are baselined via --completions-baseline (same format as the FAIL
+lines' `<domain>:<locale>:<prefix>:<completion>` id).
 """
 from __future__ import annotations
 
@@ -22,8 +38,13 @@ import re
 import sys
 from pathlib import Path
 
+from gate_runner.catalogue import RE_TWIG_DEFAULT_DOMAIN, CatalogueError, call_args, catalogue_keys, parsed
+from gate_runner.facts import map_files
+
 ROOT = Path(__file__).resolve().parents[2]
 SKIP_DIRS = {"vendor", "node_modules", "var", ".claude", "tests/Fixtures", "migrations"}
+TRANSLATIONS_DIR = ROOT / "translations"
+ENUM_DIR = ROOT / "src" / "Enum"
 
 # Twig:   ('prefix.' ~ var)|trans
 RE_TWIG = re.compile(
@@ -53,39 +74,170 @@ def is_skipped(path: Path) -> bool:
     return False
 
 
-def scan_php(path: Path) -> list[str]:
-    try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return []
+RE_TWIG_TRANS_AFTER = re.compile(r"""\s*\|\s*trans\b(\s*\()?""")
+RE_PHP_TRANS_BEFORE = re.compile(r"""->trans\(\s*$""")
+RE_DOMAIN_ARG = re.compile(r"""^\s*(?:domain\s*[:=]\s*)?['"]([\w.+-]+)['"]\s*$""")
+RE_ENUM = re.compile(r"\benum\s+(\w+)\s*:\s*string\b")
+RE_ENUM_CASE = re.compile(r"""^\s*case\s+\w+\s*=\s*['"]([^'"]+)['"]\s*;""", re.MULTILINE)
+
+Ref = tuple[str, "str | None"]  # (prefix, domain or None when not a trans call)
+
+
+def _domain(args: list[str] | None, index: int, default: str | None) -> str | None:
+    if args is None:
+        return None
+    if len(args) <= index or not args[index].strip():
+        return default
+    m = RE_DOMAIN_ARG.match(args[index])
+    return m.group(1) if m else None
+
+
+def php_prefixes(text: str) -> frozenset[Ref]:
+    """(prefix, domain) per dynamic key in one PHP file; the domain is the
+    ->trans() call's third argument (default `messages`), None elsewhere."""
     if "trans(" not in text and "->trans" not in text:
-        return []
-    return list(set(RE_PHP_DOT.findall(text) + RE_PHP_INTERP.findall(text)))
+        return frozenset()
+    refs: set[Ref] = set()
+    for rx in (RE_PHP_DOT, RE_PHP_INTERP):
+        for m in rx.finditer(text):
+            domain = None
+            if RE_PHP_TRANS_BEFORE.search(text, max(0, m.start() - 40), m.start()):
+                call = text.rindex("(", 0, m.start())
+                domain = _domain(call_args(text, call), 2, "messages")
+            refs.add((m.group(1), domain))
+    return frozenset(refs)
 
 
-def scan_twig(path: Path) -> list[str]:
-    try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return []
+def twig_prefixes(text: str) -> frozenset[Ref]:
+    """(prefix, domain) per `('prefix.' ~ var)` in one template; the domain
+    comes from the |trans that follows (or trans_default_domain)."""
     if "|trans" not in text:
-        return []
-    return list(set(RE_TWIG.findall(text)))
+        return frozenset()
+    m = RE_TWIG_DEFAULT_DOMAIN.search(text)
+    default = m.group(1) if m else "messages"
+    refs: set[Ref] = set()
+    for m in RE_TWIG.finditer(text):
+        domain = None
+        args = call_args(text, m.start())
+        if args is not None:
+            close = m.start() + len("(" + ",".join(args) + ")")
+            after = RE_TWIG_TRANS_AFTER.match(text, close)
+            if after:
+                domain = _domain(call_args(text, after.end() - 1) if after.group(1) else [], 1, default)
+        refs.add((m.group(1), domain))
+    return frozenset(refs)
 
 
-def collect() -> dict[str, int]:
+def collect_refs() -> tuple[dict[str, int], dict[str, set[str | None]]]:
+    """(prefix -> number of files using it, prefix -> domains it is
+    translated in; None: not via a trans call) over src/ and templates/."""
     counter: dict[str, int] = {}
-    for f in sorted((ROOT / "src").rglob("*.php")):
-        if is_skipped(f):
+    domains: dict[str, set[str | None]] = {}
+    php = [f for f in sorted((ROOT / "src").rglob("*.php")) if not is_skipped(f)]
+    twig = [f for f in sorted((ROOT / "templates").rglob("*.html.twig")) if not is_skipped(f)]
+    for func, files in ((php_prefixes, php), (twig_prefixes, twig)):
+        for found in map_files(func, files).values():
+            for prefix, domain in found:
+                domains.setdefault(prefix, set()).add(domain)
+            for prefix in {prefix for prefix, _ in found}:
+                counter[prefix] = counter.get(prefix, 0) + 1
+    return counter, domains
+
+
+def collect() -> dict[str, int]:
+    return collect_refs()[0]
+
+
+class KeyTrie:
+    """Translation keys of one domain + locale, one trie level per segment."""
+
+    def __init__(self, keys=()):
+        self.root: dict = {}
+        for key in keys:
+            node = self.root
+            for segment in key.split("."):
+                node = node.setdefault(segment, {})
+
+    def completions(self, prefix: str) -> frozenset[str]:
+        """Segments that can follow `prefix.` (empty if the prefix is unknown)."""
+        node = self.root
+        for segment in prefix.split("."):
+            node = node.get(segment)
+            if node is None:
+                return frozenset()
+        return frozenset(node)
+
+
+def build_tries() -> dict[str, dict[str, KeyTrie]]:
+    """domain -> locale -> KeyTrie, from translations/<domain>.<locale>.yaml."""
+    tries: dict[str, dict[str, KeyTrie]] = {}
+    for path, keys in parsed(map_files(catalogue_keys, sorted(TRANSLATIONS_DIR.glob("*.yaml")))).items():
+        parts = path.name.split(".")
+        if len(parts) != 3:
             continue
-        for prefix in scan_php(f):
-            counter[prefix] = counter.get(prefix, 0) + 1
-    for f in sorted((ROOT / "templates").rglob("*.html.twig")):
-        if is_skipped(f):
+        domain, locale = parts[0].replace("+intl-icu", ""), parts[1]
+        tries.setdefault(domain, {})[locale] = KeyTrie(keys)
+    return tries
+
+
+def enum_cases(text: str) -> tuple[str, tuple[str, ...]] | None:
+    """(enum name, backed values) of one string-backed enum file."""
+    m = RE_ENUM.search(text)
+    if not m:
+        return None
+    return m.group(1), tuple(RE_ENUM_CASE.findall(text))
+
+
+def _snake(name: str) -> set[str]:
+    return set(re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower().split("_"))
+
+
+def _keyed_by(prefix: str, completions: frozenset[str],
+              enums: list[tuple[str, tuple[str, ...]]]) -> tuple[str, tuple[str, ...]] | None:
+    """The enum whose values `prefix` is keyed by: one named like the prefix
+    (IncidentStatus ~ incident.status) with at least half of its cases among
+    the completions; the closest value set wins."""
+    words = set(re.split(r"[._]", prefix))
+    best, best_score, tied = None, None, False
+    for name, values in enums:
+        shared = len(completions & set(values))
+        if len(values) < 2 or shared * 2 < len(values) or not _snake(name) <= words:
             continue
-        for prefix in scan_twig(f):
-            counter[prefix] = counter.get(prefix, 0) + 1
-    return counter
+        score = shared / len(completions | set(values))
+        if best_score is None or score > best_score:
+            best, best_score, tied = (name, values), score, False
+        elif score == best_score:
+            tied = True
+    return None if tied else best
+
+
+def check_completions(refs: dict[str, set[str | None]], tries: dict[str, dict[str, KeyTrie]],
+                      enums: list[tuple[str, tuple[str, ...]]]) -> list[tuple[str, str, str, str, str]]:
+    """[(domain, locale, prefix, completion, reason)] for every gap."""
+    findings: list[tuple[str, str, str, str, str]] = []
+    for prefix in sorted(refs):
+        domains = {d for d in refs[prefix] if d is not None}
+        if None in refs[prefix]:  # unattributed: every domain that knows the prefix
+            domains |= {d for d, by_locale in tries.items()
+                        if any(t.completions(prefix) for t in by_locale.values())}
+        for domain in sorted(domains):
+            by_locale = tries.get(domain, {})
+            found = {locale: by_locale[locale].completions(prefix) for locale in sorted(by_locale)}
+            union = frozenset().union(*found.values()) if found else frozenset()
+            if not union:
+                findings.append((domain, "*", prefix, "*", "no key completes this prefix"))
+                continue
+            for locale, have in found.items():
+                for completion in sorted(union - have):
+                    findings.append((domain, locale, prefix, completion,
+                                     "defined in another locale only"))
+            match = _keyed_by(prefix, union, enums)
+            if match is not None:
+                name, values = match
+                for value in values:
+                    if value not in union:  # per-locale gaps are reported above
+                        findings.append((domain, "*", prefix, value, f"enum {name} case has no key"))
+    return findings
 
 
 def render_registry(counter: dict[str, int]) -> str:
@@ -115,8 +267,21 @@ def parse_registry(path: Path) -> set[str]:
     return out
 
 
+def load_baseline(path: Path | None) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    return {
+        s.strip() for s in path.read_text(encoding="utf-8").splitlines()
+        if s.strip() and not s.strip().startswith("#")
+    }
+
+
+def finding_id(finding: tuple[str, str, str, str, str]) -> str:
+    return ":".join(finding[:4])
+
+
 def main() -> int:
-    ap = argparse.ArgumentParser(description=__doc__)
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     ap.add_argument(
         "--baseline",
         type=Path,
@@ -124,10 +289,12 @@ def main() -> int:
         help="Path to registry file (used for both read+diff).",
     )
     ap.add_argument("--write-baseline", type=Path, default=None)
+    ap.add_argument("--completions-baseline", type=Path, default=None)
+    ap.add_argument("--write-completions-baseline", type=Path, default=None)
     ap.add_argument("--quiet", action="store_true")
     args = ap.parse_args()
 
-    counter = collect()
+    counter, refs = collect_refs()
     current = set(counter.keys())
 
     if args.write_baseline is not None:
@@ -136,13 +303,35 @@ def main() -> int:
         print(f"check_translation_dynamic_keys: wrote {len(current)} prefixes to {args.write_baseline}")
         return 0
 
+    enums = [e for e in map_files(enum_cases, sorted(ENUM_DIR.glob("*.php"))).values() if e]
+    try:
+        tries = build_tries()
+    except CatalogueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+    findings = check_completions(refs, tries, enums)
+
+    if args.write_completions_baseline is not None:
+        args.write_completions_baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.write_completions_baseline.open("w", encoding="utf-8") as fh:
+            fh.write("# check_translation_dynamic_keys.py completions baseline\n")
+            fh.write("# Format: <domain>:<locale>:<prefix>:<completion>   (* = all locales / any completion)\n")
+            for fid in sorted({finding_id(f) for f in findings}):
+                fh.write(fid + "\n")
+        print(f"check_translation_dynamic_keys: wrote {len(findings)} completion finding(s) "
+              f"to {args.write_completions_baseline}")
+        return 0
+
     known = parse_registry(args.baseline)
     new = sorted(current - known)
     stale = sorted(known - current)
+    baselined = load_baseline(args.completions_baseline)
+    gaps = [f for f in findings if finding_id(f) not in baselined]
 
-    if not new and not stale:
+    if not new and not stale and not gaps:
         if not args.quiet:
-            print(f"check_translation_dynamic_keys: OK — {len(current)} dynamic prefix(es), all documented.")
+            print(f"check_translation_dynamic_keys: OK — {len(current)} dynamic prefix(es), all documented; "
+                  f"{len(findings)} completion gap(s), all baselined.")
         else:
             print(f"check_translation_dynamic_keys: OK ({len(current)})")
         return 0
@@ -151,6 +340,10 @@ def main() -> int:
         print("check_translation_dynamic_keys: NEW PREFIXES (not in registry)\n")
         for prefix in new:
             print(f"FAIL prefix '{prefix}' used {counter[prefix]}x — add to {args.baseline}")
+    if gaps:
+        print("check_translation_dynamic_keys: NEW COMPLETION GAPS\n")
+        for finding in gaps:
+            print(f"FAIL {finding_id(finding)} — {finding[4]}")
     if stale:
         # Stale entries are informational only — registry can be cleaned up
         # but the gate doesn't fail.
@@ -164,8 +357,15 @@ def main() -> int:
             "    python3 scripts/quality/check_translation_dynamic_keys.py "
             "--write-baseline scripts/quality/dynamic_key_prefixes.txt"
         )
-        return 1
-    return 0
+    if gaps:
+        print(
+            f"\ncheck_translation_dynamic_keys: {len(gaps)} new completion gap(s) "
+            f"({len(findings) - len(gaps)} baselined).\n"
+            "Fix: add the missing keys, or accept them with:\n"
+            "    python3 scripts/quality/check_translation_dynamic_keys.py "
+            "--write-completions-baseline scripts/quality/baselines/translation_dynamic_keys.txt"
+        )
+    return 1 if new or gaps else 0
 
 
 if __name__ == "__main__":
@@ -7,30 +7,96 @@ Scans all Twig templates for:
 2. Incomplete translations (e.g., in labels, attributes)
 3. Incorrect translation usage (missing domain, wrong syntax)
 
+Each template is scanned in one pass per check: the patterns run over the
+whole file (never across a line break) and every hit is mapped to its line.
+Lines that are nothing but a {# comment #} are skipped. Text runs are
+classified against a precompiled table of English words. Issues stream out as
+(line, type, description, suggestion, code) tuples and the report is written
+file by file, so memory stays flat on the full template tree.
+
 Usage: python3 check_translation_issues.py
 """
 
 import re
+import sys
+from bisect import bisect_right
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
-from dataclasses import dataclass, field
-
-@dataclass
-class TranslationIssue:
-    """Represents a translation issue found in a template."""
-    file: str
-    line_num: int
-    line_content: str
-    issue_type: str
-    description: str
-    suggestion: str = ""
+from typing import Iterator, Tuple
+
+# (line number, issue type, description, suggestion, source line)
+Issue = Tuple[int, str, str, str, str]
+
+# Patterns for HTML attributes that should be translated
+TRANSLATABLE_ATTRIBUTES = (
+    'title', 'alt', 'placeholder', 'aria-label', 'data-original-title',
+    'data-confirm', 'data-bs-title', 'aria-description'
+)
+
+# Common English words that indicate hardcoded text
+ENGLISH_INDICATORS = frozenset({
+    'the', 'and', 'or', 'for', 'to', 'of', 'in', 'on', 'at', 'by',
+    'with', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
+    'could', 'may', 'might', 'must', 'can', 'new', 'edit', 'delete',
+    'create', 'update', 'save', 'cancel', 'back', 'next', 'previous',
+    'search', 'filter', 'export', 'import', 'view', 'show', 'hide',
+    'loading', 'error', 'success', 'warning', 'info', 'submit', 'reset'
+})
+
+RE_DEFAULT_DOMAIN = re.compile(r"{%\s*trans_default_domain\s+['\"](\w+)['\"]\s*%}")
+RE_COMMENT = re.compile(r"\{#.*?(?:#\}|\Z)", re.DOTALL)
+# <tag>Text</tag> where Text is not {{ }} or {% %}; <tag>Text running to the end of the line
+RE_TEXT_NODE = re.compile(
+    r"<(h[1-6]|p|span|label|button|a|td|th|li|div)([^>\n]*)>([^<{\n]+)</\1>"
+    r"|<(?P<open>h[1-6]|p|span|label|button)([^>\n]*)>(?P<tail>[^<{\n]+)$",
+    re.MULTILINE,
+)
+# Lookahead: `title=` inside `data-bs-title=` is reported too, as before.
+RE_ATTRIBUTE = re.compile(
+    r"(?=(" + "|".join(map(re.escape, TRANSLATABLE_ATTRIBUTES)) + r")=([\"'])([^\"'{\n]+)\2)"
+)
+RE_TRANS_NO_ARGS = re.compile(r"'([^'\n]+)'\|trans(?!\()")
+RE_TRANS_CALL = re.compile(
+    r"'([^'\n]+)'\|trans\((\{[^}\n]*\}(?:[^\S\n]*,[^\S\n]*'[^'\n]*')?|[^\S\n]*'[^'\n]*'|)\)"
+)
+RE_SYMBOLS = re.compile(r'^[\d\s\-\/\.\,\:\;]+$')
+RE_ATTR_SYMBOLS = re.compile(r'^[\d\s\-\/\.\,\:\;#]+$')
+RE_DOMAIN_AT_END = re.compile(r",\s*['\"](\w+)['\"]\s*$")
+RE_DOMAIN_ONLY = re.compile(r"^\s*['\"](\w+)['\"]\s*$")
+RE_DOMAIN_AFTER_EMPTY = re.compile(r"\{\s*\}\s*,\s*['\"](\w+)['\"]")
+
+
+def is_english(text: str) -> bool:
+    """Whether any whitespace-separated word of `text` is in the word table."""
+    return not ENGLISH_INDICATORS.isdisjoint(text.lower().split())
+
+
+def trans_domain(params: str):
+    """Domain is the LAST quoted string after a comma in the trans() call."""
+    m = RE_DOMAIN_AT_END.search(params)
+    if m:
+        return m.group(1)
+    if params.strip() == '{}':
+        return None
+    domain = None
+    m = RE_DOMAIN_ONLY.match(params)
+    if m:
+        domain = m.group(1)
+    m = RE_DOMAIN_AFTER_EMPTY.search(params)
+    if m:
+        domain = m.group(1)
+    return domain
+
 
 class TranslationChecker:
     """Checks Twig templates for translation issues."""
 
-    def __init__(self, templates_dir='templates'):
+    def __init__(self, templates_dir='templates', out=None):
         self.templates_dir = Path(templates_dir)
-        self.issues: List[TranslationIssue] = []
+        self.out = out or sys.stdout
+        self.counts: Counter = Counter()  # issue type -> issues
+        self.files_with_issues = 0
 
         # Valid translation domains — dynamisch aus translations/*.{de,en}.yaml
         # gelesen. Vermeidet Drift wenn neue Domains hinzugefügt werden
@@ -48,304 +114,144 @@ class TranslationChecker:
         # Fallback falls translations/ fehlt:
         if not self.valid_domains:
             self.valid_domains = {'messages'}
+        self.domain_list = ', '.join(sorted(self.valid_domains))
 
-        # Patterns for HTML attributes that should be translated
-        self.translatable_attributes = {
-            'title', 'alt', 'placeholder', 'aria-label', 'data-original-title',
-            'data-confirm', 'data-bs-title', 'aria-description'
-        }
-
-        # Common English words that indicate hardcoded text
-        self.english_indicators = {
-            'the', 'and', 'or', 'for', 'to', 'of', 'in', 'on', 'at', 'by',
-            'with', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
-            'could', 'may', 'might', 'must', 'can', 'new', 'edit', 'delete',
-            'create', 'update', 'save', 'cancel', 'back', 'next', 'previous',
-            'search', 'filter', 'export', 'import', 'view', 'show', 'hide',
-            'loading', 'error', 'success', 'warning', 'info', 'submit', 'reset'
-        }
+    def print(self, *args) -> None:
+        print(*args, file=self.out)
 
     def check_all_templates(self) -> None:
         """Check all Twig templates in the templates directory."""
-        print("="*80)
-        print("TRANSLATION ISSUES CHECKER")
-        print("="*80)
-        print()
-        print("Scanning templates for:")
-        print("  1. Hardcoded text that should be translated")
-        print("  2. Incomplete translations (labels, attributes)")
-        print("  3. Incorrect translation usage")
-        print()
-        print("-"*80)
-
-        twig_files = sorted(self.templates_dir.rglob('*.twig'))
-
-        for filepath in twig_files:
-            self.check_file(filepath)
-
-        self.print_report()
-
-    def check_file(self, filepath: Path) -> None:
-        """Check a single Twig template file."""
+        self.print("=" * 80)
+        self.print("TRANSLATION ISSUES CHECKER")
+        self.print("=" * 80)
+        self.print()
+        self.print("Scanning templates for:")
+        self.print("  1. Hardcoded text that should be translated")
+        self.print("  2. Incomplete translations (labels, attributes)")
+        self.print("  3. Incorrect translation usage")
+        self.print()
+        self.print("-" * 80)
+        self.print()
+        self.print("=" * 80)
+        self.print("SCAN RESULTS")
+        self.print("=" * 80)
+        self.print()
+
+        for filepath in sorted(self.templates_dir.rglob('*.twig')):
+            self.report_file(filepath)
+
+        self.print_summary()
+
+    def report_file(self, filepath: Path) -> None:
+        """Scan one template and write its issues to the report right away."""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
-                lines = content.split('\n')
         except Exception as e:
-            print(f"⚠️  Error reading {filepath}: {e}")
+            self.print(f"⚠️  Error reading {filepath}: {e}")
             return
 
-        rel_path = str(filepath.relative_to(self.templates_dir))
-
-        # Check if file has trans_default_domain set
-        default_domain_match = re.search(r"{%\s*trans_default_domain\s+['\"](\w+)['\"]\s*%}", content)
-        has_default_domain = default_domain_match is not None
-
-        # Track multi-line Twig comments {# ... #}. A line is "in comment" if a {# was
-        # opened on a previous line and the matching #} has not yet been seen.
-        in_comment = False
-
-        for line_num, line in enumerate(lines, 1):
-            stripped = line.strip()
-
-            # State-machine: walk {# / #} delimiters on this line to know whether any
-            # code outside comments remains for inspection, and update in_comment for
-            # the next line.
-            scan_pos = 0
-            line_has_code_outside_comment = False
-            while scan_pos < len(line):
-                if in_comment:
-                    end_idx = line.find('#}', scan_pos)
-                    if end_idx == -1:
-                        scan_pos = len(line)
-                    else:
-                        in_comment = False
-                        scan_pos = end_idx + 2
-                else:
-                    start_idx = line.find('{#', scan_pos)
-                    if start_idx == -1:
-                        if line[scan_pos:].strip():
-                            line_has_code_outside_comment = True
-                        scan_pos = len(line)
-                    else:
-                        if line[scan_pos:start_idx].strip():
-                            line_has_code_outside_comment = True
-                        in_comment = True
-                        scan_pos = start_idx + 2
-
-            # Skip empty lines, single-line comments, or lines fully inside a multi-line comment
-            if not stripped or stripped.startswith('{#') or not line_has_code_outside_comment:
+        header = False
+        for line_num, issue_type, description, suggestion, line in self.check_file(content):
+            if not header:
+                self.print(f"📄 {filepath.relative_to(self.templates_dir)}")
+                self.files_with_issues += 1
+                header = True
+            self.counts[issue_type] += 1
+            self.print(f"   Line {line_num}: {description}")
+            if suggestion:
+                self.print(f"   💡 Suggestion: {suggestion}")
+            self.print(f"   Code: {line.strip()[:100]}...")
+            self.print()
+
+    def check_file(self, content: str) -> Iterator[Issue]:
+        """Issues of one template, in line order."""
+        starts = [0] + [m.end() for m in re.finditer('\n', content)]
+        lines = content.split('\n')
+
+        # Lines with code outside {# comments #}; a line opening with {# is skipped whole.
+        if '{#' in content:
+            code = RE_COMMENT.sub(lambda m: re.sub(r'[^\n]', ' ', m.group(0)), content).split('\n')
+            skipped = {i for i, c in enumerate(code) if not c.strip() or lines[i].lstrip().startswith('{#')}
+        else:
+            skipped = set()
+
+        def line_of(pos: int) -> int:
+            return bisect_right(starts, pos) - 1
+
+        found = []
+        for m in RE_TEXT_NODE.finditer(content):
+            i = line_of(m.start())
+            line = lines[i]
+            # Skip lines that are mostly Twig code, or already translated
+            if i in skipped or line.count('{') > 3 or line.count('%') > 2 or '|trans' in line:
                 continue
+            text_content = (m.group(3) if m.group('open') is None else m.group('tail')).strip()
+            if not text_content or RE_SYMBOLS.match(text_content):
+                continue
+            if is_english(text_content):
+                found.append((i, 0, m.start(), "HARDCODED_TEXT", f"Hardcoded text: '{text_content}'",
+                              "Use translation: {{ 'key'|trans({}, 'domain') }}"))
 
-            # Check for various issues
-            self.check_hardcoded_text(rel_path, line_num, line)
-            self.check_untranslated_attributes(rel_path, line_num, line)
-            # Only check for missing trans params if no default domain is set
-            if not has_default_domain:
-                self.check_incorrect_trans_usage(rel_path, line_num, line)
-            self.check_missing_domain(rel_path, line_num, line)
-
-    def check_hardcoded_text(self, file: str, line_num: int, line: str) -> None:
-        """Check for hardcoded text in HTML content."""
-        # Skip lines that are mostly Twig code
-        if line.count('{') > 3 or line.count('%') > 2:
-            return
-
-        # Pattern: HTML tags with text content that's not a variable or translation
-        # e.g., <h1>Dashboard</h1>, <button>Save</button>, <label>Name</label>
-        patterns = [
-            # <tag>Text</tag> where Text is not {{ }} or {% %}
-            r'<(h[1-6]|p|span|label|button|a|td|th|li|div)([^>]*)>([^<{]+)</\1>',
-            # <tag>Text without closing tag on same line
-            r'<(h[1-6]|p|span|label|button)([^>]*)>([^<{]+)$',
-        ]
-
-        for pattern in patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                text_content = match.group(3).strip()
-
-                # Skip if empty or just whitespace
-                if not text_content or text_content.isspace():
-                    continue
-
-                # Skip if it's a number, date, or symbol
-                if re.match(r'^[\d\s\-\/\.\,\:\;]+$', text_content):
-                    continue
-
-                # Skip if it's already using trans filter or variable
-                if '|trans' in line or '{{' in text_content or '{%' in text_content:
-                    continue
-
-                # Check if it contains English indicators
-                words = text_content.lower().split()
-                if any(word in self.english_indicators for word in words):
-                    self.issues.append(TranslationIssue(
-                        file=file,
-                        line_num=line_num,
-                        line_content=line.strip(),
-                        issue_type="HARDCODED_TEXT",
-                        description=f"Hardcoded text: '{text_content}'",
-                        suggestion="Use translation: {{ 'key'|trans({}, 'domain') }}"
-                    ))
-
-    def check_untranslated_attributes(self, file: str, line_num: int, line: str) -> None:
-        """Check for HTML attributes with hardcoded text."""
-        for attr in self.translatable_attributes:
-            # Pattern: attribute="hardcoded text"
-            pattern = rf'{attr}=(["\'])([^"\'{{]+)\1'
-            matches = re.finditer(pattern, line)
-
-            for match in matches:
-                attr_value = match.group(2).strip()
-
-                # Skip if empty, just symbols, or numbers
-                if not attr_value or re.match(r'^[\d\s\-\/\.\,\:\;#]+$', attr_value):
-                    continue
-
-                # Skip if it's a URL, path, or CSS class
-                if attr_value.startswith(('http', '/', '.', '#', 'bi-', 'btn-')):
-                    continue
-
-                # Check if it contains English words
-                words = attr_value.lower().split()
-                if any(word in self.english_indicators for word in words):
-                    self.issues.append(TranslationIssue(
-                        file=file,
-                        line_num=line_num,
-                        line_content=line.strip(),
-                        issue_type="UNTRANSLATED_ATTRIBUTE",
-                        description=f"Untranslated {attr}: '{attr_value}'",
-                        suggestion=f"{attr}=\"{{{{ 'key'|trans({{ }}, 'domain') }}}}\""
-                    ))
-
-    def check_incorrect_trans_usage(self, file: str, line_num: int, line: str) -> None:
-        """Check for incorrect translation filter usage."""
-        # Pattern: |trans without parameters (should have domain)
-        # Allow |trans alone only in very specific cases
-        pattern = r"'([^']+)'\|trans(?!\()"
-        matches = re.finditer(pattern, line)
-
-        for match in matches:
-            trans_key = match.group(1)
-            self.issues.append(TranslationIssue(
-                file=file,
-                line_num=line_num,
-                line_content=line.strip(),
-                issue_type="MISSING_TRANS_PARAMS",
-                description=f"Translation without parameters: '{trans_key}|trans'",
-                suggestion=f"'{trans_key}'|trans({{ }}, 'domain')"
-            ))
-
-    def check_missing_domain(self, file: str, line_num: int, line: str) -> None:
-        """Check for translations without explicit domain or with invalid domain."""
-        # Pattern: |trans({}, 'domain') or |trans({params}, 'domain')
-        # Use a more robust pattern that handles nested braces and quotes
-        pattern = r"'([^']+)'\|trans\((\{[^}]*\}(?:\s*,\s*'[^']*')?|\s*'[^']*'|)\)"
-        matches = re.finditer(pattern, line)
-
-        for match in matches:
-            trans_key = match.group(1)
-            params = match.group(2)
-
-            # Domain is the LAST quoted string after a comma in the trans() call
-            # e.g., trans({}, 'domain') or trans({'param': value}, 'domain')
-            # Split by comma and look for the last argument that's a quoted string
-            domain = None
-
-            # Look for pattern: , 'domain') at the end
-            domain_at_end = re.search(r",\s*['\"](\w+)['\"]\s*$", params)
-            if domain_at_end:
-                domain = domain_at_end.group(1)
-            elif params.strip() == '{}':
-                # Empty params without domain
-                domain = None
-            else:
-                # Check if params is just a domain string like "'messages'"
-                simple_domain = re.match(r"^\s*['\"](\w+)['\"]\s*$", params)
-                if simple_domain:
-                    domain = simple_domain.group(1)
-                # Also check for: {}, 'domain' pattern
-                domain_after_empty = re.search(r"\{\s*\}\s*,\s*['\"](\w+)['\"]", params)
-                if domain_after_empty:
-                    domain = domain_after_empty.group(1)
-
+        for m in RE_ATTRIBUTE.finditer(content):
+            i = line_of(m.start())
+            if i in skipped:
+                continue
+            attr, attr_value = m.group(1), m.group(3).strip()
+            # Skip if empty, just symbols, or numbers; a URL, path, or CSS class
+            if not attr_value or RE_ATTR_SYMBOLS.match(attr_value) \
+                    or attr_value.startswith(('http', '/', '.', '#', 'bi-', 'btn-')):
+                continue
+            if is_english(attr_value):
+                found.append((i, 1, m.start(), "UNTRANSLATED_ATTRIBUTE", f"Untranslated {attr}: '{attr_value}'",
+                              f"{attr}=\"{{{{ 'key'|trans({{ }}, 'domain') }}}}\""))
+
+        # Only check for missing trans params if no default domain is set
+        if not RE_DEFAULT_DOMAIN.search(content):
+            for m in RE_TRANS_NO_ARGS.finditer(content):
+                i = line_of(m.start())
+                if i not in skipped:
+                    trans_key = m.group(1)
+                    found.append((i, 2, m.start(), "MISSING_TRANS_PARAMS",
+                                  f"Translation without parameters: '{trans_key}|trans'",
+                                  f"'{trans_key}'|trans({{ }}, 'domain')"))
+
+        for m in RE_TRANS_CALL.finditer(content):
+            i = line_of(m.start())
+            if i in skipped:
+                continue
+            trans_key = m.group(1)
+            domain = trans_domain(m.group(2))
             if not domain:
-                # No domain specified
-                self.issues.append(TranslationIssue(
-                    file=file,
-                    line_num=line_num,
-                    line_content=line.strip(),
-                    issue_type="NO_DOMAIN",
-                    description=f"Translation without domain: '{trans_key}'",
-                    suggestion="Add explicit domain parameter"
-                ))
+                found.append((i, 3, m.start(), "NO_DOMAIN", f"Translation without domain: '{trans_key}'",
+                              "Add explicit domain parameter"))
             elif domain not in self.valid_domains:
-                # Invalid domain
-                self.issues.append(TranslationIssue(
-                    file=file,
-                    line_num=line_num,
-                    line_content=line.strip(),
-                    issue_type="INVALID_DOMAIN",
-                    description=f"Invalid domain '{domain}' for key '{trans_key}'",
-                    suggestion=f"Use one of: {', '.join(sorted(self.valid_domains))}"
-                ))
-
-    def print_report(self) -> None:
-        """Print a formatted report of all issues found."""
-        print()
-        print("="*80)
-        print("SCAN RESULTS")
-        print("="*80)
-        print()
-
-        if not self.issues:
-            print("✅ No translation issues found!")
-            print()
+                found.append((i, 3, m.start(), "INVALID_DOMAIN",
+                              f"Invalid domain '{domain}' for key '{trans_key}'",
+                              f"Use one of: {self.domain_list}"))
+
+        found.sort()
+        for i, _, _, issue_type, description, suggestion in found:
+            yield i + 1, issue_type, description, suggestion, lines[i]
+
+    def print_summary(self) -> None:
+        """Print the totals of the issues reported."""
+        total = sum(self.counts.values())
+        if not total:
+            self.print("✅ No translation issues found!")
+            self.print()
             return
 
-        # Group issues by type
-        issues_by_type: Dict[str, List[TranslationIssue]] = {}
-        for issue in self.issues:
-            if issue.issue_type not in issues_by_type:
-                issues_by_type[issue.issue_type] = []
-            issues_by_type[issue.issue_type].append(issue)
-
-        # Print summary
-        print(f"Found {len(self.issues)} issue(s) across {len(set(i.file for i in self.issues))} file(s)")
-        print()
-
-        for issue_type, issues in sorted(issues_by_type.items()):
-            print(f"{'='*80}")
-            print(f"{issue_type}: {len(issues)} issue(s)")
-            print(f"{'='*80}")
-            print()
-
-            # Group by file
-            issues_by_file: Dict[str, List[TranslationIssue]] = {}
-            for issue in issues:
-                if issue.file not in issues_by_file:
-                    issues_by_file[issue.file] = []
-                issues_by_file[issue.file].append(issue)
-
-            for file, file_issues in sorted(issues_by_file.items()):
-                print(f"📄 {file}")
-                for issue in file_issues:
-                    print(f"   Line {issue.line_num}: {issue.description}")
-                    if issue.suggestion:
-                        print(f"   💡 Suggestion: {issue.suggestion}")
-                    print(f"   Code: {issue.line_content[:100]}...")
-                    print()
-            print()
-
-        print("="*80)
-        print("SUMMARY BY TYPE")
-        print("="*80)
-        for issue_type, issues in sorted(issues_by_type.items()):
-            print(f"  {issue_type:.<40} {len(issues):>4} issue(s)")
-        print(f"  {'TOTAL':.<40} {len(self.issues):>4} issue(s)")
-        print()
+        self.print(f"Found {total} issue(s) across {self.files_with_issues} file(s)")
+        self.print()
+        self.print("=" * 80)
+        self.print("SUMMARY BY TYPE")
+        self.print("=" * 80)
+        for issue_type, n in sorted(self.counts.items()):
+            self.print(f"  {issue_type:.<40} {n:>4} issue(s)")
+        self.print(f"  {'TOTAL':.<40} {total:>4} issue(s)")
+        self.print()
+
 
 def main():
     checker = TranslationChecker()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+r"""
+check_translation_key_usage.py — Translation-key usage index.
+
+check_missing_translations diffs DE against EN and
+check_translation_dynamic_keys catalogs runtime-built prefixes; neither
+knows which catalogue keys the code actually uses. This gate indexes every
+literal key reference in templates/ and src/ with its location:
+
+  Twig :  'key'|trans   'key'|trans({}, 'domain')   (domain from the call or
+          the template's {% trans_default_domain %}, else `messages`)
+  PHP  :  ->trans('key')   ->trans('key', [], 'domain')
+          *TranslationKey => 'key' / *TranslationKey: 'key' / set*TranslationKey('key')
+          (domain resolved at runtime: any domain that defines the key)
+
+and joins it against translations/<domain>.{de,en}.yaml and the dynamic
+prefix registry (dynamic_key_prefixes.txt):
+
+  undefined  a referenced key no catalogue of its domain defines — renders
+             as the raw key. Baselined; a NEW one fails the gate.
+  unused     a catalogue key nothing references, neither literally (any
+             key-shaped string literal in src/ or templates/ counts, e.g.
+             form labels) nor via a registered dynamic prefix. Report only.
+  counts     references and distinct used keys per domain.
+
+|trans inside {% embed %} without an explicit domain is not judged (Gate 2,
+check_twig_embed_domain, owns that case), nor are calls whose key or domain
+is an expression.
+
+Per-file references and per-catalogue key sets are mapped through
+gate_runner.facts, so a run only re-parses files whose content changed.
+
+Usage:
+    python3 scripts/quality/check_translation_key_usage.py --quiet \
+        --baseline scripts/quality/baselines/translation_key_usage.txt
+    python3 scripts/quality/check_translation_key_usage.py --unused [DOMAIN]
+    python3 scripts/quality/check_translation_key_usage.py --counts
+
+Exit 0 = clean / baselined, Exit 1 = new undefined keys.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from gate_runner.catalogue import RE_TWIG_DEFAULT_DOMAIN, CatalogueError, call_args, catalogue_keys, parsed
+from gate_runner.facts import map_files
+
+ROOT = Path(__file__).resolve().parents[2]
+TRANSLATIONS_DIR = ROOT / "translations"
+REGISTRY = ROOT / "scripts" / "quality" / "dynamic_key_prefixes.txt"
+SKIP_DIRS = {"vendor", "node_modules", "var", ".claude", "tests/Fixtures", "migrations"}
+ANY_DOMAIN = "*"
+
+_STR = r"""(?:'((?:[^'\\\n]|\\.)*)'|"((?:[^"\\\n]|\\.)*)")"""
+RE_TWIG_TRANS = re.compile(_STR + r"\s*\|\s*trans\b(\s*\()?")
+RE_TWIG_EMBED = re.compile(r"""\{%-?\s*(embed|endembed)\b""")
+RE_PHP_TRANS = re.compile(r"->trans\(\s*" + _STR)
+RE_PHP_KEY_REF = re.compile(
+    r"""\b(?:set)?\w*TranslationKey\b['"]?\s*(?:=>|:|=|\()\s*""" + _STR, re.IGNORECASE
+)
+# Key-shaped literals (`risk.field.title`): form labels, macro props, choice maps.
+RE_KEY_LITERAL = re.compile(r"""['"]([a-z][a-z0-9_-]*(?:\.[a-z0-9_-]+)+)['"]""", re.IGNORECASE)
+RE_TWIG_COMMENT = re.compile(r"\{#.*?#\}", re.DOTALL)
+RE_PHP_COMMENT = re.compile(r"/\*.*?\*/|^[ \t]*//[^\n]*", re.DOTALL | re.MULTILINE)
+# `.` right after a PHP literal: the key is concatenated at runtime.
+RE_CONCAT = re.compile(r"\s*\.")
+RE_STRING_ARG = re.compile(r"""^\s*(?:domain\s*[:=]\s*)?""" + _STR + r"""\s*$""")
+
+
+def _blank(m: re.Match) -> str:
+    # Same-length whitespace, so offsets and line numbers stay put.
+    return re.sub(r"[^\n]", " ", m.group(0))
+
+
+def is_skipped(path: Path) -> bool:
+    parts = path.relative_to(ROOT).parts
+    for skip in SKIP_DIRS:
+        if "/" in skip:
+            seg = tuple(skip.split("/"))
+            if any(parts[i:i + len(seg)] == seg for i in range(len(parts))):
+                return True
+        elif skip in parts:
+            return True
+    return False
+
+
+def _literal(m: re.Match, first: int = 1) -> str:
+    single, double = m.group(first), m.group(first + 1)
+    return single if single is not None else double
+
+
+def _domain_arg(args: list[str] | None, index: int, default: str | None) -> str | None:
+    """Domain literal at args[index] (or a `domain:` named arg); `default`
+    when absent; None when it is an expression or the call is unbalanced."""
+    if args is None:
+        return None
+    for arg in args:
+        m = re.match(r"\s*domain\s*[:=]", arg)
+        if m:
+            lit = RE_STRING_ARG.match(arg)
+            return _literal(lit) if lit else None
+    if len(args) <= index or not args[index].strip():
+        return default
+    lit = RE_STRING_ARG.match(args[index])
+    return _literal(lit) if lit else None
+
+
+def _is_static(key: str, text: str = "", end: int | None = None) -> bool:
+    """A plain key: no interpolation, not the head of a concatenation
+    (checked at `end`, right after the literal, when given)."""
+    return (bool(key.strip()) and not key.endswith(".")
+            and not (end is not None and RE_CONCAT.match(text, end))
+            and not any(mark in key for mark in ("#{", "{{", "{$", "\\")))
+
+
+def _line_index(text: str):
+    starts = [0] + [i + 1 for i, ch in enumerate(text) if ch == "\n"]
+
+    def line_of(pos: int) -> int:
+        lo, hi = 0, len(starts)
+        while lo + 1 < hi:
+            mid = (lo + hi) // 2
+            if starts[mid] <= pos:
+                lo = mid
+            else:
+                hi = mid
+        return lo + 1
+    return line_of
+
+
+def twig_refs(text: str) -> tuple[tuple[tuple[str, str, int], ...], frozenset[str]]:
+    """((domain, key, line), ...) for every literal |trans, and the
+    key-shaped literals of one template."""
+    text = RE_TWIG_COMMENT.sub(_blank, text)
+    literals = frozenset(RE_KEY_LITERAL.findall(text)) if "." in text else frozenset()
+    if "trans" not in text:
+        return (), literals
+    m = RE_TWIG_DEFAULT_DOMAIN.search(text)
+    default = m.group(1) if m else "messages"
+    embeds = []  # (start, end) of {% embed %} regions
+    depth = 0
+    open_at = 0
+    for m in RE_TWIG_EMBED.finditer(text):
+        if m.group(1) == "embed":
+            if depth == 0:
+                open_at = m.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                embeds.append((open_at, m.end()))
+    line_of = _line_index(text)
+    refs = []
+    for m in RE_TWIG_TRANS.finditer(text):
+        key = _literal(m)
+        if not _is_static(key):
+            continue
+        in_embed = any(a <= m.start() < b for a, b in embeds)
+        args = call_args(text, m.end() - 1) if m.group(3) else []
+        domain = _domain_arg(args, 1, None if in_embed else default)
+        if domain is not None:
+            refs.append((domain, key, line_of(m.start())))
+    return tuple(refs), literals
+
+
+def php_refs(text: str) -> tuple[tuple[tuple[str, str, int], ...], frozenset[str]]:
+    """((domain, key, line), ...) for every literal ->trans() and
+    *TranslationKey reference, and the key-shaped literals of one PHP file."""
+    text = RE_PHP_COMMENT.sub(_blank, text)
+    literals = frozenset(RE_KEY_LITERAL.findall(text)) if "." in text else frozenset()
+    if "trans" not in text and "TranslationKey" not in text:
+        return (), literals
+    line_of = _line_index(text)
+    refs = []
+    for m in RE_PHP_TRANS.finditer(text):
+        key = _literal(m)
+        if not _is_static(key, text, m.end()):
+            continue
+        call = text.index("(", m.start())
+        domain = _domain_arg(call_args(text, call), 2, "messages")
+        if domain is not None:
+            refs.append((domain, key, line_of(m.start())))
+    for m in RE_PHP_KEY_REF.finditer(text):
+        key = _literal(m)
+        if _is_static(key, text, m.end()):
+            refs.append((ANY_DOMAIN, key, line_of(m.start())))
+    return tuple(refs), literals
+
+
+def collect_catalogue() -> dict[str, set[str]]:
+    """domain -> keys defined in any locale of it."""
+    out: dict[str, set[str]] = {}
+    for path, keys in parsed(map_files(catalogue_keys, sorted(TRANSLATIONS_DIR.glob("*.yaml")))).items():
+        domain = path.name.split(".")[0].replace("+intl-icu", "")
+        out.setdefault(domain, set()).update(keys)
+    return out
+
+
+def collect_refs() -> tuple[list[tuple[str, str, Path, int]], set[str]]:
+    """[(domain, key, file, line)] and every key-shaped literal, src/ + templates/."""
+    refs: list[tuple[str, str, Path, int]] = []
+    literals: set[str] = set()
+    php = [p for p in sorted((ROOT / "src").rglob("*.php")) if not is_skipped(p)]
+    twig = [p for p in sorted((ROOT / "templates").rglob("*.twig")) if not is_skipped(p)]
+    for func, paths in ((php_refs, php), (twig_refs, twig)):
+        for path, (found, keyish) in map_files(func, paths).items():
+            refs.extend((domain, key, path, line) for domain, key, line in found)
+            literals |= keyish
+    return refs, literals
+
+
+def parse_registry(path: Path) -> list[str]:
+    if not path.exists():
+        return []
+    out = []
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        s = raw.strip()
+        if s and not s.startswith("#"):
+            out.append(s.split("\t", 1)[0])
+    return out
+
+
+def _rel(p: Path) -> Path:
+    try:
+        return p.relative_to(ROOT)
+    except ValueError:
+        return Path(p.name)
+
+
+def analyse(registry: Path = REGISTRY):
+    """(undefined refs, unused {domain: sorted keys}, {domain: (refs, used keys, keys)})."""
+    catalogue = collect_catalogue()
+    refs, literals = collect_refs()
+    everywhere = set().union(*catalogue.values()) if catalogue else set()
+
+    undefined = []
+    used: dict[str, set[str]] = {}
+    ref_counts: dict[str, int] = {}
+    anywhere = set(literals)
+    for domain, key, path, line in refs:
+        if domain == ANY_DOMAIN:
+            anywhere.add(key)
+            if key not in everywhere:
+                undefined.append((domain, key, path, line))
+            continue
+        ref_counts[domain] = ref_counts.get(domain, 0) + 1
+        used.setdefault(domain, set()).add(key)
+        if key not in catalogue.get(domain, ()):
+            undefined.append((domain, key, path, line))
+
+    prefixes = tuple(p + "." for p in parse_registry(registry))
+    unused: dict[str, list[str]] = {}
+    counts: dict[str, tuple[int, int, int]] = {}
+    for domain in sorted(catalogue):
+        keys = catalogue[domain]
+        hit = used.get(domain, set()) & keys
+        dead = sorted(k for k in keys - hit - anywhere if not k.startswith(prefixes))
+        if dead:
+            unused[domain] = dead
+        counts[domain] = (ref_counts.get(domain, 0), len(hit), len(keys))
+    for domain in sorted(set(ref_counts) - set(catalogue)):
+        counts[domain] = (ref_counts[domain], 0, 0)
+    return undefined, unused, counts
+
+
+def load_baseline(path: Path | None) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    return {
+        s.strip() for s in path.read_text(encoding="utf-8").splitlines()
+        if s.strip() and not s.strip().startswith("#")
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--baseline", type=Path, default=None)
+    ap.add_argument("--write-baseline", type=Path, default=None)
+    ap.add_argument("--registry", type=Path, default=REGISTRY)
+    ap.add_argument("--unused", nargs="?", const="", default=None, metavar="DOMAIN",
+                    help="list unused catalogue keys (of one domain)")
+    ap.add_argument("--counts", action="store_true", help="print per-domain usage counts")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args()
+
+    try:
+        undefined, unused, counts = analyse(args.registry)
+    except CatalogueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+    keys = sorted({f"{domain}:{key}" for domain, key, _, _ in undefined})
+
+    if args.write_baseline is not None:
+        args.write_baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.write_baseline.open("w", encoding="utf-8") as fh:
+            fh.write("# check_translation_key_usage.py baseline\n")
+            fh.write("# Format: <domain>:<key>   (domain * = any, for *TranslationKey refs)\n")
+            for k in keys:
+                fh.write(k + "\n")
+        print(f"check_translation_key_usage: wrote {len(keys)} entries to {args.write_baseline}")
+        return 0
+
+    if args.unused is not None:
+        for domain, dead in unused.items():
+            if args.unused in ("", domain):
+                for key in dead:
+                    print(f"{domain}:{key}")
+        return 0
+    if args.counts:
+        print(f"{'domain':40} {'refs':>6} {'used':>6} {'keys':>6}")
+        for domain, (n_refs, n_used, n_keys) in sorted(counts.items(), key=lambda item: -item[1][0]):
+            print(f"{domain:40} {n_refs:6d} {n_used:6d} {n_keys:6d}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    new = [u for u in undefined if f"{u[0]}:{u[1]}" not in baseline]
+    n_new = len({f"{d}:{k}" for d, k, _, _ in new})
+    n_unused = sum(map(len, unused.values()))
+    total = len(keys)
+    baselined = total - n_new
+
+    if not new:
+        if not args.quiet:
+            print(f"check_translation_key_usage: OK — {total} undefined key(s), {baselined} baselined; "
+                  f"{n_unused} unused catalogue key(s) in {len(unused)} domain(s) (--unused lists them).")
+        else:
+            print(f"check_translation_key_usage: OK ({total}, all baselined)")
+        return 0
+
+    print("check_translation_key_usage: UNDEFINED KEYS\n")
+    for domain, key, path, line in sorted(new, key=lambda u: (str(u[2]), u[3])):
+        where = "any domain" if domain == ANY_DOMAIN else f"domain '{domain}'"
+        print(f"FAIL {_rel(path)}:{line}: '{key}' is not defined in {where}")
+    print(f"\ncheck_translation_key_usage: {n_new} new undefined key(s) ({baselined} baselined, {total} total).")
+    print("Fix: add the key to translations/<domain>.{de,en}.yaml or correct the domain/key.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,9 @@ silently resolve to the messages fallback instead of the intended file.
 Top-level allowlist (per CLAUDE.md): alva, inbox, global, data_breach,
 processing_activity, common, app, breadcrumb. New tooling keys should be
 nested under the domain.
+
+Top-level keys come from the gate_runner.yamlkeys table, so only catalogues
+changed since the last run are rescanned.
 """
 from __future__ import annotations
 
@@ -23,6 +26,8 @@ import re
 import sys
 from pathlib import Path
 
+from gate_runner.yamlkeys import Entry, table, top_level
+
 ROOT = Path(__file__).resolve().parents[2]
 TR_DIR = ROOT / "translations"
 EXEMPT_DOMAINS = {"messages"}
@@ -31,22 +36,12 @@ ALLOWLIST = {
     "common", "app", "breadcrumb",
 }
 
-RE_TOP_KEY = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*):", re.MULTILINE)
+RE_TOP_KEY = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
 
 
-def parse_top_keys(path: Path) -> list[tuple[int, str]]:
-    try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return []
-    out: list[tuple[int, str]] = []
-    for idx, raw in enumerate(text.splitlines(), start=1):
-        if not raw or raw[0] in (" ", "\t", "#"):
-            continue
-        m = re.match(r"^([a-zA-Z_][a-zA-Z0-9_]*):", raw)
-        if m:
-            out.append((idx, m.group(1)))
-    return out
+def parse_top_keys(entries: tuple[Entry, ...]) -> list[tuple[int, str]]:
+    # Quoted flat keys ('risk.validation.x': ...) are not section keys.
+    return [(e.line, e.path) for e in top_level(entries) if RE_TOP_KEY.fullmatch(e.path)]
 
 
 def load_baseline(path: Path | None) -> set[str]:
@@ -79,14 +74,14 @@ def main() -> int:
         return 2
 
     violations: list[tuple[Path, int, str]] = []
-    for path in sorted(TR_DIR.glob("*.yaml")):
+    for path, entries in table(sorted(TR_DIR.glob("*.yaml"))).items():
         parts = path.name.split(".")
         if len(parts) < 3:
             continue
         domain = parts[0]
         if domain in EXEMPT_DOMAINS:
             continue
-        for ln, key in parse_top_keys(path):
+        for ln, key in parse_top_keys(entries):
             if key == domain or key in ALLOWLIST:
                 continue
             violations.append((path, ln, f"top-level key '{key}' not domain '{domain}'"))
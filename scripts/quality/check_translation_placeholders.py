@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+r"""
+check_translation_placeholders.py — Placeholder parity across locales.
+
+Gate 9 (check_alva_hint_placeholders) matches the `%param%` placeholders of
+the alva domain against the params its PHP rules declare; no gate compares
+a message with its own translations. A DE message that drops `%count%`, or
+renames `%threshold%` to `%schwelle%`, renders wrong or raw at runtime and
+passes every other check.
+
+One pass over translations/*.yaml extracts, for every key of every domain
+and locale, the set of placeholders its message uses:
+
+  %name%                      Symfony parameters
+  {{ name }}                  validator message parameters
+  {name}                      ICU arguments (also {name, number, ...})
+  {name, plural}              ICU plural / selectordinal (the selectors
+  {name, selectordinal}       are the locale's CLDR categories, so only
+                              the argument must match)
+  {name, select, a|b|other}   ICU select (selectors are data: must match)
+
+and nested sub-messages are scanned the same way. Every key defined in two
+or more locales of a domain must use the same set in each; the difference is
+reported per locale. \0NoFill placeholders count as undefined, and keys a
+locale lacks are check_missing_translations' concern.
+
+Catalogues are read with gate_runner.catalogue, so a key here is a key to
+every translation gate. The per-file placeholder sets are mapped through
+gate_runner.facts, so a run only re-parses catalogues whose content changed.
+
+Usage:
+    python3 scripts/quality/check_translation_placeholders.py --quiet \
+        --baseline scripts/quality/baselines/translation_placeholders.txt
+    python3 scripts/quality/check_translation_placeholders.py --domain risk
+
+Exit 0 = clean / baselined, Exit 1 = new mismatches.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from gate_runner.catalogue import CatalogueError, flatten, load, parsed
+from gate_runner.facts import map_files
+
+ROOT = Path(__file__).resolve().parents[2]
+TRANSLATIONS_DIR = ROOT / "translations"
+NOFILL = ("\x00NoFill", "\\0NoFill")
+
+RE_PERCENT = re.compile(r"%[A-Za-z_][\w.-]*%")
+RE_VALIDATOR = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+RE_ICU_ARG = re.compile(r"\{\s*([A-Za-z_]\w*)\s*(?:,\s*(\w+)\s*)?([,}])")
+RE_ICU_OPTION = re.compile(r"\s*(?:offset:\s*\d+\s*)?(=?[\w-]+)\s*\{")
+
+
+def _closing(text: str, start: int) -> int:
+    """Index of the `}` closing the `{` at start (len(text) if unbalanced)."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text)
+
+
+def _icu(text: str, out: set[str]) -> None:
+    pos = 0
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            return
+        end = _closing(text, start)
+        if text.startswith("{{", start):
+            m = RE_VALIDATOR.match(text, start)
+            if m is not None:
+                out.add(f"{{{{ {m.group(1)} }}}}")
+            pos = end + 1
+            continue
+        m = RE_ICU_ARG.match(text, start)
+        if m is None:  # `{0}` interval, stray brace: look inside
+            pos = start + 1
+            continue
+        name, kind, after = m.groups()
+        if kind not in ("plural", "selectordinal", "select") or after != ",":
+            out.add(f"{{{name}}}")
+            pos = end + 1
+            continue
+        selectors = []
+        at = m.end()
+        while (option := RE_ICU_OPTION.match(text, at, end)) is not None:
+            sub = option.end() - 1
+            sub_end = _closing(text, sub)
+            selectors.append(option.group(1))
+            _icu(text[sub + 1:sub_end], out)
+            at = sub_end + 1
+        out.add(f"{{{name}, select, {'|'.join(sorted(selectors))}}}" if kind == "select"
+                else f"{{{name}, {kind}}}")
+        pos = end + 1
+
+
+def placeholders(message: str) -> frozenset[str]:
+    """Every placeholder `message` uses (see the module docstring)."""
+    out = set(RE_PERCENT.findall(message))
+    if "{" in message:
+        _icu(message, out)
+    return frozenset(out)
+
+
+def catalogue_placeholders(text: str) -> tuple[frozenset[str], dict[str, frozenset[str]]] | str:
+    """(keys with a real message, {key: placeholders} for those that have
+    any) of one catalogue file; the parse error message if it does not
+    parse (see catalogue.parsed)."""
+    try:
+        data = load(text)
+    except CatalogueError as exc:
+        return str(exc)
+    keys = set()
+    found = {}
+    for key, message in flatten(data):
+        if not isinstance(message, str) or any(marker in message for marker in NOFILL):
+            continue
+        keys.add(key)
+        used = placeholders(message)
+        if used:
+            found[key] = used
+    return frozenset(keys), found
+
+
+def collect() -> dict[str, dict[str, tuple[frozenset[str], dict[str, frozenset[str]]]]]:
+    """domain -> locale -> (keys, {key: placeholders})."""
+    out: dict[str, dict[str, tuple[frozenset[str], dict[str, frozenset[str]]]]] = {}
+    paths = sorted(TRANSLATIONS_DIR.glob("*.yaml"))
+    for path, facts in parsed(map_files(catalogue_placeholders, paths)).items():
+        parts = path.name.split(".")
+        if len(parts) < 3:
+            continue
+        domain = parts[0].replace("+intl-icu", "")
+        out.setdefault(domain, {})[parts[-2]] = facts
+    return out
+
+
+def mismatches(catalogue) -> list[tuple[str, str, dict[str, frozenset[str]]]]:
+    """[(domain, key, {locale: placeholders})] for every key whose locales
+    disagree."""
+    found = []
+    for domain in sorted(catalogue):
+        locales = catalogue[domain]
+        if len(locales) < 2:
+            continue
+        keys: set[str] = set()
+        for locale_keys, _ in locales.values():
+            keys |= locale_keys
+        for key in sorted(keys):
+            sets = {locale: used.get(key, frozenset())
+                    for locale, (locale_keys, used) in sorted(locales.items()) if key in locale_keys}
+            if len(sets) > 1 and len(set(sets.values())) > 1:
+                found.append((domain, key, sets))
+    return found
+
+
+def describe(sets: dict[str, frozenset[str]]) -> str:
+    """`en lacks %count%; de lacks %x%` against the union of all locales."""
+    union = frozenset().union(*sets.values())
+    return "; ".join(f"{locale} lacks {', '.join(sorted(union - used))}"
+                     for locale, used in sets.items() if union - used)
+
+
+def load_baseline(path: Path | None) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    return {
+        s.strip() for s in path.read_text(encoding="utf-8").splitlines()
+        if s.strip() and not s.strip().startswith("#")
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--baseline", type=Path, default=None)
+    ap.add_argument("--write-baseline", type=Path, default=None)
+    ap.add_argument("--domain", default=None, help="only report this domain")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args()
+
+    try:
+        found = mismatches(collect())
+    except CatalogueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+    if args.domain is not None:
+        found = [f for f in found if f[0] == args.domain]
+    ids = sorted({f"{domain}:{key}" for domain, key, _ in found})
+
+    if args.write_baseline is not None:
+        args.write_baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.write_baseline.open("w", encoding="utf-8") as fh:
+            fh.write("# check_translation_placeholders.py baseline\n")
+            fh.write("# Format: <domain>:<key>\n")
+            for fid in ids:
+                fh.write(fid + "\n")
+        print(f"check_translation_placeholders: wrote {len(ids)} entries to {args.write_baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    new = [f for f in found if f"{f[0]}:{f[1]}" not in baseline]
+    total = len(ids)
+    baselined = total - len(new)
+
+    if not new:
+        if not args.quiet:
+            print(f"check_translation_placeholders: OK — {total} placeholder mismatch(es), {baselined} baselined.")
+        else:
+            print(f"check_translation_placeholders: OK ({total}, all baselined)")
+        return 0
+
+    print("check_translation_placeholders: PLACEHOLDER MISMATCHES\n")
+    for domain, key, sets in new:
+        print(f"FAIL {domain}:{key} — {describe(sets)}")
+    print(f"\ncheck_translation_placeholders: {len(new)} new mismatch(es) ({baselined} baselined, {total} total).")
+    print("Fix: use the same placeholders in translations/<domain>.<locale>.yaml for every locale.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
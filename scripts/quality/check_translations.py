@@ -9,6 +9,8 @@ from pathlib import Path
 from collections import defaultdict
 import sys
 
+from gate_runner.yamlkeys import leaves, table
+
 
 class TranslationChecker:
     def __init__(self, de_file, en_file):
@@ -26,7 +28,7 @@ class TranslationChecker:
 
         if isinstance(data, dict):
             for key, value in data.items():
-                current_key = f"{prefix}.{key}" if prefix else key
+                current_key = f"{prefix}.{key}" if prefix else str(key)
 
                 if isinstance(value, dict):
                     # This is a nested structure
@@ -38,54 +40,18 @@ class TranslationChecker:
         return keys_dict
 
     def parse_file_with_line_numbers(self, file_path):
-        """Parse YAML file and track line numbers for duplicate detection"""
-        keys_with_lines = {}
+        """Leaf keys with their line numbers, and the ones defined twice
+        (from the gate_runner.yamlkeys table of the file)"""
+        entries = table([Path(file_path)]).get(Path(file_path), ())
         key_occurrences = defaultdict(list)
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        current_path = []
-        indent_stack = [0]
-
-        for line_num, line in enumerate(lines, 1):
-            # Skip empty lines and comments
-            stripped = line.lstrip()
-            if not stripped or stripped.startswith('#'):
-                continue
-
-            # Calculate indentation
-            indent = len(line) - len(stripped)
-
-            # Check if this is a key-value line
-            if ':' in stripped:
-                key_part = stripped.split(':', 1)[0].strip()
-                value_part = stripped.split(':', 1)[1].strip() if ':' in stripped else ''
-
-                # Adjust path based on indentation
-                while indent_stack and indent <= indent_stack[-1] and len(current_path) > 0:
-                    indent_stack.pop()
-                    current_path.pop()
-
-                # Add current key to path
-                if value_part and value_part != '':
-                    # This is a leaf node
-                    full_key = '.'.join(current_path + [key_part]) if current_path else key_part
-                    key_occurrences[full_key].append({
-                        'line': line_num,
-                        'value': value_part
-                    })
-                else:
-                    # This is a parent node
-                    current_path.append(key_part)
-                    indent_stack.append(indent)
-
-        # Find duplicates
-        duplicates = {}
-        for key, occurrences in key_occurrences.items():
-            if len(occurrences) > 1:
-                duplicates[key] = occurrences
-
+        for entry in leaves(entries):
+            key_occurrences[entry.path].append({
+                'line': entry.line,
+                'value': entry.value
+            })
+
+        duplicates = {key: occurrences for key, occurrences in key_occurrences.items()
+                      if len(occurrences) > 1}
         return key_occurrences, duplicates
 
     def analyze(self):
@@ -289,8 +255,9 @@ class TranslationChecker:
 
 
 if __name__ == '__main__':
-    de_file = '/home/user/Little-ISMS-Helper/translations/messages.de.yaml'
-    en_file = '/home/user/Little-ISMS-Helper/translations/messages.en.yaml'
+    translations = Path(__file__).resolve().parents[2] / 'translations'
+    de_file = translations / 'messages.de.yaml'
+    en_file = translations / 'messages.en.yaml'
 
     checker = TranslationChecker(de_file, en_file)
     checker.analyze()
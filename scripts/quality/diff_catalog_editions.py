@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare two editions of a requirement catalogue.
+
+Usage:
+  python3 scripts/quality/diff_catalog_editions.py \
+      fixtures/library/catalogues/bsi-c5-2020-de \
+      fixtures/library/catalogues/bsi-c5-2026-en \
+      [--decomposition-dir fixtures/library/decompositions] [--out var/audit/c5_diff.json]
+
+OLD/NEW are catalogue directories (fixtures/library/catalogues/<id>) or framework
+YAMLs (fixtures/library/frameworks/<id>.yaml). Requirements are fingerprinted by
+normalized title + text hash; renumbered IDs are matched through the hash index.
+Prints added/removed/changed/moved counts and, against the matching
+decomp_<old>_<new>.json, the decomposition entries the diff implies but the file
+lacks plus entries that no longer resolve. --write-proposal appends the
+proposals to that decomposition JSON (review the git diff before committing).
+"""
+import argparse
+import json
+import os
+import sys
+
+# Allow running as `python3 scripts/quality/diff_catalog_editions.py` from project root
+# without needing an explicit PYTHONPATH=. prefix.
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from scripts.quality.mapping_audit import edition_diff as ed
+from scripts.quality.mapping_audit import io as audit_io
+
+
+def _name(path):
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("old")
+    ap.add_argument("new")
+    ap.add_argument("--decomposition-dir", default="fixtures/library/decompositions")
+    ap.add_argument("--decomposition", default="", help="explicit decomp JSON (default: derived from names)")
+    ap.add_argument("--out", default="", help="write the full diff + proposals as JSON")
+    ap.add_argument("--write-proposal", action="store_true",
+                    help="append proposed entries to the decomposition JSON")
+    ap.add_argument("--limit", type=int, default=20, help="IDs listed per category")
+    args = ap.parse_args()
+
+    old_name, new_name = _name(args.old), _name(args.new)
+    old, new = ed.load_edition(args.old), ed.load_edition(args.new)
+    diff = ed.diff_editions(old, new)
+
+    print(f"{old_name} ({len(old)}) -> {new_name} ({len(new)})")
+    for key in ("unchanged", "changed", "moved", "added", "removed"):
+        items = diff[key]
+        shown = [f"{m['from']}->{m['to']}" if key == "moved" else m for m in items[:args.limit]]
+        more = f" (+{len(items) - args.limit} more)" if len(items) > args.limit else ""
+        listing = f": {', '.join(shown)}{more}" if key != "unchanged" and items else ""
+        print(f"  {key:9} {len(items):5}{listing}")
+
+    decomp_path = args.decomposition or ed.decomposition_path(args.decomposition_dir, old_name, new_name)
+    existing = []
+    if os.path.exists(decomp_path):
+        with open(decomp_path, encoding="utf-8") as fh:
+            existing = json.load(fh)
+    proposals, stale = ed.propose_decomposition(diff, existing, new_name)
+    state = "" if existing else " (does not exist yet)"
+    print(f"decomposition {decomp_path}{state}: {len(existing)} entries, "
+          f"{len(proposals)} proposed, {len(stale)} stale")
+    for e in stale[:args.limit]:
+        print(f"  STALE {e.get('source')} -> {e.get('target')} ({e.get('relationship')})")
+
+    if args.out:
+        audit_io.write_dossier(args.out, {"old": old_name, "new": new_name, "diff": diff,
+                                          "decomposition": decomp_path,
+                                          "proposals": proposals, "stale": stale})
+        print(f"diff -> {args.out}")
+    if args.write_proposal and proposals:
+        with open(decomp_path, "w", encoding="utf-8") as fh:
+            json.dump(existing + proposals, fh, ensure_ascii=False, indent=2)
+            fh.write("\n")
+        print(f"appended {len(proposals)} proposal(s) -> {decomp_path}")
+
+
+if __name__ == "__main__":
+    main()
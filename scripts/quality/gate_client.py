@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Check files (or an unsaved editor buffer) against the quality gates.
+
+Talks to a running `run_gates.py --serve`, which keeps the gate state warm,
+so a single template is re-checked in tens of milliseconds. Without a server
+the same check runs in-process (cold, a few seconds).
+
+Usage:
+    python3 scripts/quality/gate_client.py templates/risk/index.html.twig
+    python3 scripts/quality/gate_client.py --gates nested_forms,no_bi_classes FILE...
+    python3 scripts/quality/gate_client.py --stdin templates/risk/index.html.twig < buffer
+    python3 scripts/quality/gate_client.py $(git diff --cached --name-only)   # pre-commit
+    python3 scripts/quality/gate_client.py --stop
+
+Only gates whose inputs cover the given paths run (all selected gates when no
+path is given). --json prints the raw server reply for editor plugins.
+
+Exit 0 = no blocking gate failed, 1 = at least one did, 2 = bad request.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+from scripts.quality.gate_runner.daemon import (  # noqa: E402
+    GateService, request, result_from_json,
+)
+from scripts.quality.gate_runner.execute import format_result  # noqa: E402
+from scripts.quality.gate_runner.manifest import load_manifest, select  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="*", help="files to check (worktree content)")
+    ap.add_argument("--gates", default="", help="comma-separated gate names (default: affected gates)")
+    ap.add_argument("--stdin", metavar="PATH", help="read the content of PATH from stdin (unsaved buffer)")
+    ap.add_argument("--socket", type=Path, default=None, help="server socket (default: per-user path)")
+    ap.add_argument("--no-fallback", action="store_true", help="fail instead of checking in-process")
+    ap.add_argument("--json", action="store_true", help="print the server reply as JSON")
+    ap.add_argument("--verbose", action="store_true", help="show output of passing gates too")
+    ap.add_argument("--stop", action="store_true", help="ask the server to exit")
+    args = ap.parse_args()
+
+    if args.stop:
+        try:
+            request({"op": "stop"}, args.socket, timeout=5.0)
+        except OSError:
+            print("gate_client: no server running", file=sys.stderr)
+        return 0
+
+    names = [n.strip() for n in args.gates.split(",") if n.strip()]
+    paths = [os.path.abspath(p) for p in args.paths]
+    buffers = {os.path.abspath(args.stdin): sys.stdin.read()} if args.stdin else {}
+    payload = {"op": "check", "paths": paths, "buffers": buffers, "gates": names}
+    try:
+        reply = request(payload, args.socket)
+    except OSError:
+        if args.no_fallback:
+            print("gate_client: no server running (start: run_gates.py --serve)", file=sys.stderr)
+            return 2
+        try:
+            reply = GateService(select(load_manifest(), names)).handle(payload)
+        except ValueError as exc:
+            reply = {"ok": False, "error": str(exc)}
+
+    if args.json:
+        print(json.dumps(reply, indent=2))
+    if "error" in reply:
+        print(f"gate_client: {reply['error']}", file=sys.stderr)
+        return 2
+    if not args.json:
+        for data in reply["results"]:
+            result = result_from_json(data)
+            if data["narrowed"] is not None:
+                result.name += f" [{len(data['narrowed'])} file(s)]"
+            print(format_result(result, args.verbose))
+        print(f"{len(reply['results'])} gate(s) in {reply['seconds']:.2f}s")
+    return 0 if reply["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Translation catalogue helpers shared by the translation gates.
+
+One definition of what a catalogue key is, so check_missing_translations,
+check_translation_key_usage, check_translation_dynamic_keys and
+check_translation_placeholders agree on whether a key exists:
+
+    Loader          PyYAML loader (the C one when available) that reads the
+                    scalars as Symfony does: only true/false are booleans,
+                    so a key like `yes:` or `no:` stays a string
+    load()          the parsed catalogue; CatalogueError if the text is
+                    not YAML
+    flatten()       (dotted key, value) per leaf, Symfony translator
+                    semantics: nested mappings join with `.`, list items
+                    are keys too (`prefix.0`), any scalar (also null) is a
+                    leaf
+    catalogue_keys() the dotted keys of one catalogue file's text, or the
+                    parse error message (a str) for a file that does not
+                    parse: map_files() facts must pickle and keep the path
+    parsed()        map_files() results over catalogues, or CatalogueError
+                    naming every file whose fact is such a message
+
+A catalogue that does not parse is an error, never an empty key set: the
+gates print the CatalogueError and exit 2.
+
+plus what the gates need to read the domain off a trans call:
+
+    call_args()     top-level arguments of the call whose `(` is at start
+    RE_TWIG_DEFAULT_DOMAIN
+                    a template's {% trans_default_domain %}
+"""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+import yaml
+
+RE_TWIG_DEFAULT_DOMAIN = re.compile(r"""\{%-?\s*trans_default_domain\s+['"]([\w.+-]+)['"]""")
+
+_BOOL = "tag:yaml.org,2002:bool"
+_Base = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class Loader(_Base):
+    """Symfony's YAML 1.2 scalars: only true/false are booleans."""
+
+
+Loader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag != _BOOL]
+    for first, resolvers in _Base.yaml_implicit_resolvers.items()
+}
+Loader.add_implicit_resolver(_BOOL, re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF"))
+
+
+def flatten(data: Any, prefix: str = "") -> Iterable[tuple[str, Any]]:
+    """(dotted key, value) for every leaf of a parsed catalogue."""
+    if isinstance(data, dict):
+        items = ((f"{prefix}.{k}" if prefix else str(k), v) for k, v in data.items())
+    elif isinstance(data, list):
+        items = ((f"{prefix}.{i}", v) for i, v in enumerate(data))
+    else:
+        return
+    for key, value in items:
+        if isinstance(value, (dict, list)):
+            yield from flatten(value, key)
+        else:
+            yield key, value
+
+
+class CatalogueError(ValueError):
+    """A translation catalogue that is not valid YAML."""
+
+
+def load(text: str) -> Any:
+    """The parsed catalogue; CatalogueError if `text` is not valid YAML."""
+    try:
+        return yaml.load(text, Loader=Loader) or {}
+    except yaml.YAMLError as exc:
+        raise CatalogueError(str(exc)) from exc
+
+
+def catalogue_keys(text: str) -> frozenset[str] | str:
+    try:
+        data = load(text)
+    except CatalogueError as exc:
+        return str(exc)
+    return frozenset(key for key, _ in flatten(data))
+
+
+def parsed(facts: dict[Path, Any]) -> dict[Path, Any]:
+    """`facts` as is; CatalogueError listing every path whose fact is a
+    parse error message (see catalogue_keys)."""
+    bad = [f"{path}: {fact}" for path, fact in facts.items() if isinstance(fact, str)]
+    if bad:
+        raise CatalogueError("unparsable catalogue(s):\n" + "\n".join(bad))
+    return facts
+
+
+def call_args(text: str, start: int) -> list[str] | None:
+    """Top-level comma-separated arguments of the call whose `(` is at
+    start; None if it is unbalanced (or absurdly long)."""
+    out: list[str] = []
+    buf: list[str] = []
+    depth = 0
+    quote = ""
+    for ch in text[start:start + 2000]:
+        if quote:
+            buf.append(ch)
+            if ch == quote:
+                quote = ""
+            continue
+        if ch in "'\"":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+            if depth == 1:
+                continue
+        elif ch in ")]}":
+            depth -= 1
+            if depth == 0:
+                out.append("".join(buf))
+                return out
+        elif ch == "," and depth == 1:
+            out.append("".join(buf))
+            buf = []
+            continue
+        buf.append(ch)
+    return None
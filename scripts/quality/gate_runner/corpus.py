@@ -0,0 +1,295 @@
+"""In-memory view of the files the gates read.
+
+WorktreeCorpus walks the gate input roots with os.scandir and keeps a stat
+cache {rel: (mtime_ns, size)}. rescan() returns the paths that were added,
+modified or removed since the previous scan, so a watcher only has to stat
+the tree, never re-read it. File contents are cached next to the stat entry
+they were read under and dropped as soon as that entry changes.
+
+A snapshot (see snapshot.py) may back the corpus: files whose stamp matches
+their snapshot record are read from its memory map instead of from disk, and
+from_snapshot() builds a corpus from one without walking the tree at all.
+
+Unsaved editor buffers can be laid over the tree with overlay(); they shadow
+(or add) files for reads and listings until the context exits.
+
+track() records what a piece of code read (file stamps) and which directory
+listings it saw, so results derived from the corpus can be memoized and
+reused until one of those inputs changes (see execute.Memo).
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Callable
+
+SKIP_DIRS = {".git", "node_modules", "vendor", "var", "__pycache__", ".pytest_cache"}
+
+
+class Deps:
+    """Inputs observed while tracking: file stamps and directory listings."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, object] = {}
+        # (rel_dir, pattern, hidden_ok) -> the entries the listing returned
+        self.listings: dict[tuple[str, str, bool], tuple[str, ...]] = {}
+        self.opaque = False  # touched the real filesystem -> cannot validate
+
+    def files_fresh(self, corpus: "WorktreeCorpus") -> bool:
+        return all(corpus.stamp(rel) == st for rel, st in self.files.items())
+
+
+class WorktreeCorpus:
+    # True when the corpus is the whole truth below its roots (a git tree):
+    # vfs then answers misses itself instead of asking the real filesystem.
+    sealed = False
+
+    def __init__(self, root: Path, roots: list[str], snapshot=None):
+        self.root = Path(root)
+        self.roots = sorted(set(roots))
+        self.snapshot = snapshot
+        self.stats: dict[str, tuple[int, int]] = {}
+        self.dirs: dict[str, None] = {}
+        self._bytes: dict[str, bytes] = {}
+        self._text: dict[str, dict[tuple[str, str], str]] = {}
+        self._overlay: dict[str, bytes] = {}
+        self._overlay_stamp: dict[str, str] = {}
+        self._trackers: list[Deps] = []
+        self._read_hooks: list[Callable[[str], None]] = []
+        self.rescan()
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "WorktreeCorpus":
+        """The corpus `snapshot` was written from, as it was then (no walk)."""
+        corpus = cls.__new__(cls)
+        WorktreeCorpus.__init__(corpus, snapshot.root, [], snapshot)
+        corpus.roots = list(snapshot.roots)
+        corpus.stats = dict(snapshot.stats())
+        corpus.dirs = dict.fromkeys(snapshot.dirs)
+        return corpus
+
+    # ------------------------------------------------------------------ scan
+
+    def _walk(self, rel_dir: str, out: dict[str, tuple[int, int]], dirs: dict[str, None]) -> None:
+        try:
+            it = os.scandir(self.root / rel_dir)
+        except OSError:
+            return
+        dirs[rel_dir] = None
+        with it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}"
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            self._walk(rel, out, dirs)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        out[rel] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+
+    def rescan(self) -> set[str]:
+        """Re-stat the tree; return the set of changed repo-relative paths."""
+        fresh: dict[str, tuple[int, int]] = {}
+        dirs: dict[str, None] = {}
+        for r in self.roots:
+            if (self.root / r).is_file():
+                st = (self.root / r).stat()
+                fresh[r] = (st.st_mtime_ns, st.st_size)
+            else:
+                self._walk(r, fresh, dirs)
+        old = self.stats
+        changed = {p for p, s in fresh.items() if old.get(p) != s}
+        changed |= old.keys() - fresh.keys()
+        self.stats, self.dirs = fresh, dirs
+        for rel in changed:
+            self.invalidate(rel)
+        return changed
+
+    def refresh(self, rels: list[str]) -> set[str]:
+        """Re-stat just `rels` (cheap per-request freshness); return changed."""
+        changed = set()
+        for rel in rels:
+            try:
+                st = os.stat(self.root / rel)
+                stamp = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamp = None
+            old = self.stats.get(rel)
+            if stamp == old:
+                continue
+            changed.add(rel)
+            if stamp is None:
+                del self.stats[rel]
+            else:
+                self.stats[rel] = stamp
+                parent = rel.rsplit("/", 1)[0]
+                while parent not in self.dirs and self.contains(parent):
+                    self.dirs[parent] = None
+                    parent = parent.rsplit("/", 1)[0]
+            self.invalidate(rel)
+        return changed
+
+    def invalidate(self, rel: str) -> None:
+        self._bytes.pop(rel, None)
+        self._text.pop(rel, None)
+
+    # --------------------------------------------------------------- overlay
+
+    @contextlib.contextmanager
+    def overlay(self, buffers: dict[str, str]):
+        """Serve `buffers` ({rel: text}) instead of the files on disk."""
+        self._overlay = {rel: text.encode("utf-8") for rel, text in buffers.items()}
+        self._overlay_stamp = {rel: hashlib.sha1(data).hexdigest()
+                               for rel, data in self._overlay.items()}
+        try:
+            yield self
+        finally:
+            self._overlay, self._overlay_stamp = {}, {}
+
+    # ---------------------------------------------------------------- lookup
+
+    def rel(self, path: str | os.PathLike[str]) -> str | None:
+        """Repo-relative key when `path` lies under a scanned root, else None."""
+        p = os.path.abspath(path)
+        base = str(self.root)
+        if not p.startswith(base + os.sep):
+            return None
+        rel = p[len(base) + 1:].replace(os.sep, "/")
+        return rel if self.contains(rel) else None
+
+    def has(self, rel: str) -> bool:
+        return rel in self.stats or rel in self._overlay
+
+    def is_overlaid(self, rel: str) -> bool:
+        return rel in self._overlay
+
+    def stamp(self, rel: str) -> object:
+        """Version token of a file: overlay digest, stat tuple, or None."""
+        return self._overlay_stamp.get(rel) or self.stats.get(rel)
+
+    def note_probe(self, rel: str) -> None:
+        """Record a dependency on `rel`'s stamp (is_file()/exists() use it)."""
+        for deps in self._trackers:
+            deps.files[rel] = self.stamp(rel)
+
+    def _note_read(self, rel: str) -> None:
+        self.note_probe(rel)
+        for hook in self._read_hooks:
+            hook(rel)
+
+    def read_bytes(self, rel: str) -> bytes:
+        self._note_read(rel)
+        if rel in self._overlay:
+            return self._overlay[rel]
+        data = self._bytes.get(rel)
+        if data is None:
+            view = self._mapped(rel)
+            if view is not None:
+                return bytes(view)
+            data = self._load(rel)
+            if rel in self.stats:
+                self._bytes[rel] = data
+        return data
+
+    def _mapped(self, rel: str) -> memoryview | None:
+        """The snapshot's bytes of `rel` when they are what is on disk now."""
+        if self.snapshot is None or rel not in self.stats:
+            return None
+        hit = self.snapshot.get(rel)
+        return hit[1] if hit is not None and hit[0] == self.stats[rel] else None
+
+    def _load(self, rel: str) -> bytes:
+        # io.open, not Path.read_bytes: the latter is what vfs reroutes here
+        with io.open(self.root / rel, "rb") as fh:
+            return fh.read()
+
+    def read_text(self, rel: str, encoding: str | None = None, errors: str | None = None) -> str:
+        """Decoded text with universal newlines, as open(..., 'r') returns it."""
+        key = (encoding or "utf-8", errors or "strict")
+        cacheable = rel in self.stats and rel not in self._overlay
+        text = self._text.get(rel, {}).get(key) if cacheable else None
+        if text is not None:
+            self._note_read(rel)
+            return text
+        view = self._mapped(rel) if cacheable and rel not in self._bytes else None
+        if view is not None:
+            self._note_read(rel)
+            raw = str(view, *key)  # decoded straight from the mapping
+        else:
+            raw = self.read_bytes(rel).decode(*key)
+        text = raw.replace("\r\n", "\n").replace("\r", "\n") if "\r" in raw else raw
+        if cacheable:
+            self._text.setdefault(rel, {})[key] = text
+        return text
+
+    def entries_under(self, rel_dir: str) -> list[str]:
+        """Files and directories below `rel_dir` (not including it), walk order."""
+        prefix = rel_dir + "/"
+        out = [p for p in self.stats if p.startswith(prefix)]
+        out.extend(p for p in self._overlay if p.startswith(prefix) and p not in self.stats)
+        out.extend(d for d in self.dirs if d.startswith(prefix))
+        return out
+
+    def note_deps(self, deps: Deps) -> None:
+        """Replay a memoized result's inputs into the active trackers."""
+        for outer in self._trackers:
+            outer.files.update(deps.files)
+            outer.listings.update(deps.listings)
+            outer.opaque |= deps.opaque
+
+    def note_listing(self, key: tuple[str, str, bool], hits: list[str]) -> None:
+        for deps in self._trackers:
+            deps.listings[key] = tuple(hits)
+
+    def note_opaque(self) -> None:
+        for deps in self._trackers:
+            deps.opaque = True
+
+    @contextlib.contextmanager
+    def track(self):
+        deps = Deps()
+        self._trackers.append(deps)
+        try:
+            yield deps
+        finally:
+            self._trackers.remove(deps)
+
+    @contextlib.contextmanager
+    def on_read(self, hook: Callable[[str], None]):
+        """Call `hook(rel)` for every file read until the context exits."""
+        self._read_hooks.append(hook)
+        try:
+            yield
+        finally:
+            self._read_hooks.remove(hook)
+
+    def contains(self, rel: str) -> bool:
+        """True when `rel` (file or directory) lies inside a scanned root."""
+        return any(rel == r or rel.startswith(r + "/") for r in self.roots)
+
+    def cached_files(self) -> int:
+        return len(self._bytes)
+
+
+def input_roots(patterns: list[str]) -> list[str]:
+    """Directories (or single files) to scan for a list of input globs."""
+    roots = set()
+    for pat in patterns:
+        parts = pat.split("/")
+        fixed = []
+        for part in parts:
+            if any(ch in part for ch in "*?["):
+                break
+            fixed.append(part)
+        if len(fixed) == len(parts):
+            roots.add(pat)  # literal file
+        elif fixed:
+            roots.add("/".join(fixed))
+    # drop roots nested inside another root
+    ordered = sorted(roots)
+    return [r for r in ordered if not any(r != o and r.startswith(o + "/") for o in ordered)]
@@ -0,0 +1,201 @@
+"""Long-lived gate server for editors and pre-commit hooks.
+
+`run_gates.py --serve` keeps one corpus, the compiled gate scripts and the
+memoized helper results (gates.yaml `memo`) alive and answers requests on a
+Unix domain socket. The protocol is one JSON object per line in each
+direction:
+
+    {"op": "check", "paths": ["templates/risk/index.html.twig"],
+     "buffers": {"templates/risk/index.html.twig": "<unsaved text>"},
+     "gates": ["nested_forms"]}
+    -> {"ok": true, "seconds": 0.02, "results": [{"gate": ..., "rc": 0, ...}]}
+
+    {"op": "ping"}  -> {"ok": true, "files": 5216, "gates": 54}
+    {"op": "stop"}  -> {"ok": true}   (server exits after answering)
+
+Paths are repo-relative or absolute. `paths` and `buffers` select the gates
+whose inputs cover them; when every such path is a `split` file of a gate,
+the gate runs narrowed to just those files. Without paths every selected
+gate runs in full. `buffers` are laid
+over the worktree for this request only. `ok` is false when a blocking gate
+failed; malformed requests get {"ok": false, "error": "..."}.
+
+Requests are handled one at a time. Each one re-stats the paths it names; the
+whole tree is re-scanned at most every `rescan_interval` seconds, so edits
+made behind the server's back are picked up without a watcher thread.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import time
+from pathlib import Path
+
+from .corpus import WorktreeCorpus
+from .execute import GateResult, Memo, blocking_failures, run_gate
+from .manifest import MANIFEST, ROOT, Gate, load_manifest, select
+from .vfs import served_from
+from .watch import affected, corpus_for
+
+
+def default_socket() -> Path:
+    """Per-user, per-checkout socket path in the temp directory."""
+    tag = hashlib.sha1(str(ROOT).encode()).hexdigest()[:10]
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(tempfile.gettempdir()) / f"isms-gates-{uid}-{tag}.sock"
+
+
+def result_to_json(result: GateResult, only: set[str] | None) -> dict:
+    return {"gate": result.name, "rc": result.rc, "ok": result.ok,
+            "advisory": result.advisory, "seconds": round(result.seconds, 4),
+            "output": result.output, "narrowed": sorted(only) if only is not None else None}
+
+
+def result_from_json(data: dict) -> GateResult:
+    return GateResult(data["gate"], data["rc"], data["output"], data["seconds"], data["advisory"])
+
+
+class GateService:
+    """Request handling, independent of the transport (tests call it directly)."""
+
+    def __init__(self, gates: list[Gate], names: list[str] | None = None,
+                 rescan_interval: float = 2.0):
+        self.names = names
+        self.gates = gates
+        self.corpus: WorktreeCorpus = corpus_for(gates)
+        self.memo = Memo()
+        self.rescan_interval = rescan_interval
+        self.scanned = time.monotonic()
+
+    def _rel(self, path: str) -> str:
+        p = Path(path)
+        if p.is_absolute():
+            with contextlib.suppress(ValueError):
+                return p.resolve().relative_to(ROOT).as_posix()
+        return p.as_posix().removeprefix("./")
+
+    def _freshen(self, rels: list[str]) -> None:
+        if time.monotonic() - self.scanned >= self.rescan_interval:
+            changed = self.corpus.rescan()
+            self.scanned = time.monotonic()
+        else:
+            changed = self.corpus.refresh(rels)
+        if MANIFEST.relative_to(ROOT).as_posix() in changed:
+            self.gates = select(load_manifest(), self.names)
+
+    def plan(self, rels: set[str], names: list[str]) -> list[tuple[Gate, set[str] | None]]:
+        gates = select(self.gates, names) if names else self.gates
+        if not rels:
+            return [(g, None) for g in gates]
+        if names:
+            return [(g, rels if all(g.per_file(r) for r in rels) else None) for g in gates]
+        return affected(gates, rels)
+
+    def check(self, paths: list[str], buffers: dict[str, str],
+              names: list[str] | None = None) -> dict:
+        start = time.perf_counter()
+        buffers = {self._rel(p): text for p, text in buffers.items()}
+        rels = {self._rel(p) for p in paths} | buffers.keys()
+        self._freshen(sorted(rels))
+        results = []
+        with served_from(self.corpus), self.corpus.overlay(buffers):
+            for gate, only in self.plan(rels, names or []):
+                results.append((run_gate(gate, only, self.memo), only))
+        failing = blocking_failures([r for r, _ in results])
+        return {"ok": not failing, "seconds": round(time.perf_counter() - start, 4),
+                "results": [result_to_json(r, only) for r, only in results]}
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op", "check")
+        if op == "ping":
+            return {"ok": True, "files": len(self.corpus.stats), "gates": len(self.gates)}
+        if op != "check":
+            raise ValueError(f"unknown op: {op}")
+        paths = request.get("paths") or []
+        buffers = request.get("buffers") or {}
+        names = request.get("gates") or []
+        if not isinstance(paths, list) or not isinstance(buffers, dict) or not isinstance(names, list):
+            raise ValueError("'paths' and 'gates' take lists, 'buffers' an object")
+        return self.check([str(p) for p in paths], {str(k): str(v) for k, v in buffers.items()},
+                          [str(n) for n in names])
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                if request.get("op") in ("stop", "shutdown"):
+                    self.server.stopping = True
+                    reply = {"ok": True}
+                else:
+                    reply = self.server.service.handle(request)
+            except ValueError as exc:  # JSONDecodeError included
+                reply = {"ok": False, "error": str(exc)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+            if self.server.stopping:
+                return
+
+
+class _Server(socketserver.UnixStreamServer):
+    def __init__(self, path: Path, service: GateService):
+        self.service = service
+        self.stopping = False
+        super().__init__(str(path), _Handler)
+
+
+def _claim(path: Path) -> None:
+    """Remove a stale socket file; refuse when a live server answers on it."""
+    if not path.exists():
+        return
+    try:
+        request({"op": "ping"}, path, timeout=1.0)
+    except OSError:
+        path.unlink()
+        return
+    raise RuntimeError(f"a gate server is already listening on {path}")
+
+
+def serve(names: list[str] | None = None, path: Path | None = None,
+          emit=print, rescan_interval: float = 2.0) -> int:
+    path = path or default_socket()
+    _claim(path)
+    service = GateService(select(load_manifest(), names), names, rescan_interval)
+    server = _Server(path, service)
+    try:
+        os.chmod(path, 0o600)
+        emit(f"serving {len(service.gates)} gate(s) over {len(service.corpus.stats)} files on {path}")
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            path.unlink()
+    return 0
+
+
+def request(payload: dict, path: Path | None = None, timeout: float | None = 120.0) -> dict:
+    """Send one request, return the decoded reply. OSError when no server."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path or default_socket()))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as fh:
+            line = fh.readline()
+    if not line:
+        raise ConnectionError("gate server closed the connection")
+    return json.loads(line)
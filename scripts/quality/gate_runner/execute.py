@@ -0,0 +1,200 @@
+"""Run check_*.py gates inside the current interpreter.
+
+Each gate script is compiled once; every run executes the cached code object
+in a fresh module namespace (so module-level state never leaks between runs)
+with sys.argv set to the manifest args, cwd at the repo root and stdout/stderr
+captured. A recompile happens only when the script itself changes.
+
+With `only`, files the gate declares as `split` but that are not in `only`
+are hidden from its directory listings (see vfs.narrowed), so the run reports
+findings for just those files. While a split gate runs, the time between
+reads of its split files is charged to those files (GateResult.file_seconds)
+so the shard planner can balance file buckets. `profile_dir` profiles the
+run (profiling.capture).
+
+A Memo keeps the results of the helper functions a gate lists under `memo`
+in gates.yaml (pure per-file parsers such as accessors_for_entity) across runs. Each
+entry remembers the corpus files it read and is reused until one of them
+changes, so a long-lived process re-parses only what was edited.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import re
+import os
+import sys
+import time
+import traceback
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from .corpus import Deps, WorktreeCorpus
+from .manifest import QUALITY_DIR, ROOT, Gate
+from .profiling import FileClock, capture
+from .vfs import active_corpus, listing, narrowed
+
+
+@dataclass
+class GateResult:
+    name: str
+    rc: int
+    output: str
+    seconds: float
+    advisory: bool = False
+    fixed: float = 0.0  # time not attributed to a split file (see FileClock)
+    file_seconds: dict[str, float] = field(default_factory=dict)
+    profile: str = ""  # --profile report
+
+    @property
+    def ok(self) -> bool:
+        return self.rc == 0
+
+
+_CODE: dict[str, tuple[int, types.CodeType]] = {}
+
+
+def _code(gate: Gate) -> types.CodeType:
+    path = QUALITY_DIR / f"{gate.name}.py"
+    mtime = path.stat().st_mtime_ns
+    cached = _CODE.get(gate.name)
+    if cached is None or cached[0] != mtime:
+        source = path.read_bytes()
+        cached = _CODE[gate.name] = (mtime, compile(source, str(path), "exec"))
+    return cached[1]
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+class Memo:
+    """Corpus-validated cache for a gate's pure helper functions.
+
+    An entry is reused while every file it read has the same stamp and every
+    directory listing it made (under the current narrowing) returns the same
+    entries, checked against whichever corpus is being served. Up to
+    VARIANTS entries are kept per call, so alternating between corpora (git
+    revisions, an overlay and the tree under it) keeps each one warm. Calls
+    with unhashable arguments, calls that raise, and calls that fell through
+    to the real filesystem are never cached.
+    """
+
+    VARIANTS = 4
+
+    def __init__(self):
+        self.entries: dict[tuple, list[tuple[Deps, Any]]] = {}
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _fresh(corpus: WorktreeCorpus, deps: Deps) -> bool:
+        return deps.files_fresh(corpus) and all(
+            tuple(listing(corpus, *key)) == hits for key, hits in deps.listings.items())
+
+    def wrap(self, gate: str, fname: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def cached(*args, **kwargs):
+            corpus = active_corpus()
+            # the code object changes when the gate script is edited
+            key = (gate, fname, func.__code__, args, tuple(sorted(kwargs.items())))
+            try:
+                variants = self.entries.get(key)
+            except TypeError:
+                variants = None
+                corpus = None
+            if corpus is None:
+                return func(*args, **kwargs)
+            for deps, value in variants or ():
+                if self._fresh(corpus, deps):
+                    self.hits += 1
+                    corpus.note_deps(deps)
+                    return value
+            self.misses += 1
+            with corpus.track() as deps:
+                value = func(*args, **kwargs)
+            if not deps.opaque:
+                kept = self.entries.setdefault(key, [])
+                kept.insert(0, (deps, value))
+                del kept[self.VARIANTS:]
+            return value
+
+        cached.__wrapped__ = func
+        return cached
+
+
+def run_gate(gate: Gate, only: set[str] | None = None, memo: Memo | None = None,
+             profile_dir: Path | None = None, profile_top: int = 5) -> GateResult:
+    """Execute one gate; never raises (a crash becomes rc=2 with traceback).
+
+    With `profile_dir`, the run is profiled (see profiling.capture) and the
+    report lands in GateResult.profile."""
+    start = time.perf_counter()
+    buf = io.StringIO()
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    if str(QUALITY_DIR) not in sys.path:
+        sys.path.insert(0, str(QUALITY_DIR))
+    module = types.ModuleType(gate.name)
+    module.__file__ = str(QUALITY_DIR / f"{gate.name}.py")
+    sys.modules[gate.name] = module  # dataclasses/typing resolve through it
+    corpus = active_corpus()
+    clock = FileClock(gate.per_file)
+    try:
+        sys.argv = [module.__file__, *gate.args]
+        os.chdir(ROOT)
+        scope = (narrowed(lambda rel: rel in only or not gate.per_file(rel))
+                 if only is not None else contextlib.nullcontext())
+        timed = corpus.on_read(clock.read) if corpus is not None and gate.split else contextlib.nullcontext()
+        profiled = (capture(gate.name, profile_dir, corpus, profile_top) if profile_dir is not None
+                    else contextlib.nullcontext())
+        with profiled as prof, scope, timed, \
+                contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+            try:
+                exec(_code(gate), module.__dict__)
+                for fname in gate.memo if memo is not None else ():
+                    module.__dict__[fname] = memo.wrap(gate.name, fname, module.__dict__[fname])
+                rc = _exit_code(module.main())
+            except SystemExit as exc:
+                rc = _exit_code(exc.code)
+            except Exception:
+                traceback.print_exc()
+                rc = 2
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    clock.stop()
+    return GateResult(gate.name, rc, buf.getvalue(), time.perf_counter() - start, gate.advisory,
+                      clock.fixed, clock.files, prof.report if prof is not None else "")
+
+
+_FINDING = re.compile(r"^\s*(?:FAIL:?\s+)?([\w.@-]+(?:/[\w.@-]+)+):")
+
+
+def finding_files(output: str) -> dict[str, list[str]]:
+    """Group finding lines ('[FAIL ]<rel>:...') by the file they name."""
+    out: dict[str, list[str]] = {}
+    for line in output.splitlines():
+        m = _FINDING.match(line)
+        if m:
+            out.setdefault(m.group(1), []).append(line.strip())
+    return out
+
+
+def format_result(result: GateResult, verbose: bool = False) -> str:
+    status = "PASS" if result.ok else ("WARN" if result.advisory else "FAIL")
+    head = f"{status} {result.name} ({result.seconds:.2f}s)"
+    if result.profile:
+        head += "\n" + "\n".join("  | " + line for line in result.profile.splitlines())
+    if result.ok and not verbose or not result.output.strip():
+        return head
+    body = "\n".join("    " + line for line in result.output.rstrip().splitlines())
+    return f"{head}\n{body}"
+
+
+def blocking_failures(results: list[GateResult]) -> list[GateResult]:
+    return [r for r in results if not r.ok and not r.advisory]
@@ -0,0 +1,150 @@
+"""Map/reduce helper for cross-file gates: per-file facts cached by content.
+
+A cross-file gate (FormType fields x templates, entity accessors x call
+sites, ...) splits into a map phase that turns one file's text into small
+picklable facts, and a reduce phase in the gate that joins them:
+
+    from gate_runner.facts import map_files
+
+    def template_facts(text: str) -> frozenset[str] | None:   # text only
+        ...
+
+    facts = map_files(template_facts, TEMPLATES_DIR.rglob("*.html.twig"))
+    for path, rendered in facts.items():   # reduce
+        ...
+
+The map function sees nothing but the file's text, so its result can be keyed
+by the content hash: unchanged files are never re-mapped, whether the same
+process asks again (watch mode, --serve, a later revision with --rev) or a
+later run does (the cache is stored under var/cache/quality/facts/, keyed by
+the gate script's content and that of the gate_runner helpers it imports,
+so editing either invalidates it). Files still to
+map are mapped in GATE_JOBS forked worker processes when that is set above 1.
+
+Files are read through pathlib, so under the runner they come from the
+shared corpus and narrowing applies as for any other read.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .manifest import ROOT
+
+CACHE_DIR = ROOT / "var" / "cache" / "quality" / "facts"
+PARALLEL_MIN = 64  # fewer files to map than this are not worth a pool
+
+_MEMORY: dict[str, dict[str, Any]] = {}  # cache name -> {content sha1: facts}
+_VERSION: dict[str, str] = {}  # cache name -> version on disk
+
+
+def _name(func: Callable) -> str:
+    return f"{Path(func.__code__.co_filename).stem}.{func.__qualname__}"
+
+
+def _sources(func: Callable) -> list[str]:
+    """The file defining `func` plus the gate_runner modules whose functions
+    that file imports by name (`from gate_runner.catalogue import flatten`)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    files = {func.__code__.co_filename}
+    for value in func.__globals__.values():
+        code = getattr(value, "__code__", None)
+        if code is not None and os.path.dirname(os.path.abspath(code.co_filename)) == here:
+            files.add(code.co_filename)
+    return sorted(files)
+
+
+def _version(func: Callable) -> str:
+    digest = hashlib.sha1(sys.version.encode())
+    for filename in _sources(func):
+        try:
+            with io.open(filename, "rb") as fh:
+                digest.update(fh.read())
+        except OSError:
+            digest.update(func.__code__.co_code)
+    return digest.hexdigest()[:16]
+
+
+def _load(name: str, version: str) -> dict[str, Any]:
+    try:
+        with io.open(CACHE_DIR / f"{name}.pickle", "rb") as fh:
+            data = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != version:
+        return {}
+    return data.get("facts", {})
+
+
+def _save(name: str, version: str, facts: dict[str, Any], used: set[str]) -> None:
+    if len(facts) > 4 * max(len(used), 1):  # mostly stale: keep what this run needed
+        facts = {sha: f for sha, f in facts.items() if sha in used}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = CACHE_DIR / f"{name}.{os.getpid()}.tmp"
+    with io.open(tmp, "wb") as fh:
+        pickle.dump({"version": version, "facts": facts}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, CACHE_DIR / f"{name}.pickle")
+
+
+def _apply(job: tuple[Callable[[str], Any], str]) -> Any:
+    func, text = job
+    return func(text)
+
+
+def _jobs() -> int:
+    try:
+        return max(1, int(os.environ.get("GATE_JOBS", "1")))
+    except ValueError:
+        return 1
+
+
+def map_files(func: Callable[[str], Any], paths: Iterable[Path], *, errors: str = "ignore",
+              jobs: int | None = None) -> dict[Path, Any]:
+    """{path: func(text)} for every readable path, in the order given.
+
+    `func` must be a module-level function whose result depends on the text
+    alone and pickles. Results are shared between calls, so callers treat
+    them as read-only (tuples and frozensets suit). Unreadable files are
+    left out.
+    """
+    name = _name(func)
+    version = _version(func)
+    if _VERSION.get(name) != version:
+        _MEMORY[name] = _load(name, version)
+        _VERSION[name] = version
+    known = _MEMORY[name]
+
+    texts: dict[Path, str] = {}
+    shas: dict[Path, str] = {}
+    for path in paths:
+        try:
+            text = path.read_text(encoding="utf-8", errors=errors)
+        except OSError:
+            continue
+        texts[path] = text
+        shas[path] = hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+    todo = {sha: texts[p] for p, sha in shas.items() if sha not in known}
+    if todo:
+        jobs = jobs or _jobs()
+        items = list(todo.items())
+        if jobs > 1 and len(items) >= PARALLEL_MIN and "fork" in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("fork")) as pool:
+                results = pool.map(_apply, [(func, text) for _, text in items],
+                                   chunksize=max(1, len(items) // (4 * jobs)))
+                known.update(zip((sha for sha, _ in items), results))
+        else:
+            for sha, text in items:
+                known[sha] = func(text)
+        try:
+            _save(name, version, known, set(shas.values()))
+        except OSError:
+            pass  # read-only checkout: the in-process cache still applies
+    return {path: known[sha] for path, sha in shas.items()}
@@ -0,0 +1,158 @@
+"""Corpus backed by the git object store: a commit/tree-ish or the index.
+
+GitCorpus lists its roots with `git ls-tree -r` (or `git ls-files -s` for
+the staged index) and reads blobs through one long-running
+`git cat-file --batch` process, so gates can check exactly what is staged,
+or another branch, without touching the worktree.
+
+File stamps are blob object ids. A BlobStore shared between several
+GitCorpus instances caches blob contents by id, and a shared Memo validates
+its entries against those ids, so checking several commits re-reads and
+re-parses only the blobs that differ between them.
+
+The corpus is sealed: a path below its roots that the tree does not contain
+does not exist for the gates, even when the worktree has it (see vfs).
+Symlinks and submodules are skipped.
+"""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+from .corpus import WorktreeCorpus
+
+INDEX = None  # GitCorpus(rev=INDEX) reads the staged index
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def _git(root: Path, *args: str) -> bytes:
+    proc = subprocess.run(["git", *args], cwd=root, capture_output=True)
+    if proc.returncode:
+        raise GitError(proc.stderr.decode(errors="replace").strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def resolve(root: Path, rev: str) -> str:
+    """Tree id for a tree-ish ('HEAD', a branch, a short sha, a tree id)."""
+    if rev.startswith("-"):
+        raise GitError(f"not a revision: {rev}")
+    try:
+        return _git(root, "rev-parse", "--verify", "--quiet", f"{rev}^{{tree}}").decode().strip()
+    except GitError:
+        raise GitError(f"unknown revision or tree: {rev}") from None
+
+
+def changed_since(root: Path, rev: str) -> set[str]:
+    """Paths that differ between `rev` and the worktree, untracked files included."""
+    if rev.startswith("-"):
+        raise GitError(f"not a revision: {rev}")
+    resolve(root, rev)
+    diff = _git(root, "diff", "--name-only", "-z", "--no-renames", rev, "--")
+    untracked = _git(root, "ls-files", "--others", "--exclude-standard", "-z")
+    return {p.decode() for p in (diff + untracked).split(b"\0") if p}
+
+
+class BlobStore:
+    """Blob contents by object id, read through `git cat-file --batch`."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blobs: dict[str, bytes] = {}
+        self._proc: subprocess.Popen | None = None
+
+    def read(self, oid: str) -> bytes:
+        data = self.blobs.get(oid)
+        if data is None:
+            data = self.blobs[oid] = self._fetch(oid)
+        return data
+
+    def _fetch(self, oid: str) -> bytes:
+        if self._proc is None:
+            self._proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=self.root,
+                                          stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._proc.stdin.write(oid.encode() + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise GitError(f"cat-file: {b' '.join(header).decode(errors='replace') or 'no answer'}")
+        data = self._proc.stdout.read(int(header[2]))
+        self._proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        if self._proc is not None:
+            self._proc.stdin.close()
+            self._proc.wait()
+            self._proc.stdout.close()
+            self._proc = None
+
+    def __enter__(self) -> "BlobStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class GitCorpus(WorktreeCorpus):
+    sealed = True
+
+    def __init__(self, root: Path, roots: list[str], rev: str | None = INDEX,
+                 store: BlobStore | None = None):
+        self.rev = rev
+        self.tree = resolve(Path(root), rev) if rev is not INDEX else None
+        self.store = store or BlobStore(root)
+        super().__init__(root, roots)
+
+    @property
+    def label(self) -> str:
+        return "index" if self.tree is None else f"{self.rev} (tree {self.tree[:10]})"
+
+    def _entries(self) -> list[tuple[str, str, str]]:
+        """(mode, oid, path) for every entry below the roots."""
+        if self.tree is None:
+            raw = _git(self.root, "ls-files", "-s", "-z", "--", *self.roots)
+            out = []
+            for rec in raw.split(b"\0"):
+                if rec:
+                    meta, _, path = rec.partition(b"\t")
+                    mode, oid, stage = meta.split()
+                    if stage == b"0":
+                        out.append((mode.decode(), oid.decode(), path.decode()))
+            return out
+        raw = _git(self.root, "ls-tree", "-r", "-z", "--full-tree", self.tree, "--", *self.roots)
+        out = []
+        for rec in raw.split(b"\0"):
+            if rec:
+                meta, _, path = rec.partition(b"\t")
+                mode, kind, oid = meta.split()
+                if kind == b"blob":
+                    out.append((mode.decode(), oid.decode(), path.decode()))
+        return out
+
+    def rescan(self) -> set[str]:
+        """Re-list the tree (only the index can change); return changed paths."""
+        fresh: dict[str, str] = {}
+        dirs: dict[str, None] = {}
+        for mode, oid, rel in self._entries():
+            if mode == "120000" or not self.contains(rel):
+                continue
+            fresh[rel] = oid
+            parent = rel.rpartition("/")[0]
+            while parent and parent not in dirs and self.contains(parent):
+                dirs[parent] = None
+                parent = parent.rpartition("/")[0]
+        old = self.stats
+        changed = {p for p, s in fresh.items() if old.get(p) != s} | (old.keys() - fresh.keys())
+        self.stats, self.dirs = fresh, dirs
+        for rel in changed:
+            self.invalidate(rel)
+        return changed
+
+    def refresh(self, rels: list[str]) -> set[str]:
+        return self.rescan() & set(rels) if rels else set()
+
+    def _load(self, rel: str) -> bytes:
+        return self.store.read(self.stats[rel])
@@ -0,0 +1,37 @@
+"""Check that each gate's declared inputs cover the files it actually reads.
+
+--changed, --since, --watch and --serve pick gates by their gates.yaml
+`inputs`. A gate that reads a file its inputs do not cover (an rglob below a
+directory whose glob only names the top level, say) is silently skipped when
+that file changes. undeclared_reads() runs the gates against a corpus of the
+whole tree and reports every file read that Gate.covers() rejects.
+"""
+from __future__ import annotations
+
+from .corpus import SKIP_DIRS, WorktreeCorpus
+from .execute import run_gate
+from .manifest import ROOT, Gate
+from .vfs import served_from
+
+
+def repo_corpus() -> WorktreeCorpus:
+    """Every top-level directory and file of the repo (minus SKIP_DIRS), so
+    reads outside the declared inputs are routed through the corpus too."""
+    roots = [p.name for p in ROOT.iterdir() if p.name not in SKIP_DIRS and not p.name.startswith(".")]
+    return WorktreeCorpus(ROOT, roots)
+
+
+def undeclared_reads(gates: list[Gate], corpus: WorktreeCorpus | None = None) -> dict[str, list[str]]:
+    """{gate name: files it read that its inputs do not cover}, for the
+    gates that read any."""
+    corpus = corpus or repo_corpus()
+    out: dict[str, list[str]] = {}
+    with served_from(corpus):
+        for gate in gates:
+            seen: set[str] = set()
+            with corpus.on_read(seen.add):
+                run_gate(gate)
+            missed = sorted(rel for rel in seen if not gate.covers(rel))
+            if missed:
+                out[gate.name] = missed
+    return out
@@ -0,0 +1,148 @@
+"""Gate manifest: which gates exist, how CI invokes them, what they read.
+
+scripts/quality/gates.yaml uses a tiny YAML subset (top-level gate names,
+scalar keys, '- item' lists) so the runner stays stdlib-only.
+"""
+from __future__ import annotations
+
+import re
+import shlex
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+QUALITY_DIR = Path(__file__).resolve().parents[1]
+ROOT = QUALITY_DIR.parents[1]
+MANIFEST = QUALITY_DIR / "gates.yaml"
+
+_LIST_KEYS = {"inputs", "split", "context", "memo"}
+
+
+@dataclass
+class Gate:
+    name: str
+    args: list[str] = field(default_factory=list)
+    inputs: list[str] = field(default_factory=list)
+    split: list[str] = field(default_factory=list)
+    context: list[str] = field(default_factory=list)
+    memo: list[str] = field(default_factory=list)
+    advisory: bool = False
+    _per_file: dict[str, bool] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def script(self) -> str:
+        return f"scripts/quality/{self.name}.py"
+
+    @cached_property
+    def implicit_inputs(self) -> list[str]:
+        """The gate script plus every argument that names an existing file."""
+        out = [self.script]
+        out.extend(a for a in self.args if "/" in a and (ROOT / a).is_file())
+        return out
+
+    def covers(self, rel: str) -> bool:
+        """True when the repo-relative path `rel` is one of this gate's inputs."""
+        if rel in self.implicit_inputs:
+            return True
+        return any(glob_regex(pat).match(rel) for pat in self.inputs)
+
+    def per_file(self, rel: str) -> bool:
+        """True when findings for `rel` depend on no other split file, so the
+        gate can be run on a subset of files (`split` minus `context`)."""
+        hit = self._per_file.get(rel)
+        if hit is None:
+            hit = self._per_file[rel] = (
+                any(glob_regex(pat).match(rel) for pat in self.split)
+                and not any(glob_regex(pat).match(rel) for pat in self.context))
+        return hit
+
+
+_GLOB_CACHE: dict[str, re.Pattern[str]] = {}
+
+
+def glob_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a repo glob: '**/' spans zero or more directories, '*' and '?'
+    stay within one path segment."""
+    rx = _GLOB_CACHE.get(pattern)
+    if rx is None:
+        parts, i = [], 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                parts.append("(?:[^/]+/)*")
+                i += 3
+            elif pattern.startswith("**", i):
+                parts.append(".*")
+                i += 2
+            elif pattern[i] == "*":
+                parts.append("[^/]*")
+                i += 1
+            elif pattern[i] == "?":
+                parts.append("[^/]")
+                i += 1
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        rx = _GLOB_CACHE[pattern] = re.compile("".join(parts) + r"\Z")
+    return rx
+
+
+def _scalar(raw: str) -> str:
+    value = raw.split(" #", 1)[0].strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    return value
+
+
+def parse_manifest(text: str) -> list[Gate]:
+    gates: list[Gate] = []
+    current: Gate | None = None
+    list_key: str | None = None
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line.startswith(" "):
+            current = Gate(name=line.rstrip(":").strip())
+            gates.append(current)
+            list_key = None
+            continue
+        if current is None:
+            raise ValueError(f"gates.yaml:{lineno}: indented line before any gate")
+        stripped = line.strip()
+        if stripped.startswith("- "):
+            if list_key is None:
+                raise ValueError(f"gates.yaml:{lineno}: list item outside a list key")
+            getattr(current, list_key).append(_scalar(stripped[2:]))
+            continue
+        key, _, rest = stripped.partition(":")
+        key, value = key.strip(), _scalar(rest)
+        list_key = None
+        if key in _LIST_KEYS:
+            list_key = key
+            if value and value != "[]":
+                raise ValueError(f"gates.yaml:{lineno}: '{key}' takes a '- item' list")
+        elif key == "args":
+            current.args = shlex.split(value)
+        elif key == "advisory":
+            current.advisory = value.lower() == "true"
+        else:
+            raise ValueError(f"gates.yaml:{lineno}: unknown key '{key}'")
+    return gates
+
+
+def load_manifest(path: Path = MANIFEST) -> list[Gate]:
+    return parse_manifest(path.read_text(encoding="utf-8"))
+
+
+def select(gates: list[Gate], names: list[str] | None) -> list[Gate]:
+    """Filter by gate name; 'check_' prefix optional. Unknown names raise."""
+    if not names:
+        return gates
+    by_name = {g.name: g for g in gates}
+    picked = []
+    for n in names:
+        key = n if n.startswith("check_") else f"check_{n}"
+        if key not in by_name:
+            raise ValueError(f"unknown gate: {n}")
+        picked.append(by_name[key])
+    return picked
@@ -0,0 +1,170 @@
+"""Where a gate spends its time: per-file clock, cProfile and stack samples.
+
+FileClock charges the time between file reads to the file read last, which
+for the usual "for path in ...: read, scan" loop is that file's scan time.
+The runner uses it on every split gate (shard planning) and, under
+--profile, on all files a gate reads.
+
+capture() is what `run_gates.py --profile` wraps around a gate: it writes
+
+    <dir>/<gate>.pstats     cProfile data (python -m pstats, snakeviz, ...)
+    <dir>/<gate>.collapsed  "frame;frame;frame ms" lines from a sampling
+                            thread, the input flamegraph.pl / speedscope take
+
+and returns a short text report: the slowest files with time and size, the
+functions with the most own time and the regular expressions that took
+longest (see regexes.recording). Stdlib only.
+"""
+from __future__ import annotations
+
+import cProfile
+import contextlib
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+from .corpus import WorktreeCorpus
+from .manifest import ROOT
+from .regexes import RegexStats, recording
+
+PROFILE_DIR = ROOT / "var/cache/quality/profile"
+_RUNNER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FileClock:
+    """Attribute elapsed time to files: the time from reading one charged
+    file to reading the next file is charged to it. Everything else (before
+    the first charged file, after an uncharged read, after the last one) is
+    `fixed`."""
+
+    def __init__(self, charged: Callable[[str], bool]):
+        self.charged = charged
+        self.mark = time.perf_counter()
+        self.current: str | None = None
+        self.fixed = 0.0
+        self.files: dict[str, float] = {}
+
+    def read(self, rel: str) -> None:
+        if rel in self.files:
+            return
+        charged = self.charged(rel)
+        if not charged and self.current is None:
+            return
+        self._charge()
+        self.current = rel if charged else None
+        if charged:
+            self.files[rel] = 0.0
+
+    def _charge(self) -> None:
+        now = time.perf_counter()
+        if self.current is None:
+            self.fixed += now - self.mark
+        else:
+            self.files[self.current] += now - self.mark
+        self.mark = now
+
+    def stop(self) -> None:
+        self.current = None
+        self._charge()
+
+
+class StackSampler:
+    """Sample one thread's Python stack every `interval` seconds.
+
+    Counts are milliseconds: a sample is weighted by the time since the
+    previous one, so a long C call that holds the GIL (one big re.search)
+    still gets its share although the sampler could not run meanwhile."""
+
+    def __init__(self, thread_id: int, interval: float = 0.002, skip: str = ""):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.skip = skip  # frames from files in this directory (the runner) are dropped
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = max(1, round((now - last) * 1000)), now
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if os.path.dirname(code.co_filename) != self.skip:
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += weight
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, n in sorted(self.counts.items()):
+                fh.write(f"{stack} {n}\n")
+
+
+class Capture:
+    def __init__(self) -> None:
+        self.report = ""
+
+
+def _report(name: str, out_dir: Path, clock: FileClock, corpus: WorktreeCorpus | None,
+            profile: cProfile.Profile, regexes: RegexStats, top: int) -> str:
+    lines = [f"profile: {out_dir / name}.pstats, {name}.collapsed"]
+    slow = sorted(clock.files.items(), key=lambda kv: (-kv[1], kv[0]))[:top]
+    if slow:
+        lines.append(f"slowest files (of {len(clock.files)} read, {clock.fixed:.3f}s outside them):")
+        for rel, seconds in slow:
+            size = len(corpus.read_bytes(rel)) if corpus is not None and corpus.has(rel) else 0
+            lines.append(f"  {seconds:8.3f}s {size:>9} B  {rel}")
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    own = sorted(((func, row) for func, row in stats.stats.items()  # type: ignore[attr-defined]
+                  if os.path.dirname(func[0]) != _RUNNER_DIR), key=lambda kv: -kv[1][2])[:top]
+    lines.append("most own time:")
+    for (filename, lineno, func), (_cc, calls, tottime, cumtime, _callers) in own:
+        where = f"{os.path.basename(filename)}:{lineno}({func})" if lineno else func
+        lines.append(f"  {tottime:8.3f}s {cumtime:8.3f}s cum {calls:>8} calls  {where}")
+    patterns = [p for p in regexes.top(top) if p.calls]
+    if patterns:
+        lines.append("slowest patterns:")
+        for p in patterns:
+            text = p.pattern if len(p.pattern) <= 60 else p.pattern[:57] + "..."
+            lines.append(f"  {p.seconds:8.3f}s {p.calls:>8} calls  max {p.slowest:.3f}s "
+                         f"on {p.longest} chars  {p.where}  {text!r}")
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def capture(name: str, out_dir: Path, corpus: WorktreeCorpus | None, top: int = 5):
+    """Profile the body; Capture.report is filled in when it exits."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result = Capture()
+    clock = FileClock(lambda rel: True)
+    profile = cProfile.Profile()
+    reads = corpus.on_read(clock.read) if corpus is not None else contextlib.nullcontext()
+    sampler = StackSampler(threading.get_ident(), skip=_RUNNER_DIR)
+    with reads, sampler, recording() as regexes:
+        profile.enable()
+        try:
+            yield result
+        finally:
+            profile.disable()
+            clock.stop()
+    profile.dump_stats(out_dir / f"{name}.pstats")
+    sampler.write(out_dir / f"{name}.collapsed")
+    result.report = _report(name, out_dir, clock, corpus, profile, regexes, top)
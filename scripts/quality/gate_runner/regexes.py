@@ -0,0 +1,499 @@
+"""Regular expressions of the gate scripts: runtime timing and a backtracking bench.
+
+recording() times every regex call made by code under scripts/quality/
+(gates and their helper modules) while it is active: per pattern the calls,
+the cumulative and the slowest single call's time and the longest input.
+`run_gates.py --profile` reports the slowest patterns per gate with it.
+Patterns are caught where they are compiled (re.compile and the re.search
+family are patched for callers under scripts/quality/) and, for modules
+imported earlier, by swapping their module-level patterns for the duration.
+
+bench() is the static side (`run_gates.py --regex-bench`): it collects every
+literal pattern passed to re.* in scripts/quality/, builds inputs meant to
+make it backtrack (a partial match repeated without the part that completes
+it; the body of each repetition pumped before a character nothing expects)
+and measures how the time grows with the input. A pattern is flagged when
+doubling the input more than ~3.2x its time (n^1.7) or when one probe runs
+past the timeout, as nested quantifiers such as (a+)+b do. Probes run in a
+child process so a catastrophic pattern can be killed.
+"""
+from __future__ import annotations
+
+import ast
+import contextlib
+import math
+import multiprocessing
+import os
+import re
+import string
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .manifest import QUALITY_DIR
+
+try:  # Python 3.11+
+    from re import _constants as _c, _parser
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _c  # type: ignore[no-redef]
+    import sre_parse as _parser  # type: ignore[no-redef]
+
+_RUNNER_DIR = os.path.dirname(os.path.abspath(__file__))
+_QUALITY_PREFIX = str(QUALITY_DIR) + os.sep
+
+# --------------------------------------------------------------- recording
+
+
+@dataclass
+class PatternStats:
+    pattern: str
+    flags: int
+    where: str  # first compile or call site, "check_x.py:46"
+    calls: int = 0
+    seconds: float = 0.0
+    slowest: float = 0.0  # slowest single call
+    longest: int = 0  # longest input, in characters
+
+
+class RegexStats:
+    def __init__(self) -> None:
+        self.patterns: dict[tuple[str, int], PatternStats] = {}
+
+    def entry(self, raw: re.Pattern, where: str) -> PatternStats:
+        key = (raw.pattern, raw.flags)
+        stats = self.patterns.get(key)
+        if stats is None:
+            stats = self.patterns[key] = PatternStats(str(raw.pattern), raw.flags, where)
+        return stats
+
+    def top(self, n: int) -> list[PatternStats]:
+        return sorted(self.patterns.values(), key=lambda s: -s.seconds)[:n]
+
+
+_STATS: RegexStats | None = None
+_REAL = {name: getattr(re, name) for name in
+         ("compile", "search", "match", "fullmatch", "findall", "finditer", "sub", "subn", "split")}
+
+
+def _is_gate_code(filename: str) -> bool:
+    """Under scripts/quality/ but not the runner (or its tests)."""
+    return filename.startswith(_QUALITY_PREFIX) and not filename.startswith(_RUNNER_DIR + os.sep)
+
+
+def _caller(depth: int) -> str | None:
+    """'file.py:line' of the frame `depth` levels up, when it is gate code."""
+    frame = sys._getframe(depth + 1)
+    if not _is_gate_code(frame.f_code.co_filename):
+        return None
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+class TimedPattern:
+    """A compiled pattern that records its calls while recording() is active.
+
+    Outside recording() it forwards untouched, so instances that outlive the
+    run (a pattern kept in a class attribute) are harmless."""
+
+    __slots__ = ("raw", "where")
+
+    def __init__(self, raw: re.Pattern, where: str):
+        self.raw = raw
+        self.where = where
+
+    def __getattr__(self, name: str):
+        return getattr(self.raw, name)
+
+    def __repr__(self) -> str:
+        return repr(self.raw)
+
+    def _call(self, method: str, text, args, kwargs):
+        stats = _STATS
+        if stats is None:
+            return getattr(self.raw, method)(text, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return getattr(self.raw, method)(text, *args, **kwargs)
+        finally:
+            self._charge(stats.entry(self.raw, self.where), time.perf_counter() - start, text)
+
+    @staticmethod
+    def _charge(entry: PatternStats, seconds: float, text) -> None:
+        entry.calls += 1
+        entry.seconds += seconds
+        entry.slowest = max(entry.slowest, seconds)
+        with contextlib.suppress(TypeError):
+            entry.longest = max(entry.longest, len(text))
+
+    def search(self, string, *args, **kwargs):
+        return self._call("search", string, args, kwargs)
+
+    def match(self, string, *args, **kwargs):
+        return self._call("match", string, args, kwargs)
+
+    def fullmatch(self, string, *args, **kwargs):
+        return self._call("fullmatch", string, args, kwargs)
+
+    def findall(self, string, *args, **kwargs):
+        return self._call("findall", string, args, kwargs)
+
+    def split(self, string, *args, **kwargs):
+        return self._call("split", string, args, kwargs)
+
+    def sub(self, repl, string, *args, **kwargs):
+        return self._sub("sub", repl, string, args, kwargs)
+
+    def subn(self, repl, string, *args, **kwargs):
+        return self._sub("subn", repl, string, args, kwargs)
+
+    def _sub(self, method, repl, text, args, kwargs):
+        stats = _STATS
+        if stats is None:
+            return getattr(self.raw, method)(repl, text, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return getattr(self.raw, method)(repl, text, *args, **kwargs)
+        finally:
+            self._charge(stats.entry(self.raw, self.where), time.perf_counter() - start, text)
+
+    def finditer(self, string, *args, **kwargs):
+        it = self.raw.finditer(string, *args, **kwargs)
+        stats = _STATS
+        if stats is None:
+            return it
+        return self._timed_iter(stats.entry(self.raw, self.where), it, string)
+
+    def _timed_iter(self, entry: PatternStats, it, text):
+        spent = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                m = next(it, None)
+                spent += time.perf_counter() - start
+                if m is None:
+                    return
+                yield m
+        finally:
+            self._charge(entry, spent, text)
+
+
+def _unwrap(pattern):
+    return pattern.raw if isinstance(pattern, TimedPattern) else pattern
+
+
+def _compile_at(pattern, flags, where: str | None):
+    raw = _REAL["compile"](_unwrap(pattern), flags)
+    return TimedPattern(raw, where) if where is not None else raw
+
+
+def _compile(pattern, flags=0):
+    return _compile_at(pattern, flags, _caller(1))
+
+
+def _search(pattern, string, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).search(string)
+
+
+def _match(pattern, string, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).match(string)
+
+
+def _fullmatch(pattern, string, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).fullmatch(string)
+
+
+def _findall(pattern, string, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).findall(string)
+
+
+def _finditer(pattern, string, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).finditer(string)
+
+
+def _sub(pattern, repl, string, count=0, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).sub(repl, string, count)
+
+
+def _subn(pattern, repl, string, count=0, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).subn(repl, string, count)
+
+
+def _split(pattern, string, maxsplit=0, flags=0):
+    return _compile_at(pattern, flags, _caller(1)).split(string, maxsplit)
+
+
+_PATCHED = {"compile": _compile, "search": _search, "match": _match, "fullmatch": _fullmatch,
+            "findall": _findall, "finditer": _finditer, "sub": _sub, "subn": _subn, "split": _split}
+
+
+def _gate_modules() -> list:
+    out = []
+    for module in list(sys.modules.values()):
+        if _is_gate_code(getattr(module, "__file__", None) or ""):
+            out.append(module)
+    return out
+
+
+@contextlib.contextmanager
+def recording():
+    """Time regex calls from scripts/quality/ code; yields the RegexStats."""
+    global _STATS
+    if _STATS is not None:
+        raise RuntimeError("regex recording is already active")
+    stats = _STATS = RegexStats()
+    for module in _gate_modules():
+        base = os.path.basename(module.__file__)
+        for name, value in list(vars(module).items()):
+            if isinstance(value, re.Pattern):
+                setattr(module, name, TimedPattern(value, f"{base}:{name}"))
+    for name, func in _PATCHED.items():
+        setattr(re, name, func)
+    try:
+        yield stats
+    finally:
+        for name, func in _REAL.items():
+            setattr(re, name, func)
+        for module in _gate_modules():
+            for name, value in list(vars(module).items()):
+                if isinstance(value, TimedPattern):
+                    setattr(module, name, value.raw)
+        _STATS = None
+
+
+# ------------------------------------------------------------------- bench
+
+# re.<func>: index of the positional `flags` argument
+_FLAG_ARG = {"compile": 1, "search": 2, "match": 2, "fullmatch": 2, "findall": 2,
+             "finditer": 2, "sub": 4, "subn": 4, "split": 3}
+
+
+@dataclass
+class Site:
+    pattern: str
+    flags: int
+    where: list[str] = field(default_factory=list)
+
+
+def _flags(node: ast.expr | None) -> int:
+    """Value of a flags expression built from re.X names, | and ints."""
+    if node is None:
+        return 0
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _flags(node.left) | _flags(node.right)
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "re":
+        return int(getattr(re, node.attr, 0))
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    return 0
+
+
+def collect_sites(root: Path = QUALITY_DIR) -> list[Site]:
+    """Every literal str pattern given to re.* in the Python files under root
+    (tests and the runner excluded), one Site per distinct (pattern, flags)."""
+    sites: dict[tuple[str, int], Site] = {}
+    for path in sorted(root.rglob("*.py")):
+        rel = path.relative_to(root)
+        if {"tests", "gate_runner", "__pycache__"} & set(rel.parts[:-1]):
+            continue
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == "re"
+                    and node.func.attr in _FLAG_ARG and node.args
+                    and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+                continue
+            pos = _FLAG_ARG[node.func.attr]
+            flags_node = node.args[pos] if len(node.args) > pos else next(
+                (k.value for k in node.keywords if k.arg == "flags"), None)
+            key = (node.args[0].value, _flags(flags_node))
+            sites.setdefault(key, Site(*key)).where.append(f"{rel.as_posix()}:{node.lineno}")
+    return list(sites.values())
+
+
+_ALPHABET = "a0 _-x.Z/'\"<>#[](){}:;,=\n\t" + string.printable
+
+
+def _in_category(ch: str, category) -> bool:
+    word = ch.isalnum() or ch == "_"
+    return {
+        _c.CATEGORY_DIGIT: ch.isdigit(), _c.CATEGORY_NOT_DIGIT: not ch.isdigit(),
+        _c.CATEGORY_SPACE: ch.isspace(), _c.CATEGORY_NOT_SPACE: not ch.isspace(),
+        _c.CATEGORY_WORD: word, _c.CATEGORY_NOT_WORD: not word,
+        _c.CATEGORY_LINEBREAK: ch == "\n", _c.CATEGORY_NOT_LINEBREAK: ch != "\n",
+    }.get(category, False)
+
+
+def _in_set(ch: str, items) -> bool:
+    negate, hit = False, False
+    for op, av in items:
+        if op is _c.NEGATE:
+            negate = True
+        elif op is _c.LITERAL:
+            hit |= ord(ch) == av
+        elif op is _c.RANGE:
+            hit |= av[0] <= ord(ch) <= av[1]
+        elif op is _c.CATEGORY:
+            hit |= _in_category(ch, av)
+    return hit != negate
+
+
+class _Sampler:
+    """Build one string the pattern (roughly) matches, remembering for every
+    repetition the text before it and one sample of its body."""
+
+    def __init__(self) -> None:
+        self.pumps: list[tuple[str, str]] = []
+        self.groups: dict[int, str] = {}
+
+    def walk(self, items, prefix: str = "") -> str:
+        out = ""
+        for op, av in items:
+            out += self.node(op, av, prefix + out)
+        return out
+
+    def node(self, op, av, prefix: str) -> str:
+        if op is _c.LITERAL:
+            return chr(av)
+        if op is _c.NOT_LITERAL:
+            return next(ch for ch in _ALPHABET if ord(ch) != av)
+        if op is _c.ANY:
+            return "x"
+        if op is _c.IN:
+            return next((ch for ch in _ALPHABET if _in_set(ch, av)), "")
+        if op is _c.SUBPATTERN:
+            text = self.walk(av[-1], prefix)
+            if av[0] is not None:
+                self.groups[av[0]] = text
+            return text
+        if op is _c.BRANCH:
+            return self.walk(av[1][0], prefix)
+        if op in (_c.MAX_REPEAT, _c.MIN_REPEAT, getattr(_c, "POSSESSIVE_REPEAT", None)):
+            lo, hi, body = av
+            one = self.walk(body, prefix)
+            if one and hi != 1 and op is not getattr(_c, "POSSESSIVE_REPEAT", None):
+                self.pumps.append((prefix, one))
+            return one * max(lo, 1) if hi else ""
+        if op is getattr(_c, "ATOMIC_GROUP", None):
+            return self.walk(av, prefix)
+        if op is _c.GROUPREF:
+            return self.groups.get(av, "")
+        if op is _c.GROUPREF_EXISTS:
+            return self.walk(av[1], prefix)
+        return ""  # AT, ASSERT, ASSERT_NOT: zero width
+
+
+def adversarial_inputs(pattern: str, flags: int = 0) -> list[tuple[str, str, str, str]]:
+    """(label, head, unit, tail) inputs: the probe text is head + unit * n + tail."""
+    sampler = _Sampler()
+    sample = sampler.walk(_parser.parse(pattern, flags))
+    out: dict[tuple[str, str, str], str] = {}
+    for k in sorted({len(sample) - 1, len(sample) // 2}):
+        if k > 0:
+            out.setdefault(("", sample[:k], ""), f"{sample[:k]!r} repeated")
+    for prefix, body in sampler.pumps[:8]:
+        out.setdefault((prefix, body, "\x00"), f"{prefix!r} + {body!r} repeated + NUL")
+    return [(label, *parts) for parts, label in out.items()]
+
+
+@dataclass
+class Verdict:
+    site: Site
+    exponent: float = 1.0  # time ~ n^exponent on the worst input
+    worst: str = ""  # label of that input
+    timed_out: bool = False
+
+    @property
+    def flagged(self) -> bool:
+        return self.timed_out or self.exponent >= SUPERLINEAR
+
+
+SUPERLINEAR = 1.7
+_FLOOR = 0.002  # a linear scan of _MAX_CHARS stays below this
+_ENOUGH = 0.05  # stop growing the input once one run takes this long
+_MAX_CHARS = 1 << 15  # larger inputs leave the CPU cache and time grows faster than n
+
+
+def _measure(compiled: re.Pattern, text: str, runs: int = 1) -> float:
+    best = math.inf
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _m in compiled.finditer(text):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def probe(pattern: str, flags: int) -> tuple[float, str]:
+    """Worst (exponent, input label) over the adversarial inputs."""
+    compiled = re.compile(pattern, flags)
+    worst = (1.0, "")
+    for label, head, unit, tail in adversarial_inputs(pattern, flags):
+        n = max(1, 256 // len(unit))
+        while True:
+            text = head + unit * n + tail
+            seconds = _measure(compiled, text)
+            if seconds >= _ENOUGH or len(text) >= _MAX_CHARS:
+                break
+            n *= 2
+        if seconds < _FLOOR:
+            continue
+        # growth over the last two doublings, best of three runs at both ends
+        quarter = head + unit * (n // 4) + tail
+        before, after = _measure(compiled, quarter, 3), _measure(compiled, text, 3)
+        if before >= _FLOOR / 8 and len(text) > len(quarter):
+            exponent = math.log(after / before) / math.log(len(text) / len(quarter))
+            worst = max(worst, (round(exponent, 2), label))
+    return worst
+
+
+def _worker(conn) -> None:
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        try:
+            conn.send(probe(*job))
+        except (re.error, RecursionError, ValueError) as exc:
+            conn.send((1.0, f"not probed: {exc}"))
+
+
+def bench(sites: list[Site], timeout: float = 5.0, emit=None) -> list[Verdict]:
+    """Probe every site in a child process; a probe past `timeout` is killed
+    and counted as catastrophic."""
+    verdicts = []
+    proc = conn = None
+    try:
+        for site in sites:
+            if proc is None:
+                conn, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(target=_worker, args=(child,), daemon=True)
+                proc.start()
+                child.close()
+            conn.send((site.pattern, site.flags))
+            if conn.poll(timeout):
+                exponent, label = conn.recv()
+                verdict = Verdict(site, exponent, label)
+            else:
+                proc.kill()
+                proc.join()
+                proc = None
+                verdict = Verdict(site, math.inf, f"no result within {timeout:.0f}s", timed_out=True)
+            verdicts.append(verdict)
+            if emit is not None and verdict.flagged:
+                emit(format_verdict(verdict))
+    finally:
+        if proc is not None:
+            conn.send(None)
+            proc.join()
+    return verdicts
+
+
+def format_verdict(verdict: Verdict) -> str:
+    site = verdict.site
+    kind = "CATASTROPHIC" if verdict.timed_out else f"SUPERLINEAR ~n^{verdict.exponent:.1f}"
+    pattern = site.pattern if len(site.pattern) <= 80 else site.pattern[:77] + "..."
+    return (f"{kind} {', '.join(site.where)}\n"
+            f"    pattern {pattern!r}\n    input   {verdict.worst}")
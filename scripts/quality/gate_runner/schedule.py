@@ -0,0 +1,129 @@
+"""Order and pack a local `--jobs N` run by historical runtime.
+
+Every full run appends one line to var/cache/quality/gate_history.jsonl:
+
+    {"at": "2026-10-19T09:12:03", "jobs": 4, "wall": 7.9, "gates": {"check_x": 2.1, ...}}
+
+A gate's expected cost is the median of its last HISTORY_RUNS serial
+entries (falling back to the timings snapshot shard.py keeps, then to a
+default). Lines of --jobs runs stay in the file but are never used: their
+gate times were measured while the workers shared the CPUs, so a gate can
+read three times as slow as it runs alone.
+plan_jobs() turns the gates into units, longest first, so the heaviest gate
+starts immediately instead of last. A split gate whose cost exceeds a
+worker's fair share (total / N) is cut into per-directory sub-tasks: its
+split files are grouped by directory, and the groups are dealt longest-first
+into the number of buckets shard._buckets picks, each bucket running the gate
+narrowed to its files.
+
+After the run, efficiency() compares the recorded serial time of the gates
+(serial_estimate()) with N workers times the wall-clock time; the unit times
+measured in the run are contended and would inflate it.
+"""
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+from .corpus import WorktreeCorpus
+from .execute import GateResult
+from .manifest import Gate
+from .shard import SHARD_DIR, Timings, Unit, _buckets, _deal, _split_files
+
+HISTORY = SHARD_DIR / "gate_history.jsonl"
+HISTORY_RUNS = 5
+
+
+class History:
+    """Append-only per-run gate seconds."""
+
+    def __init__(self, path: Path = HISTORY):
+        self.path = path
+
+    def runs(self) -> list[dict]:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        out = []
+        for line in lines:
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted run
+            if isinstance(run, dict) and isinstance(run.get("gates"), dict):
+                out.append(run)
+        return out
+
+    def append(self, results: list[GateResult], wall: float, jobs: int) -> None:
+        gates: dict[str, float] = {}
+        for r in results:
+            gates[r.name] = gates.get(r.name, 0.0) + r.seconds
+        line = json.dumps({"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "jobs": jobs,
+                           "wall": round(wall, 3),
+                           "gates": {name: round(s, 4) for name, s in gates.items()}})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+    def medians(self, last: int = HISTORY_RUNS) -> dict[str, float]:
+        seen: dict[str, list[float]] = {}
+        for run in self.runs():
+            if run.get("jobs", 1) > 1:
+                continue  # contended: see the module docstring
+            for name, seconds in run["gates"].items():
+                seen.setdefault(name, []).append(float(seconds))
+        return {name: statistics.median(values[-last:]) for name, values in seen.items()}
+
+
+def _by_directory(files: list[str], cost) -> list[tuple[float, list[str]]]:
+    groups: dict[str, list[str]] = {}
+    for rel in files:
+        groups.setdefault(rel.rpartition("/")[0], []).append(rel)
+    return [(sum(cost(rel) for rel in members), members) for members in groups.values()]
+
+
+def plan_jobs(gates: list[Gate], corpus: WorktreeCorpus, timings: Timings,
+              medians: dict[str, float], jobs: int) -> list[Unit]:
+    """Units for `jobs` workers, longest first (ties in manifest order)."""
+    costs = {g.name: medians.get(g.name, timings.gate_cost(g.name)) for g in gates}
+    total = sum(costs.values())
+    share = total / max(jobs, 1)
+    out = []
+    for g in gates:
+        cost = costs[g.name]
+        files = _split_files(g, corpus) if g.split and jobs > 1 and cost > share else []
+        if not files:
+            out.append(Unit(g.name, None, cost))
+            continue
+        entry = timings.gates.get(g.name, {})
+        fixed = min(entry.get("fixed", 0.0), cost) if "files" in entry else 0.0
+        groups = _by_directory(files, lambda rel: timings.file_cost(g.name, rel))
+        scale = (cost - fixed) / (sum(c for c, _ in groups) or 1.0)
+        # _deal places names; map each directory's first file back to its group
+        members = {group[0]: group for _, group in groups}
+        k = _buckets(fixed, cost - fixed, total, jobs, len(groups))
+        if k == 1:
+            out.append(Unit(g.name, None, cost))
+            continue
+        for load, heads in _deal([(c * scale, group[0]) for c, group in groups], k):
+            bucket = sorted(rel for head in heads for rel in members[head])
+            out.append(Unit(g.name, tuple(bucket), fixed + load))
+    order = {g.name: i for i, g in enumerate(gates)}
+    return sorted(out, key=lambda u: (-u.cost, order[u.gate], u.files or ()))
+
+
+def serial_estimate(gates: list[Gate], timings: Timings, medians: dict[str, float]) -> float | None:
+    """Recorded serial seconds of `gates` (the costs plan_jobs() starts
+    from, before split buckets each pay the fixed part again), or None while
+    a gate has no recorded serial time (its cost is only the default guess)."""
+    if any(g.name not in medians and g.name not in timings.gates for g in gates):
+        return None
+    return sum(medians.get(g.name, timings.gate_cost(g.name)) for g in gates)
+
+
+def efficiency(serial: float, wall: float, jobs: int) -> float:
+    """Serial estimate / (workers * wall time); 1.0 = perfect speedup."""
+    return serial / (jobs * wall) if wall > 0 and jobs > 0 else 0.0
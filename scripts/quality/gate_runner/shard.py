@@ -0,0 +1,234 @@
+"""Split a gate run across CI machines and merge the shard reports.
+
+The unit of work is a gate, or for gates with `split` globs a bucket of
+their per-file inputs (each bucket runs narrowed, see vfs.narrowed). Costs
+come from the timings file written by earlier runs:
+
+    {"schema": 1, "gates": {"check_x": {"seconds": 2.1, "fixed": 0.2,
+                                         "files": {"templates/a.html.twig": 0.004}}}}
+
+`fixed` is the part of a split gate's time no single file accounts for
+(startup, context files, global post-processing); every bucket pays it.
+
+plan() is deterministic for a given tree, manifest and timings file, so every
+shard computes the same partition independently:
+
+1. a split gate is cut into the k buckets (1 <= k <= N) that minimise
+   max(fixed + files / k, (total + (k - 1) * fixed) / N), i.e. the bucket
+   itself versus the even share the extra fixed costs inflate; its files are
+   dealt out longest-first to the lightest bucket;
+2. all units are then assigned longest-processing-time-first to the least
+   loaded shard.
+
+Each shard writes its results (and the timings it observed) to a JSON report;
+merge() folds the reports back into one result per gate in manifest order,
+so the summary and exit code match a single-node run.
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .corpus import WorktreeCorpus
+from .execute import GateResult
+from .manifest import ROOT, Gate
+
+TIMINGS = ROOT / "var/cache/quality/gate_timings.json"
+SHARD_DIR = TIMINGS.parent
+_SCHEMA = 1
+
+# Estimates for gates/files the timings file has never seen.
+DEFAULT_GATE_SECONDS = 1.0
+DEFAULT_FILE_SECONDS = 0.002
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'2/4' -> (2, 4); shards are numbered from 1."""
+    index, sep, total = spec.partition("/")
+    if not sep or not index.isdigit() or not total.isdigit():
+        raise ValueError(f"--shard expects i/N, got {spec!r}")
+    i, n = int(index), int(total)
+    if not 1 <= i <= n:
+        raise ValueError(f"--shard {spec}: i must be between 1 and N")
+    return i, n
+
+
+class Timings:
+    """Per-gate and per-file seconds recorded by earlier runs."""
+
+    def __init__(self, gates: dict[str, dict] | None = None):
+        self.gates: dict[str, dict] = gates or {}
+
+    @classmethod
+    def load(cls, path: Path = TIMINGS) -> "Timings":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if data.get("schema") != _SCHEMA:
+            return cls()
+        return cls(data.get("gates", {}))
+
+    def save(self, path: Path = TIMINGS) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"schema": _SCHEMA, "gates": self.gates},
+                                  indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(path)
+
+    def record(self, results: list[GateResult]) -> None:
+        """Fold the results of one run (all units of a gate) into the table."""
+        by_gate: dict[str, list[GateResult]] = {}
+        for r in results:
+            by_gate.setdefault(r.name, []).append(r)
+        for name, runs in by_gate.items():
+            entry = self.gates.setdefault(name, {})
+            entry["seconds"] = round(sum(r.seconds for r in runs), 4)
+            files = {rel: s for r in runs for rel, s in r.file_seconds.items()}
+            if files:
+                entry["fixed"] = round(max(r.fixed for r in runs), 4)
+                entry["files"] = {rel: round(s, 5) for rel, s in sorted(files.items())}
+
+    def file_cost(self, gate: str, rel: str) -> float:
+        files = self.gates.get(gate, {}).get("files") or {}
+        if rel in files:
+            return files[rel]
+        return sum(files.values()) / len(files) if files else DEFAULT_FILE_SECONDS
+
+    def fixed_cost(self, gate: str) -> float:
+        entry = self.gates.get(gate, {})
+        return entry.get("fixed", 0.0) if "files" in entry else entry.get("seconds", 0.0)
+
+    def gate_cost(self, gate: str) -> float:
+        return self.gates.get(gate, {}).get("seconds", DEFAULT_GATE_SECONDS)
+
+
+@dataclass(frozen=True)
+class Unit:
+    gate: str
+    files: tuple[str, ...] | None  # None = the whole gate
+    cost: float
+
+    def key(self) -> tuple:
+        return (self.gate, self.files)
+
+
+def _split_files(gate: Gate, corpus: WorktreeCorpus) -> list[str]:
+    return sorted(rel for rel in corpus.stats if gate.covers(rel) and gate.per_file(rel))
+
+
+def _deal(items: list[tuple[float, str]], k: int) -> list[tuple[float, list[str]]]:
+    """Longest-first: each item goes to the currently lightest of k bins."""
+    heap = [(0.0, i, []) for i in range(k)]
+    for cost, name in sorted(items, key=lambda it: (-it[0], it[1])):
+        load, i, members = heapq.heappop(heap)
+        members.append(name)
+        heapq.heappush(heap, (load + cost, i, members))
+    return [(load, members) for load, _, members in sorted(heap, key=lambda b: b[1])]
+
+
+def _buckets(fixed: float, files: float, total: float, n: int, most: int) -> int:
+    best_k, best = 1, fixed + files
+    for k in range(2, min(n, most) + 1):
+        est = max(fixed + files / k, (total + (k - 1) * fixed) / n)
+        if est < best - 1e-9:
+            best_k, best = k, est
+    return best_k
+
+
+def units(gates: list[Gate], corpus: WorktreeCorpus, timings: Timings, n: int) -> list[Unit]:
+    split_files = {g.name: _split_files(g, corpus) for g in gates if g.split}
+    file_costs: dict[str, list[tuple[float, str]]] = {}
+    costs = {}
+    for g in gates:
+        files = split_files.get(g.name)
+        if files and "files" in timings.gates.get(g.name, {}):
+            file_costs[g.name] = [(timings.file_cost(g.name, rel), rel) for rel in files]
+            costs[g.name] = timings.fixed_cost(g.name) + sum(c for c, _ in file_costs[g.name])
+        else:
+            costs[g.name] = timings.gate_cost(g.name)
+    total = sum(costs.values())
+    out = []
+    for g in gates:
+        items = file_costs.get(g.name)
+        fixed = timings.fixed_cost(g.name)
+        k = _buckets(fixed, costs[g.name] - fixed, total, n, len(items)) if items else 1
+        if k == 1:
+            out.append(Unit(g.name, None, costs[g.name]))
+            continue
+        for load, members in _deal(items, k):
+            out.append(Unit(g.name, tuple(sorted(members)), fixed + load))
+    return out
+
+
+def plan(gates: list[Gate], corpus: WorktreeCorpus, timings: Timings, n: int) -> list[list[Unit]]:
+    """Partition the gate run into n shards (index 0 = shard 1/N)."""
+    order = {g.name: i for i, g in enumerate(gates)}
+    shards: list[list[Unit]] = [[] for _ in range(n)]
+    heap = [(0.0, i) for i in range(n)]
+    for unit in sorted(units(gates, corpus, timings, n),
+                       key=lambda u: (-u.cost, order[u.gate], u.files or ())):
+        load, i = heapq.heappop(heap)
+        shards[i].append(unit)
+        heapq.heappush(heap, (load + unit.cost, i))
+    for shard in shards:
+        shard.sort(key=lambda u: (order[u.gate], u.files or ()))
+    return shards
+
+
+def plan_digest(shards: list[list[Unit]]) -> str:
+    payload = json.dumps([[u.key() for u in s] for s in shards])
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def write_report(path: Path, index: int, n: int, digest: str,
+                 done: list[tuple[Unit, GateResult]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "schema": _SCHEMA, "shard": index, "of": n, "plan": digest,
+        "units": [{"files": list(u.files) if u.files is not None else None, **asdict(r)}
+                  for u, r in done],
+    }), encoding="utf-8")
+
+
+def merge(paths: list[Path], gates: list[Gate]) -> list[GateResult]:
+    """Combine shard reports into one GateResult per gate, manifest order.
+
+    Raises ValueError when the reports come from different plans, a shard is
+    missing or duplicated, or a gate was run by no shard.
+    """
+    reports = [json.loads(p.read_text(encoding="utf-8")) for p in paths]
+    if not reports:
+        raise ValueError("no shard reports given")
+    n, digest = reports[0]["of"], reports[0]["plan"]
+    if any(r["of"] != n or r["plan"] != digest for r in reports):
+        raise ValueError("shard reports come from different plans (timings or tree differ)")
+    seen = sorted(r["shard"] for r in reports)
+    if seen != list(range(1, n + 1)):
+        raise ValueError(f"expected shards 1..{n}, got {seen}")
+    parts: dict[str, list[tuple[list[str] | None, GateResult]]] = {}
+    for report in reports:
+        for unit in report["units"]:
+            files = unit.pop("files")
+            parts.setdefault(unit["name"], []).append((files, GateResult(**unit)))
+    merged = []
+    for gate in gates:
+        runs = parts.pop(gate.name, None)
+        if runs is None:
+            raise ValueError(f"{gate.name} was not run by any shard")
+        merged.append(combine(gate, runs))
+    return merged
+
+
+def combine(gate: Gate, runs: list[tuple[list[str] | tuple[str, ...] | None, GateResult]]) -> GateResult:
+    """One result for a gate run in several narrowed parts (files, result)."""
+    runs = sorted(runs, key=lambda run: list(run[0] or []))
+    failed = [r.rc for _, r in runs if r.rc]
+    return GateResult(
+        gate.name, max(failed) if failed else 0,
+        "".join(r.output for _, r in runs), sum(r.seconds for _, r in runs),
+        gate.advisory, max(r.fixed for _, r in runs),
+        {rel: s for _, r in runs for rel, s in r.file_seconds.items()})
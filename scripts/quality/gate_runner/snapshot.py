@@ -0,0 +1,158 @@
+"""Memory-mapped corpus snapshot: one file, an offset table, raw file bytes.
+
+A `--jobs N` run writes the corpus it scanned to var/cache/quality/corpus.snap
+before it starts the workers. A worker maps that file and takes its stat
+cache and directory list from it instead of walking the tree again, and
+every read is a slice of the mapping (memoryview), decoded in place.
+Later processes (the next run, --watch, --serve) attach the same snapshot to
+their freshly scanned corpus: a file whose (mtime_ns, size) still matches its
+record is served from the mapping, anything else from disk.
+
+Layout (little-endian):
+
+    header   magic "GATESNAP", format, record count, meta length
+    meta     JSON {"root", "roots", "dirs"}
+    records  count x (name offset, name length, data offset, data length,
+                      mtime_ns, size), sorted by UTF-8 name
+    names    concatenated UTF-8 names
+    data     concatenated file bytes
+
+Opening parses the header and the meta only; the first lookup indexes the
+record names (not the data), and a read is a slice of the mapping. The file
+is replaced atomically, so a process that still maps an older snapshot keeps
+a consistent view.
+"""
+from __future__ import annotations
+
+import io
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator
+
+from .shard import SHARD_DIR
+
+SNAPSHOT = SHARD_DIR / "corpus.snap"
+MAGIC = b"GATESNAP"
+FORMAT = 1
+
+_HEADER = struct.Struct("<8sIIQ")  # magic, format, count, meta length
+_RECORD = struct.Struct("<QIxxxxQQqq")  # name off/len, data off/len, mtime_ns, size
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class Snapshot:
+    def __init__(self, path: Path = SNAPSHOT):
+        self.path = Path(path)
+        with io.open(self.path, "rb") as fh:
+            try:
+                self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise SnapshotError(f"{self.path}: {exc}") from None
+        if len(self._mm) < _HEADER.size:
+            raise SnapshotError(f"{self.path}: truncated")
+        magic, fmt, self.count, meta_len = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or fmt != FORMAT:
+            raise SnapshotError(f"{self.path}: not a format {FORMAT} snapshot")
+        self._table = _HEADER.size + meta_len
+        if len(self._mm) < self._table + self.count * _RECORD.size:
+            raise SnapshotError(f"{self.path}: truncated")
+        try:
+            meta = json.loads(self._mm[_HEADER.size:self._table])
+        except ValueError:
+            raise SnapshotError(f"{self.path}: bad meta") from None
+        self.root = Path(meta["root"])
+        self.roots: list[str] = meta["roots"]
+        self.dirs: list[str] = meta["dirs"]
+        self._view = memoryview(self._mm)
+        self._index: dict[str, int] | None = None
+
+    def _record(self, i: int) -> tuple[int, int, int, int, int, int]:
+        return _RECORD.unpack_from(self._mm, self._table + i * _RECORD.size)
+
+    def get(self, rel: str) -> tuple[tuple[int, int], memoryview] | None:
+        """((mtime_ns, size), bytes view) of `rel`, or None."""
+        if self._index is None:
+            self._index = {rel: i for i, (rel, _) in enumerate(self.stats())}
+        i = self._index.get(rel)
+        if i is None:
+            return None
+        _, _, data_off, data_len, mtime_ns, size = self._record(i)
+        return (mtime_ns, size), self._view[data_off:data_off + data_len]
+
+    def stats(self) -> Iterator[tuple[str, tuple[int, int]]]:
+        """(rel, (mtime_ns, size)) for every record, in name order."""
+        for i in range(self.count):
+            name_off, name_len, _, _, mtime_ns, size = self._record(i)
+            yield self._mm[name_off:name_off + name_len].decode("utf-8"), (mtime_ns, size)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # a caller still holds a slice; the mapping goes with it
+
+
+def open_snapshot(path: Path = SNAPSHOT, root: Path | None = None) -> Snapshot | None:
+    """The snapshot at `path` when it is readable (and taken of `root`)."""
+    try:
+        snap = Snapshot(path)
+    except (OSError, SnapshotError, KeyError, TypeError):
+        return None
+    if root is not None and snap.root != Path(root):
+        snap.close()
+        return None
+    return snap
+
+
+def write_snapshot(corpus, path: Path = SNAPSHOT) -> Path:
+    """Write every file of `corpus` to `path`. Files whose stamp matches the
+    corpus's attached snapshot are copied from its mapping, not re-read."""
+    old = corpus.snapshot
+    names: list[bytes] = []
+    chunks: list[bytes | memoryview] = []
+    stamps: list[tuple[int, int]] = []
+    for rel, stamp in sorted(corpus.stats.items(), key=lambda item: item[0].encode("utf-8")):
+        hit = old.get(rel) if old is not None else None
+        if hit is not None and hit[0] == stamp:
+            data = hit[1]
+        else:
+            try:
+                data = corpus._load(rel)
+            except OSError:
+                continue  # vanished since the scan
+        names.append(rel.encode("utf-8"))
+        chunks.append(data)
+        stamps.append(stamp)
+
+    meta = json.dumps({"root": str(corpus.root), "roots": corpus.roots,
+                       "dirs": list(corpus.dirs)}).encode("utf-8")
+    table_end = _HEADER.size + len(meta) + len(names) * _RECORD.size
+    name_off = table_end
+    data_off = table_end + sum(len(n) for n in names)
+    records = []
+    for name, data, (mtime_ns, size) in zip(names, chunks, stamps):
+        records.append(_RECORD.pack(name_off, len(name), data_off, len(data), mtime_ns, size))
+        name_off += len(name)
+        data_off += len(data)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with io.open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT, len(names), len(meta)))
+        fh.write(meta)
+        fh.writelines(records)
+        fh.writelines(names)
+        fh.writelines(chunks)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from scripts.quality.gate_runner import catalogue
+
+CATALOGUE = """\
+answer:
+    yes: Ja
+    no: Nein
+    on: true
+steps:
+    - Erstens
+    - { title: Zweitens }
+empty: ~
+"""
+
+
+def test_keys_follow_symfony_semantics():
+    assert catalogue.catalogue_keys(CATALOGUE) == {
+        "answer.yes", "answer.no", "answer.on", "steps.0", "steps.1.title", "empty"}
+    assert dict(catalogue.flatten(catalogue.load(CATALOGUE)))["answer.on"] is True
+
+
+def test_unparsable_catalogue_is_an_error():
+    with pytest.raises(catalogue.CatalogueError):
+        catalogue.load("a: [")
+    error = catalogue.catalogue_keys("a: [")
+    assert isinstance(error, str)
+    assert catalogue.catalogue_keys("") == frozenset()
+    facts = {Path("ok.en.yaml"): frozenset({"a"}), Path("bad.en.yaml"): error}
+    with pytest.raises(catalogue.CatalogueError, match="bad.en.yaml"):
+        catalogue.parsed(facts)
+    del facts[Path("bad.en.yaml")]
+    assert catalogue.parsed(facts) is facts
+
+
+def test_call_args_splits_top_level_arguments():
+    text = "->trans('risk.title', ['%n%' => f($a, $b)], 'risk')"
+    assert catalogue.call_args(text, text.index("(")) == ["'risk.title'", " ['%n%' => f($a, $b)]", " 'risk'"]
+    assert catalogue.call_args("|trans({}, 'a,b')", 6) == ["{}", " 'a,b'"]
+    assert catalogue.call_args("->trans('x', ", 7) is None
+
+
+def test_default_domain():
+    m = catalogue.RE_TWIG_DEFAULT_DOMAIN.search("{%- trans_default_domain 'risk' -%}")
+    assert m.group(1) == "risk"
@@ -0,0 +1,95 @@
+import glob
+import os
+from pathlib import Path
+
+from scripts.quality.gate_runner.corpus import WorktreeCorpus, input_roots
+from scripts.quality.gate_runner.vfs import narrowed, served_from
+
+
+def _tree(tmp_path):
+    for rel, text in {
+        "templates/base.html.twig": "base",
+        "templates/risk/index.html.twig": "risk",
+        "templates/risk/.hidden.html.twig": "hidden",
+        "templates/risk/notes.md": "md",
+        "src/Form/RiskType.php": "<?php\r\n",
+    }.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode("utf-8"))
+
+
+def test_input_roots_keeps_outermost_literal_prefixes():
+    assert input_roots(["templates/**/*.twig", "templates/risk/*.twig",
+                        "src/Form/*Type.php", "scripts/quality/x.txt"]) == \
+        ["scripts/quality/x.txt", "src/Form", "templates"]
+
+
+def test_rescan_reports_modified_added_and_removed(tmp_path):
+    _tree(tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["templates", "src"])
+    assert corpus.rescan() == set()
+    assert corpus.read_text("templates/base.html.twig") == "base"
+
+    (tmp_path / "templates/base.html.twig").write_text("changed!")
+    (tmp_path / "templates/new.html.twig").write_text("new")
+    (tmp_path / "templates/risk/notes.md").unlink()
+    assert corpus.rescan() == {"templates/base.html.twig", "templates/new.html.twig",
+                               "templates/risk/notes.md"}
+    assert corpus.read_text("templates/base.html.twig") == "changed!"
+
+
+def test_served_reads_and_globs_match_the_real_filesystem(tmp_path):
+    _tree(tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["templates", "src"])
+    tpl = tmp_path / "templates"
+    real_rglob = sorted(tpl.rglob("*.html.twig"))
+    real_glob = sorted(tpl.glob("*.twig"))
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        real_globmod = sorted(glob.glob("templates/**/*.twig", recursive=True))
+        with served_from(corpus):
+            assert sorted(tpl.rglob("*.html.twig")) == real_rglob
+            assert sorted(tpl.glob("*.twig")) == real_glob
+            assert sorted(glob.glob("templates/**/*.twig", recursive=True)) == real_globmod
+            assert (tmp_path / "src/Form/RiskType.php").read_text() == "<?php\n"
+            with open(tmp_path / "src/Form/RiskType.php", "rb") as fh:
+                assert fh.read() == b"<?php\r\n"
+    finally:
+        os.chdir(cwd)
+    assert Path.rglob.__qualname__ == "Path.rglob"
+
+
+def test_narrowed_hides_listings_but_not_reads(tmp_path):
+    _tree(tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["templates"])
+    tpl = tmp_path / "templates"
+    with served_from(corpus), narrowed(lambda rel: rel.startswith("templates/risk/")):
+        names = sorted(p.name for p in tpl.rglob("*.html.twig"))
+        assert names == [".hidden.html.twig", "index.html.twig"]
+        assert (tpl / "base.html.twig").read_text() == "base"
+
+
+def test_overlay_shadows_and_adds_files_for_reads_and_listings(tmp_path):
+    _tree(tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["templates"])
+    tpl = tmp_path / "templates"
+    with served_from(corpus), corpus.overlay({"templates/base.html.twig": "edited",
+                                              "templates/draft.html.twig": "draft"}):
+        assert (tpl / "base.html.twig").read_text() == "edited"
+        assert (tpl / "draft.html.twig").is_file()
+        assert "draft.html.twig" in {p.name for p in tpl.glob("*.html.twig")}
+    assert corpus.read_text("templates/base.html.twig") == "base"
+    assert not corpus.has("templates/draft.html.twig")
+
+
+def test_refresh_restats_only_the_named_paths(tmp_path):
+    _tree(tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["templates"])
+    assert corpus.read_text("templates/base.html.twig") == "base"
+    (tmp_path / "templates/base.html.twig").write_text("fresh text")
+    (tmp_path / "templates/other.html.twig").write_text("other")
+    assert corpus.refresh(["templates/base.html.twig"]) == {"templates/base.html.twig"}
+    assert corpus.read_text("templates/base.html.twig") == "fresh text"
+    assert not corpus.has("templates/other.html.twig")
@@ -0,0 +1,79 @@
+import threading
+
+from scripts.quality.gate_runner import daemon
+from scripts.quality.gate_runner.corpus import WorktreeCorpus
+from scripts.quality.gate_runner.execute import Memo
+from scripts.quality.gate_runner.manifest import load_manifest, select
+from scripts.quality.gate_runner.vfs import narrowed, served_from
+
+TEMPLATE = "templates/base.html.twig"
+
+
+def _memo_tree(tmp_path):
+    for rel in ("src/Form/AType.php", "src/Form/BType.php"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    corpus = WorktreeCorpus(tmp_path, ["src"])
+    calls = []
+
+    def collect():
+        calls.append(1)
+        return sorted(p.read_text() for p in (tmp_path / "src/Form").glob("*Type.php"))
+
+    return corpus, Memo().wrap("check_x", "collect", collect), calls
+
+
+def test_memo_reuses_results_until_a_read_file_changes(tmp_path):
+    corpus, collect, calls = _memo_tree(tmp_path)
+    with served_from(corpus):
+        assert collect() == collect() == ["src/Form/AType.php", "src/Form/BType.php"]
+        assert len(calls) == 1
+        (tmp_path / "src/Form/AType.php").write_text("changed")
+        corpus.refresh(["src/Form/AType.php"])
+        assert collect() == ["changed", "src/Form/BType.php"]
+        assert len(calls) == 2
+
+
+def test_memo_revalidates_listings_for_new_files_and_narrowing(tmp_path):
+    corpus, collect, calls = _memo_tree(tmp_path)
+    with served_from(corpus):
+        collect()
+        (tmp_path / "src/Form/CType.php").write_text("c")
+        corpus.rescan()
+        assert "c" in collect()
+        with narrowed(lambda rel: rel != "src/Form/BType.php"):
+            assert collect() == ["c", "src/Form/AType.php"]
+        with corpus.overlay({"src/Form/AType.php": "unsaved"}):
+            assert "unsaved" in collect()
+        assert collect() == ["c", "src/Form/AType.php", "src/Form/BType.php"]
+    assert len(calls) == 4  # back on the plain tree: its variant is still cached
+
+
+def test_service_checks_unsaved_buffer_narrowed_to_that_file():
+    service = daemon.GateService(select(load_manifest(), ["no_bi_classes"]))
+    clean = service.check([TEMPLATE], {})
+    dirty = service.check([], {TEMPLATE: '<i class="bi bi-house"></i>\n'})
+    (result,) = dirty["results"]
+    assert clean["ok"] and not dirty["ok"]
+    assert result["narrowed"] == [TEMPLATE]
+    assert TEMPLATE in result["output"]
+    assert service.check([TEMPLATE], {})["ok"]
+
+
+def test_socket_round_trip(tmp_path):
+    sock = tmp_path / "gates.sock"
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=daemon.serve, daemon=True,
+        kwargs={"names": ["no_bi_classes"], "path": sock, "emit": lambda _: ready.set()})
+    thread.start()
+    assert ready.wait(30)
+    try:
+        assert daemon.request({"op": "ping"}, sock)["gates"] == 1
+        assert daemon.request({"op": "bogus"}, sock) == {"ok": False, "error": "unknown op: bogus"}
+        reply = daemon.request({"op": "check", "paths": [TEMPLATE]}, sock)
+        assert reply["ok"] and reply["results"][0]["gate"] == "check_no_bi_classes"
+    finally:
+        daemon.request({"op": "stop"}, sock)
+        thread.join(10)
+    assert not thread.is_alive() and not sock.exists()
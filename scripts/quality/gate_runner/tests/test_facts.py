@@ -0,0 +1,69 @@
+from scripts.quality.gate_runner import catalogue, facts, yamlkeys
+
+CALLS: list[str] = []
+
+
+def word_count(text: str) -> int:
+    CALLS.append(text)
+    return len(text.split())
+
+
+def _fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(facts, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(facts, "_MEMORY", {})
+    monkeypatch.setattr(facts, "_VERSION", {})
+    CALLS.clear()
+
+
+def _files(tmp_path, contents):
+    paths = []
+    for i, text in enumerate(contents):
+        path = tmp_path / f"f{i}.txt"
+        path.write_text(text)
+        paths.append(path)
+    return paths
+
+
+def test_maps_in_order_once_per_content(tmp_path, monkeypatch):
+    _fresh(tmp_path, monkeypatch)
+    paths = _files(tmp_path, ["a b", "c", "a b"])
+    out = facts.map_files(word_count, [*reversed(paths), tmp_path / "missing.txt"])
+    assert list(out.items()) == [(paths[2], 2), (paths[1], 1), (paths[0], 2)]
+    assert sorted(CALLS) == ["a b", "c"]
+
+    paths[1].write_text("c d e")
+    assert facts.map_files(word_count, paths) == {paths[0]: 2, paths[1]: 3, paths[2]: 2}
+    assert sorted(CALLS) == ["a b", "c", "c d e"]
+
+
+def test_disk_cache_survives_process_and_follows_gate_version(tmp_path, monkeypatch):
+    _fresh(tmp_path, monkeypatch)
+    paths = _files(tmp_path, ["x", "y z"])
+    facts.map_files(word_count, paths)
+    assert (tmp_path / "cache" / "test_facts.word_count.pickle").is_file()
+
+    monkeypatch.setattr(facts, "_MEMORY", {})
+    monkeypatch.setattr(facts, "_VERSION", {})
+    CALLS.clear()
+    assert facts.map_files(word_count, paths) == {paths[0]: 1, paths[1]: 2}
+    assert CALLS == []
+
+    monkeypatch.setattr(facts, "_version", lambda func: "edited")
+    assert facts.map_files(word_count, paths) == {paths[0]: 1, paths[1]: 2}
+    assert sorted(CALLS) == ["x", "y z"]
+
+
+def test_version_covers_imported_gate_runner_helpers():
+    assert facts._sources(word_count) == [__file__]
+    assert facts._sources(catalogue.catalogue_keys) == [catalogue.__file__]
+    # yamlkeys.py imports map_files by name
+    assert facts._sources(yamlkeys.scan) == sorted([yamlkeys.__file__, facts.__file__])
+
+
+def test_parallel_map_matches_serial(tmp_path, monkeypatch):
+    _fresh(tmp_path, monkeypatch)
+    monkeypatch.setattr(facts, "PARALLEL_MIN", 2)
+    paths = _files(tmp_path, [" ".join("w" * (i + 1)) for i in range(8)])
+    out = facts.map_files(word_count, paths, jobs=2)
+    assert out == {p: i + 1 for i, p in enumerate(paths)}
+    assert CALLS == []  # mapped in the workers
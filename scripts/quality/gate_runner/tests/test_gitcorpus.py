@@ -0,0 +1,81 @@
+import subprocess
+
+import pytest
+
+from scripts.quality.gate_runner.execute import Memo
+from scripts.quality.gate_runner.gitcorpus import INDEX, BlobStore, GitCorpus, GitError, changed_since
+from scripts.quality.gate_runner.vfs import served_from
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "templates/risk").mkdir(parents=True)
+    (tmp_path / "templates/base.html.twig").write_text("v1")
+    (tmp_path / "templates/risk/index.html.twig").write_text("risk")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "one")
+    (tmp_path / "templates/base.html.twig").write_text("v2 staged")
+    _git(tmp_path, "add", "templates/base.html.twig")
+    (tmp_path / "templates/base.html.twig").write_text("v3 worktree only")
+    (tmp_path / "templates/untracked.html.twig").write_text("untracked")
+    return tmp_path
+
+
+def test_index_and_commit_views_ignore_the_worktree(repo):
+    with BlobStore(repo) as store:
+        staged = GitCorpus(repo, ["templates"], INDEX, store)
+        head = GitCorpus(repo, ["templates"], "HEAD", store)
+        assert staged.read_text("templates/base.html.twig") == "v2 staged"
+        assert head.read_text("templates/base.html.twig") == "v1"
+        assert sorted(head.stats) == ["templates/base.html.twig", "templates/risk/index.html.twig"]
+        # the unchanged blob is fetched once for both views
+        head.read_bytes("templates/risk/index.html.twig")
+        staged.read_bytes("templates/risk/index.html.twig")
+        assert len(store.blobs) == 3
+
+
+def test_sealed_vfs_hides_untracked_files(repo):
+    tpl = repo / "templates"
+    with BlobStore(repo) as store, served_from(GitCorpus(repo, ["templates"], "HEAD", store)):
+        assert sorted(p.name for p in tpl.rglob("*.twig")) == ["base.html.twig", "index.html.twig"]
+        assert not (tpl / "untracked.html.twig").exists()
+        assert (tpl / "risk").is_dir() and not (tpl / "nope").is_dir()
+        with pytest.raises(FileNotFoundError):
+            (tpl / "untracked.html.twig").read_text()
+        with pytest.raises(FileNotFoundError):
+            open(tpl / "untracked.html.twig")
+        assert (tpl / "base.html.twig").read_text() == "v1"
+
+
+def test_memo_reuses_results_across_revisions(repo):
+    calls = []
+
+    def parse(path):
+        calls.append(path.name)
+        return path.read_text()
+
+    parse = Memo().wrap("check_x", "parse", parse)
+    risk = repo / "templates/risk/index.html.twig"
+    base = repo / "templates/base.html.twig"
+    with BlobStore(repo) as store:
+        for rev in ("HEAD", INDEX):
+            with served_from(GitCorpus(repo, ["templates"], rev, store)):
+                parse(risk), parse(base)
+    assert calls == ["index.html.twig", "base.html.twig", "base.html.twig"]
+
+
+def test_unknown_revision(repo):
+    with pytest.raises(GitError, match="unknown revision"):
+        GitCorpus(repo, ["templates"], "no-such-branch")
+
+
+def test_changed_since_lists_diff_and_untracked_files(repo):
+    assert changed_since(repo, "HEAD") == {"templates/base.html.twig", "templates/untracked.html.twig"}
+    with pytest.raises(GitError):
+        changed_since(repo, "--output=x")
@@ -0,0 +1,29 @@
+from scripts.quality.gate_runner import execute
+from scripts.quality.gate_runner.corpus import WorktreeCorpus
+from scripts.quality.gate_runner.inputs import undeclared_reads
+from scripts.quality.gate_runner.manifest import parse_manifest
+
+GATE = """\
+from pathlib import Path
+
+
+def main():
+    for path in sorted(Path("fixtures/mappings").rglob("*.csv")):
+        path.read_text()
+    return 0
+"""
+
+
+def test_undeclared_reads_lists_files_outside_the_inputs(tmp_path, monkeypatch):
+    for rel in ("fixtures/mappings/a.csv", "fixtures/mappings/public/b.csv"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x")
+    (tmp_path / "check_csv.py").write_text(GATE)
+    monkeypatch.setattr(execute, "QUALITY_DIR", tmp_path)
+    monkeypatch.setattr(execute, "ROOT", tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["fixtures"])
+
+    top_only = parse_manifest("check_csv:\n  inputs:\n    - fixtures/mappings/*.csv\n")
+    assert undeclared_reads(top_only, corpus) == {"check_csv": ["fixtures/mappings/public/b.csv"]}
+    nested = parse_manifest("check_csv:\n  inputs:\n    - fixtures/mappings/**/*.csv\n")
+    assert undeclared_reads(nested, corpus) == {}
@@ -0,0 +1,80 @@
+import pytest
+
+from scripts.quality.gate_runner import manifest as mf
+
+SAMPLE = """\
+# comment
+check_alpha:
+  args: --baseline scripts/quality/baselines/alpha.txt --quiet
+  inputs:
+    - templates/**/*.html.twig
+    - src/Form/*Type.php   # inline comment
+  split:
+    - templates/**/*.html.twig
+  context:
+    - templates/_components/*.html.twig
+  memo:
+    - parse_form
+
+check_beta:
+  advisory: true
+  inputs: []
+"""
+
+
+def test_parse_manifest_reads_args_lists_and_flags():
+    alpha, beta = mf.parse_manifest(SAMPLE)
+    assert alpha.name == "check_alpha"
+    assert alpha.args == ["--baseline", "scripts/quality/baselines/alpha.txt", "--quiet"]
+    assert alpha.inputs == ["templates/**/*.html.twig", "src/Form/*Type.php"]
+    assert alpha.context == ["templates/_components/*.html.twig"]
+    assert alpha.memo == ["parse_form"]
+    assert not alpha.advisory
+    assert beta.advisory and beta.inputs == []
+
+
+def test_parse_manifest_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="unknown key"):
+        mf.parse_manifest("check_x:\n  input: a\n")
+
+
+def test_glob_regex_double_star_spans_zero_or_more_dirs():
+    rx = mf.glob_regex("templates/**/*.html.twig")
+    assert rx.match("templates/base.html.twig")
+    assert rx.match("templates/a/b/c.html.twig")
+    assert not rx.match("templates/a/b/c.html.twig.bak")
+    assert not mf.glob_regex("src/Form/*Type.php").match("src/Form/Sub/XType.php")
+
+
+def test_covers_and_per_file():
+    alpha = mf.parse_manifest(SAMPLE)[0]
+    assert alpha.covers("templates/risk/index.html.twig")
+    assert alpha.covers("scripts/quality/check_alpha.py")
+    assert not alpha.covers("src/Entity/Risk.php")
+    assert alpha.per_file("templates/risk/index.html.twig")
+    assert not alpha.per_file("templates/_components/_fa_card.html.twig")
+    assert not alpha.per_file("src/Form/RiskType.php")
+
+
+def test_select_accepts_short_names_and_rejects_unknown():
+    gates = mf.parse_manifest(SAMPLE)
+    assert [g.name for g in mf.select(gates, ["beta", "check_alpha"])] == ["check_beta", "check_alpha"]
+    with pytest.raises(ValueError):
+        mf.select(gates, ["gamma"])
+
+
+def test_repo_manifest_lists_existing_gates():
+    gates = mf.load_manifest()
+    assert gates
+    for gate in gates:
+        assert (mf.ROOT / gate.script).is_file(), gate.name
+        assert gate.inputs, gate.name
+        source = (mf.ROOT / gate.script).read_text(encoding="utf-8")
+        for fname in gate.memo:
+            assert f"\ndef {fname}(" in source, f"{gate.name}: {fname}"
+
+
+def test_repo_compliance_catalog_covers_nested_mappings():
+    gate = mf.select(mf.load_manifest(), ["compliance_catalog"])[0]
+    assert gate.covers("fixtures/mappings/public/c5_iso27001_v1.csv")
+    assert gate.covers("fixtures/mappings/public/_deprecated/old.yaml")
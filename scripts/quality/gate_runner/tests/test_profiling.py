@@ -0,0 +1,48 @@
+import pstats
+import time
+
+from scripts.quality.gate_runner import profiling
+from scripts.quality.gate_runner.corpus import WorktreeCorpus
+
+
+def test_file_clock_charges_reads_until_next_read():
+    clock = profiling.FileClock(lambda rel: rel.endswith(".twig"))
+    clock.read("config/a.yaml")  # uncharged, nothing running: ignored
+    clock.read("templates/a.html.twig")
+    time.sleep(0.02)
+    clock.read("templates/b.html.twig")
+    clock.read("templates/a.html.twig")  # re-read keeps b running
+    time.sleep(0.02)
+    clock.read("config/a.yaml")  # ends b; the rest is fixed
+    time.sleep(0.01)
+    clock.stop()
+    assert set(clock.files) == {"templates/a.html.twig", "templates/b.html.twig"}
+    assert clock.files["templates/a.html.twig"] >= 0.02
+    assert clock.files["templates/b.html.twig"] >= 0.02
+    assert clock.fixed >= 0.01
+
+
+def test_capture_writes_pstats_collapsed_and_report(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/big.php").write_text("x" * 1000)
+    (tmp_path / "src/small.php").write_text("y")
+    corpus = WorktreeCorpus(tmp_path, ["src"])
+    out = tmp_path / "profile"
+
+    def spin(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    with profiling.capture("check_x", out, corpus, top=1) as prof:
+        corpus.read_text("src/big.php")
+        spin(0.05)
+        corpus.read_text("src/small.php")
+
+    assert pstats.Stats(str(out / "check_x.pstats")).total_calls > 0
+    lines = (out / "check_x.collapsed").read_text().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("test_profiling.py:spin" in line for line in lines)
+    assert "slowest files (of 2 read" in prof.report
+    assert "1000 B  src/big.php" in prof.report
+    assert "src/small.php" not in prof.report
@@ -0,0 +1,81 @@
+import re
+import sys
+import types
+
+from scripts.quality.gate_runner import regexes
+from scripts.quality.gate_runner.manifest import QUALITY_DIR
+
+GATE_SOURCE = """\
+import re
+WORD = re.compile(r"[a-z]+")
+
+def main(text):
+    re.search(r"\\d+", text)
+    return [m.group() for m in WORD.finditer(text)]
+"""
+
+
+def test_recording_times_gate_patterns_and_restores_re():
+    module = types.ModuleType("check_fake_regex")
+    module.__file__ = str(QUALITY_DIR / "check_fake_regex.py")
+    module.EARLY = re.compile("early")  # compiled before recording started
+    sys.modules[module.__name__] = module
+    try:
+        with regexes.recording() as stats:
+            assert isinstance(module.EARLY, regexes.TimedPattern)
+            exec(compile(GATE_SOURCE, module.__file__, "exec"), module.__dict__)
+            assert module.main("ab 12 cd") == ["ab", "cd"]
+            module.EARLY.search("not here")
+        word = stats.patterns[("[a-z]+", re.compile("[a-z]+").flags)]
+        assert (word.calls, word.longest, word.where) == (1, 8, "check_fake_regex.py:2")
+        assert stats.patterns[(r"\d+", re.compile(r"\d+").flags)].calls == 1
+        assert stats.patterns[("early", re.compile("early").flags)].where == "check_fake_regex.py:EARLY"
+        assert re.compile is regexes._REAL["compile"]
+        assert isinstance(module.EARLY, re.Pattern) and isinstance(module.WORD, re.Pattern)
+    finally:
+        del sys.modules[module.__name__]
+
+
+def test_patterns_outside_quality_dir_are_not_wrapped():
+    with regexes.recording() as stats:
+        assert isinstance(re.compile("plain"), re.Pattern)
+    assert not stats.patterns
+
+
+def test_collect_sites(tmp_path):
+    (tmp_path / "check_a.py").write_text(
+        "import re\n"
+        "A = re.compile(r'<row[^>]*>(.*?)</row>', re.S | re.M)\n"
+        "def f(s, key):\n"
+        "    re.search('x+', s, flags=re.I)\n"
+        "    re.search('%s:' % key, s)\n"
+        "    return re.sub('x+', '', s)\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests/test_a.py").write_text("import re\nre.compile('ignored')\n")
+    sites = {(s.pattern, s.flags): s.where for s in regexes.collect_sites(tmp_path)}
+    assert sites == {
+        ("<row[^>]*>(.*?)</row>", re.S | re.M): ["check_a.py:2"],
+        ("x+", re.I): ["check_a.py:4"],
+        ("x+", 0): ["check_a.py:6"],
+    }
+
+
+def test_adversarial_inputs_repeat_partial_matches_and_pump_repetitions():
+    inputs = {label: (head, unit, tail) for label, head, unit, tail
+              in regexes.adversarial_inputs(r"<row[^>]*>(.*?)</row>", re.S)}
+    assert ("", "<rowa>x</row", "") in inputs.values()
+    assert ("<row", "a", "\x00") in inputs.values()
+
+
+def test_probe_tells_quadratic_from_linear():
+    exponent, label = regexes.probe(r"#\[Route\(\s*['\"]([^'\"]*)['\"](.*?)\)\]", re.S)
+    assert exponent >= regexes.SUPERLINEAR and "repeated" in label
+    assert regexes.probe(r"[a-z]+", 0)[0] < regexes.SUPERLINEAR
+
+
+def test_bench_kills_catastrophic_patterns():
+    sites = [regexes.Site(r"(a+)+b", 0, ["check_x.py:1"]), regexes.Site(r"[a-z]+", 0, ["check_x.py:2"])]
+    verdicts = regexes.bench(sites, timeout=1.0)
+    assert [v.timed_out for v in verdicts] == [True, False]
+    assert [v.flagged for v in verdicts] == [True, False]
+    assert regexes.format_verdict(verdicts[0]).startswith("CATASTROPHIC check_x.py:1")
@@ -0,0 +1,73 @@
+from scripts.quality.gate_runner import schedule
+from scripts.quality.gate_runner.corpus import WorktreeCorpus
+from scripts.quality.gate_runner.execute import GateResult
+from scripts.quality.gate_runner.manifest import parse_manifest
+from scripts.quality.gate_runner.shard import Timings
+
+MANIFEST = """\
+check_small:
+  inputs:
+    - src/*.php
+check_tpl:
+  inputs:
+    - templates/**/*.html.twig
+  split:
+    - templates/**/*.html.twig
+check_mid:
+  inputs:
+    - src/*.php
+"""
+
+
+def test_history_appends_and_takes_medians(tmp_path):
+    history = schedule.History(tmp_path / "history.jsonl")
+    for seconds in (1.0, 9.0, 2.0):
+        history.append([GateResult("check_a", 0, "", seconds, False),
+                        GateResult("check_b", 0, "", 0.5, False),
+                        GateResult("check_b", 0, "", 0.25, False)], wall=seconds, jobs=1)
+    # contended --jobs times are kept but never planned with
+    history.append([GateResult("check_a", 0, "", 30.0, False)], wall=30.0, jobs=4)
+    with open(history.path, "a") as fh:
+        fh.write('{"at": "torn')
+    assert len(history.runs()) == 4
+    assert history.medians() == {"check_a": 2.0, "check_b": 0.75}
+    assert history.medians(last=2) == {"check_a": 5.5, "check_b": 0.75}
+
+
+def test_plan_jobs_longest_first_and_splits_dominant_gate_by_directory(tmp_path):
+    for d in ("risk", "audit", "asset"):
+        (tmp_path / "templates" / d).mkdir(parents=True)
+        for i in range(2):
+            (tmp_path / f"templates/{d}/t{i}.html.twig").write_text("x")
+    gates = parse_manifest(MANIFEST)
+    corpus = WorktreeCorpus(tmp_path, ["templates", "src"])
+    timings = Timings({"check_tpl": {"seconds": 6.5, "fixed": 0.5,
+                                     "files": {f"templates/{d}/t{i}.html.twig": 1.0
+                                               for d in ("risk", "audit", "asset") for i in range(2)}}})
+    medians = {"check_small": 0.5, "check_mid": 2.0}
+
+    serial = schedule.plan_jobs(gates, corpus, timings, medians, 1)
+    assert [(u.gate, u.files) for u in serial] == [
+        ("check_tpl", None), ("check_mid", None), ("check_small", None)]
+
+    units = schedule.plan_jobs(gates, corpus, timings, medians, 3)
+    tpl = [u for u in units if u.gate == "check_tpl"]
+    assert len(tpl) == 3
+    assert sorted(u.files for u in tpl) == [
+        ("templates/asset/t0.html.twig", "templates/asset/t1.html.twig"),
+        ("templates/audit/t0.html.twig", "templates/audit/t1.html.twig"),
+        ("templates/risk/t0.html.twig", "templates/risk/t1.html.twig"),
+    ]
+    assert all(u.cost == 2.5 for u in tpl)
+    assert [u.cost for u in units] == sorted((u.cost for u in units), reverse=True)
+
+
+def test_efficiency_uses_the_serial_estimate():
+    gates = parse_manifest(MANIFEST)
+    timings = Timings({"check_tpl": {"seconds": 3.0}})
+    assert schedule.serial_estimate(gates, timings, {"check_small": 0.5}) is None
+    serial = schedule.serial_estimate(gates, timings, {"check_small": 0.5, "check_mid": 0.5})
+    assert serial == 4.0
+    assert schedule.efficiency(serial, wall=2.0, jobs=2) == 1.0
+    # one CPU for two workers: no faster than serial, whatever the units measured
+    assert schedule.efficiency(serial, wall=4.0, jobs=2) == 0.5
@@ -0,0 +1,95 @@
+import pytest
+
+from scripts.quality.gate_runner import shard
+from scripts.quality.gate_runner.corpus import WorktreeCorpus
+from scripts.quality.gate_runner.execute import GateResult
+from scripts.quality.gate_runner.manifest import parse_manifest
+
+MANIFEST = """\
+check_tpl:
+  inputs:
+    - templates/**/*.html.twig
+  split:
+    - templates/**/*.html.twig
+check_slow:
+  inputs:
+    - src/*.php
+check_fast:
+  inputs:
+    - src/*.php
+"""
+
+
+@pytest.fixture
+def setup(tmp_path):
+    for i in range(8):
+        (tmp_path / "templates").mkdir(exist_ok=True)
+        (tmp_path / f"templates/t{i}.html.twig").write_text("x")
+    gates = parse_manifest(MANIFEST)
+    corpus = WorktreeCorpus(tmp_path, ["templates", "src"])
+    timings = shard.Timings({
+        "check_tpl": {"seconds": 8.5, "fixed": 0.5,
+                      "files": {f"templates/t{i}.html.twig": 1.0 for i in range(8)}},
+        "check_slow": {"seconds": 4.0},
+        "check_fast": {"seconds": 0.5},
+    })
+    return gates, corpus, timings
+
+
+def test_parse_shard():
+    assert shard.parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            shard.parse_shard(bad)
+
+
+def test_plan_splits_heavy_gates_and_balances_longest_first(setup):
+    gates, corpus, timings = setup
+    shards = shard.plan(gates, corpus, timings, 2)
+    assert shards == shard.plan(gates, corpus, timings, 2)  # deterministic
+    loads = sorted(sum(u.cost for u in s) for s in shards)
+    assert loads == [5.0, 8.5]  # tpl split 4.5 + 4.5, then slow, then fast
+    tpl_files = [f for s in shards for u in s if u.gate == "check_tpl" for f in u.files]
+    assert sorted(tpl_files) == [f"templates/t{i}.html.twig" for i in range(8)]
+    # a single shard never splits
+    assert [u.files for u in shard.plan(gates, corpus, timings, 1)[0]] == [None] * 3
+
+
+def test_fixed_cost_heavy_gates_stay_whole(setup):
+    gates, corpus, timings = setup
+    # a second bucket would pay 3s again for 1s of files: not worth it
+    timings.gates["check_tpl"] = {"seconds": 5.0, "fixed": 3.0,
+                                  "files": {f"templates/t{i}.html.twig": 0.25 for i in range(8)}}
+    assert all(u.files is None for s in shard.plan(gates, corpus, timings, 2) for u in s)
+
+
+def test_merge_reassembles_the_single_node_report(setup, tmp_path):
+    gates, corpus, timings = setup
+    shards = shard.plan(gates, corpus, timings, 2)
+    digest = shard.plan_digest(shards)
+    paths = []
+    for i, units in enumerate(shards, 1):
+        done = [(u, GateResult(u.gate, 1 if u.files and "templates/t0.html.twig" in u.files else 0,
+                               f"{u.gate}:{i}\n", 1.0, fixed=0.5,
+                               file_seconds={f: 1.0 for f in u.files or ()}))
+                for u in units]
+        paths.append(tmp_path / f"shard-{i}.json")
+        shard.write_report(paths[-1], i, 2, digest, done)
+
+    merged = shard.merge(paths, gates)
+    assert [r.name for r in merged] == ["check_tpl", "check_slow", "check_fast"]
+    assert merged[0].rc == 1 and merged[0].output.count("check_tpl:") == 2
+    assert len(merged[0].file_seconds) == 8
+
+    timings.record(merged)
+    assert timings.gates["check_tpl"]["seconds"] == 2.0
+    with pytest.raises(ValueError, match="expected shards"):
+        shard.merge(paths[:1], gates)
+
+
+def test_timings_round_trip(tmp_path):
+    t = shard.Timings()
+    t.record([GateResult("check_a", 0, "", 1.25)])
+    t.save(tmp_path / "t.json")
+    assert shard.Timings.load(tmp_path / "t.json").gate_cost("check_a") == 1.25
+    assert shard.Timings.load(tmp_path / "missing.json").gates == {}
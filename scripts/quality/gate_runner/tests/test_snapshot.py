@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+
+from scripts.quality.gate_runner.corpus import WorktreeCorpus
+from scripts.quality.gate_runner.snapshot import Snapshot, open_snapshot, write_snapshot
+from scripts.quality.gate_runner.vfs import served_from
+
+
+def _tree(tmp_path):
+    for rel, text in {
+        "templates/base.html.twig": "base",
+        "templates/risk/index.html.twig": "risk ü",
+        "src/Form/RiskType.php": "<?php\r\n",
+    }.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode("utf-8"))
+
+
+def test_worker_corpus_comes_from_the_snapshot_without_walking(tmp_path):
+    _tree(tmp_path)
+    corpus = WorktreeCorpus(tmp_path, ["templates", "src"])
+    path = write_snapshot(corpus, tmp_path / "corpus.snap")
+
+    (tmp_path / "templates/base.html.twig").unlink()  # the snapshot is the tree as scanned
+    worker = WorktreeCorpus.from_snapshot(Snapshot(path))
+    assert (worker.root, worker.roots) == (tmp_path, ["src", "templates"])
+    assert worker.stats == corpus.stats and worker.dirs.keys() == corpus.dirs.keys()
+    assert worker.read_text("templates/base.html.twig") == "base"
+    assert worker.read_text("src/Form/RiskType.php") == "<?php\n"
+    assert worker.read_bytes("templates/risk/index.html.twig") == "risk ü".encode("utf-8")
+    with served_from(worker):
+        assert sorted(p.name for p in Path(tmp_path / "templates").rglob("*.twig")) == \
+            ["base.html.twig", "index.html.twig"]
+
+
+def test_attached_snapshot_serves_only_matching_stamps(tmp_path):
+    _tree(tmp_path)
+    path = write_snapshot(WorktreeCorpus(tmp_path, ["templates"]), tmp_path / "corpus.snap")
+    base = tmp_path / "templates/base.html.twig"
+    st = base.stat()
+    base.write_text("BASE")  # same size, same mtime: indistinguishable by stamp
+    os.utime(base, ns=(st.st_atime_ns, st.st_mtime_ns))
+    (tmp_path / "templates/risk/index.html.twig").write_text("edited")
+
+    corpus = WorktreeCorpus(tmp_path, ["templates"], open_snapshot(path, root=tmp_path))
+    assert corpus.read_text("templates/base.html.twig") == "base"  # from the mapping
+    assert corpus.read_text("templates/risk/index.html.twig") == "edited"  # stale record
+
+    rewritten = write_snapshot(corpus, tmp_path / "next.snap")
+    again = WorktreeCorpus.from_snapshot(Snapshot(rewritten))
+    assert again.read_text("templates/base.html.twig") == "base"  # copied, not re-read
+    assert again.read_text("templates/risk/index.html.twig") == "edited"
+
+
+def test_open_snapshot_rejects_foreign_and_broken_files(tmp_path):
+    _tree(tmp_path)
+    path = write_snapshot(WorktreeCorpus(tmp_path, ["src"]), tmp_path / "corpus.snap")
+    assert open_snapshot(path, root=tmp_path / "elsewhere") is None
+    path.write_bytes(path.read_bytes()[:20])
+    assert open_snapshot(path) is None
+    path.write_bytes(b"")
+    assert open_snapshot(path) is None
+    assert open_snapshot(tmp_path / "missing.snap") is None
@@ -0,0 +1,54 @@
+from scripts.quality.gate_runner.execute import GateResult, finding_files
+from scripts.quality.gate_runner.manifest import parse_manifest
+from scripts.quality.gate_runner.watch import GateState, affected, changed_gates
+
+MANIFEST = """\
+check_tpl:
+  inputs:
+    - templates/**/*.html.twig
+  split:
+    - templates/**/*.html.twig
+  context:
+    - templates/_components/*.html.twig
+check_form:
+  inputs:
+    - src/Form/*Type.php
+    - templates/**/*.html.twig
+"""
+
+
+def test_affected_narrows_only_when_every_hit_is_per_file():
+    tpl, form = parse_manifest(MANIFEST)
+    todo = affected([tpl, form], {"templates/risk/index.html.twig"})
+    assert todo == [(tpl, {"templates/risk/index.html.twig"}), (form, None)]
+    todo = affected([tpl, form], {"templates/_components/_fa_card.html.twig"})
+    assert todo == [(tpl, None), (form, None)]
+    assert affected([tpl, form], {"src/Entity/Risk.php"}) == []
+
+
+def test_changed_gates_selects_covering_gates_or_all_on_runner_changes():
+    tpl, form = parse_manifest(MANIFEST)
+    assert changed_gates([tpl, form], {"docs/README.md", "translations/messages.de.yaml"}) == []
+    assert changed_gates([tpl, form], {"src/Form/RiskType.php"}) == [form]
+    assert changed_gates([tpl, form], {"scripts/quality/check_tpl.py"}) == [tpl]
+    assert changed_gates([tpl, form], {"scripts/quality/gates.yaml"}) == [tpl, form]
+    assert changed_gates([tpl, form], {"scripts/quality/gate_runner/vfs.py"}) == [tpl, form]
+
+
+def test_finding_files_groups_common_output_shapes():
+    out = ("check_x: VIOLATIONS\n\nFAIL templates/a.html.twig:3: bad\n"
+           "templates/b.html.twig:9: macro used early\n  FAIL templates/c.html.twig: crumb\n"
+           "See: templates/_components/_CARD_GUIDE.md\n")
+    assert sorted(finding_files(out)) == ["templates/a.html.twig", "templates/b.html.twig",
+                                         "templates/c.html.twig"]
+
+
+def test_gate_state_carries_other_files_across_narrowed_runs():
+    state = GateState()
+    state.update(GateResult("check_tpl", 1, "FAIL templates/a.html.twig:1: x\n"
+                                            "FAIL templates/b.html.twig:2: y\n", 0.1), None)
+    assert set(state.failing) == {"templates/a.html.twig", "templates/b.html.twig"}
+    state.update(GateResult("check_tpl", 0, "OK\n", 0.01), {"templates/a.html.twig"})
+    assert not state.ok and set(state.failing) == {"templates/b.html.twig"}
+    state.update(GateResult("check_tpl", 0, "OK\n", 0.01), {"templates/b.html.twig"})
+    assert state.ok
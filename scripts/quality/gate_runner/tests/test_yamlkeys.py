@@ -0,0 +1,71 @@
+from scripts.quality.gate_runner import facts, yamlkeys
+
+CATALOGUE = """\
+# comment
+risk:
+    form:
+        title: Titel   # trailing comment
+        help: |
+            first: not a key
+            second
+    modules:
+        users: { label: 'Users', desc: "A, B" }
+    tags:
+        - one: not a key
+'risk.form.title': 'Flat override'
+risk:
+    extra: x
+other: 'y'
+"""
+
+
+def _rows(entries):
+    return [(e.path, e.line, e.end, e.depth, e.parent, e.nth) for e in entries]
+
+
+def test_scan_indexes_paths_spans_and_duplicates():
+    entries = yamlkeys.scan(CATALOGUE)
+    assert _rows(entries) == [
+        ("risk", 2, 11, 0, True, 0),
+        ("risk.form", 3, 7, 1, True, 0),
+        ("risk.form.title", 4, 4, 2, False, 0),
+        ("risk.form.help", 5, 7, 2, False, 0),
+        ("risk.modules", 8, 9, 1, True, 0),
+        ("risk.modules.users", 9, 9, 2, True, 0),
+        ("risk.modules.users.label", 9, 9, 3, False, 0),
+        ("risk.modules.users.desc", 9, 9, 3, False, 0),
+        ("risk.tags", 10, 11, 1, True, 0),
+        ("risk.form.title", 12, 12, 0, False, 1),
+        ("risk", 13, 14, 0, True, 1),
+        ("risk.extra", 14, 14, 1, False, 0),
+        ("other", 15, 15, 0, False, 0),
+    ]
+    assert entries[2].value == "Titel"
+    assert entries[7].value == '"A, B"'
+
+
+def test_queries():
+    entries = yamlkeys.scan(CATALOGUE)
+    dups = yamlkeys.duplicates(entries)
+    assert {path: [e.line for e in occ] for path, occ in dups.items()} == {
+        "risk.form.title": [4, 12], "risk": [2, 13]}
+    assert list(yamlkeys.duplicates(entries, parents_only=True)) == ["risk"]
+    assert [e.path for e in yamlkeys.top_level(entries)] == ["risk", "risk.form.title", "risk", "other"]
+    assert "risk.modules.users" not in [e.path for e in yamlkeys.leaves(entries)]
+
+
+def test_table_rescans_only_changed_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(facts, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(facts, "_MEMORY", {})
+    monkeypatch.setattr(facts, "_VERSION", {})
+    calls = []
+    real = yamlkeys.scan
+    monkeypatch.setattr(yamlkeys, "map_files", lambda func, paths: facts.map_files(
+        lambda text: calls.append(text) or real(text), paths))
+    a, b = tmp_path / "a.yaml", tmp_path / "b.yaml"
+    a.write_text("a: 1\n")
+    b.write_text("b:\n  c: 2\n")
+    assert [e.path for e in yamlkeys.table([a, b])[b]] == ["b", "b.c"]
+    b.write_text("b: 3\n")
+    assert [e.path for e in yamlkeys.table([a, b])[b]] == ["b"]
+    assert calls == ["a: 1\n", "b:\n  c: 2\n", "b: 3\n"]
@@ -0,0 +1,255 @@
+"""Serve the gates' file reads from a WorktreeCorpus.
+
+The check_*.py scripts read through pathlib (read_text/read_bytes/open,
+glob, rglob), glob.glob and builtins.open. Inside `served_from(corpus)` those calls
+are routed through the corpus for paths below its roots, so a re-run after an
+edit only touches the files that changed. Anything the corpus cannot answer
+exactly (writes, other open() modes, multi-directory patterns, paths outside
+the scanned roots) falls through to the real implementation.
+
+Buffers overlaid on the corpus (editor integration) also answer
+Path.is_file/exists. A sealed corpus (gitcorpus.GitCorpus) answers every
+read, listing and is_file/exists/is_dir probe below its roots itself, so
+nothing from the worktree leaks into a check of a commit or the index.
+
+`narrowed(visible)` additionally hides files from directory listings: a gate
+whose findings are per-file can then be run against just the files that
+changed (watch mode) or one bucket of files (sharding).
+"""
+from __future__ import annotations
+
+import builtins
+import contextlib
+import errno
+import glob as globmod
+import io
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .corpus import WorktreeCorpus
+from .manifest import glob_regex
+
+_REAL_OPEN = builtins.open
+_REAL_READ_TEXT = Path.read_text
+_REAL_READ_BYTES = Path.read_bytes
+_REAL_GLOB = Path.glob
+_REAL_RGLOB = Path.rglob
+_REAL_GLOBMOD = globmod.glob
+_REAL_PATH_OPEN = Path.open
+_REAL_IS_FILE = Path.is_file
+_REAL_EXISTS = Path.exists
+_REAL_IS_DIR = Path.is_dir
+
+_SIMPLE = re.compile(r"(\*\*/)?[^/]+\Z")
+_VISIBLE: Callable[[str], bool] | None = None
+_ACTIVE: WorktreeCorpus | None = None
+
+
+def active_corpus() -> WorktreeCorpus | None:
+    """The corpus the current served_from() context routes reads to."""
+    return _ACTIVE
+
+
+@contextlib.contextmanager
+def narrowed(visible: Callable[[str], bool]):
+    """Hide listed files for which `visible(rel)` is False (reads still work)."""
+    global _VISIBLE
+    saved, _VISIBLE = _VISIBLE, visible
+    try:
+        yield
+    finally:
+        _VISIBLE = saved
+
+
+def _known(corpus: WorktreeCorpus, path: object) -> str | None:
+    if not isinstance(path, (str, os.PathLike)):
+        return None
+    rel = corpus.rel(os.fspath(path))
+    return rel if rel is not None and corpus.has(rel) else None
+
+
+def _simple(pattern: str) -> bool:
+    return bool(_SIMPLE.match(pattern)) and "**" not in pattern.replace("**/", "", 1)
+
+
+def listing(corpus: WorktreeCorpus, rel_dir: str, pattern: str,
+            hidden_ok: bool = True) -> list[str]:
+    """Entries below `rel_dir` (relative to it) matching a one-level or '**/'
+    pattern, minus files the current narrowing hides. Other patterns are
+    matched against whole relative file paths (sealed corpora only)."""
+    recursive = pattern.startswith("**/")
+    if _simple(pattern):
+        name_rx, whole = glob_regex(pattern[3:] if recursive else pattern), False
+    else:
+        name_rx, whole = glob_regex(pattern), True
+    cut = len(rel_dir) + 1
+    hits = []
+    for rel in corpus.entries_under(rel_dir):
+        rest = rel[cut:]
+        if whole:
+            if not corpus.has(rel) or not name_rx.match(rest):
+                continue
+        elif not recursive and "/" in rest:
+            continue
+        if not hidden_ok and any(seg.startswith(".") for seg in rest.split("/")):
+            continue
+        if not whole and not name_rx.match(rest.rsplit("/", 1)[-1]):
+            continue
+        if _VISIBLE is not None and corpus.has(rel) and not _VISIBLE(rel):
+            continue
+        hits.append(rest)
+    return hits
+
+
+def _matches(corpus: WorktreeCorpus, base: str, pattern: str,
+             hidden_ok: bool = True) -> list[str] | None:
+    """listing() for a base path, or None when the corpus cannot answer for
+    this base/pattern. The result is recorded for corpus.track()."""
+    if not _simple(pattern) and not corpus.sealed:
+        return None
+    rel_dir = corpus.rel(base)
+    if rel_dir is None:
+        return None
+    if rel_dir not in corpus.dirs:
+        if not corpus.sealed:
+            return None
+        hits = []
+    else:
+        hits = listing(corpus, rel_dir, pattern, hidden_ok)
+    corpus.note_listing((rel_dir, pattern, hidden_ok), hits)
+    return hits
+
+
+def _glob(corpus: WorktreeCorpus, base: Path, pattern: str) -> Iterator[Path] | None:
+    """Corpus-backed Path.glob, or None when the pattern/base is not served."""
+    hits = _matches(corpus, os.fspath(base), pattern)
+    return None if hits is None else iter([base / rest for rest in hits])
+
+
+def _globmod(corpus: WorktreeCorpus, pattern: str, recursive: bool) -> list[str] | None:
+    """Corpus-backed glob.glob for '<dir>/<name>' and '<dir>/**/<name>'
+    (any pattern below a literal directory for sealed corpora)."""
+    parts = pattern.split("/")
+    cut = next((i for i, part in enumerate(parts) if any(ch in part for ch in "*?[")), len(parts) - 1)
+    head, name = "/".join(parts[:cut]), "/".join(parts[cut:])
+    if not head:
+        return None
+    if not recursive:
+        name = name.replace("**", "*")
+    hits = _matches(corpus, head, name, hidden_ok=False)
+    return None if hits is None else [f"{head}/{rest}" for rest in hits]
+
+
+def _absent(corpus: WorktreeCorpus, path: object) -> bool:
+    """True when a sealed corpus must report `path` as missing."""
+    return (corpus.sealed and isinstance(path, (str, os.PathLike))
+            and corpus.rel(os.fspath(path)) is not None)
+
+
+def _missing(path: object) -> OSError:
+    return FileNotFoundError(errno.ENOENT, "not in the checked tree", os.fspath(path))
+
+
+@contextlib.contextmanager
+def served_from(corpus: WorktreeCorpus):
+    def read_text(self, encoding=None, errors=None):
+        rel = _known(corpus, self)
+        if rel is None:
+            if _absent(corpus, self):
+                raise _missing(self)
+            corpus.note_opaque()
+            return _REAL_READ_TEXT(self, encoding, errors)
+        return corpus.read_text(rel, encoding, errors)
+
+    def read_bytes(self):
+        rel = _known(corpus, self)
+        if rel is None:
+            if _absent(corpus, self):
+                raise _missing(self)
+            corpus.note_opaque()
+            return _REAL_READ_BYTES(self)
+        return corpus.read_bytes(rel)
+
+    def path_open(self, mode="r", buffering=-1, encoding=None, errors=None, newline=None):
+        return open_(self, mode, buffering, encoding, errors, newline)
+
+    def _probe(path, real, sealed_answer):
+        rel = corpus.rel(os.fspath(path)) if isinstance(path, (str, os.PathLike)) else None
+        if rel is None:
+            corpus.note_opaque()
+            return real(path)
+        corpus.note_probe(rel)
+        if corpus.is_overlaid(rel):
+            return True
+        return sealed_answer(rel) if corpus.sealed else real(path)
+
+    def is_file(self):
+        return _probe(self, _REAL_IS_FILE, corpus.has)
+
+    def exists(self):
+        return _probe(self, _REAL_EXISTS, lambda rel: corpus.has(rel) or rel in corpus.dirs)
+
+    def is_dir(self):
+        if not corpus.sealed:
+            return _REAL_IS_DIR(self)
+        rel = corpus.rel(os.fspath(self))
+        return _REAL_IS_DIR(self) if rel is None else rel in corpus.dirs
+
+    def glob(self, pattern):
+        hits = _glob(corpus, self, pattern)
+        if hits is None:
+            corpus.note_opaque()
+            return _REAL_GLOB(self, pattern)
+        return hits
+
+    def rglob(self, pattern):
+        served = "/" not in pattern or corpus.sealed
+        hits = _glob(corpus, self, "**/" + pattern) if served else None
+        if hits is None:
+            corpus.note_opaque()
+            return _REAL_RGLOB(self, pattern)
+        return hits
+
+    def glob_glob(pathname, *, root_dir=None, dir_fd=None, recursive=False, **kw):
+        hits = None
+        if root_dir is None and dir_fd is None and not kw:
+            hits = _globmod(corpus, os.fspath(pathname), recursive)
+        if hits is None:
+            corpus.note_opaque()
+            return _REAL_GLOBMOD(pathname, root_dir=root_dir, dir_fd=dir_fd,
+                                 recursive=recursive, **kw)
+        return hits
+
+    def open_(file, mode="r", buffering=-1, encoding=None, errors=None, newline=None,
+              closefd=True, opener=None):
+        if mode in ("r", "rt", "rb") and newline is None and opener is None:
+            rel = _known(corpus, file)
+            if rel is not None:
+                if mode == "rb":
+                    return io.BytesIO(corpus.read_bytes(rel))
+                return io.StringIO(corpus.read_text(rel, encoding, errors))
+            if _absent(corpus, file):
+                raise _missing(file)
+        corpus.note_opaque()
+        return _REAL_OPEN(file, mode, buffering, encoding, errors, newline, closefd, opener)
+
+    global _ACTIVE
+    saved_active, _ACTIVE = _ACTIVE, corpus
+    Path.read_text, Path.read_bytes = read_text, read_bytes
+    Path.glob, Path.rglob = glob, rglob
+    Path.is_file, Path.exists, Path.is_dir = is_file, exists, is_dir
+    Path.open = path_open
+    globmod.glob = glob_glob
+    builtins.open = open_
+    try:
+        yield corpus
+    finally:
+        Path.read_text, Path.read_bytes = _REAL_READ_TEXT, _REAL_READ_BYTES
+        Path.glob, Path.rglob = _REAL_GLOB, _REAL_RGLOB
+        Path.is_file, Path.exists, Path.is_dir = _REAL_IS_FILE, _REAL_EXISTS, _REAL_IS_DIR
+        Path.open = _REAL_PATH_OPEN
+        globmod.glob = _REAL_GLOBMOD
+        builtins.open = _REAL_OPEN
+        _ACTIVE = saved_active
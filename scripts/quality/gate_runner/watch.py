@@ -0,0 +1,135 @@
+"""Watch mode: keep the corpus warm, re-run only the gates a save affects.
+
+After the initial full run every cycle re-stats the input trees. A gate runs
+again only when a changed path is one of its inputs; when all of those paths
+are `split` files of the gate, it runs narrowed to just them and its findings
+for the other files are carried over from earlier runs.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .corpus import WorktreeCorpus, input_roots
+from .execute import GateResult, Memo, finding_files, format_result, run_gate
+from .manifest import MANIFEST, ROOT, Gate, load_manifest, select
+from .snapshot import open_snapshot
+from .vfs import served_from
+
+
+def corpus_roots(gates: list[Gate]) -> list[str]:
+    patterns = [MANIFEST.relative_to(ROOT).as_posix()]
+    patterns += [p for g in gates for p in (*g.inputs, *g.implicit_inputs)]
+    return input_roots(patterns)
+
+
+def corpus_for(gates: list[Gate]) -> WorktreeCorpus:
+    """A fresh scan of the gates' inputs, backed by the last snapshot if any."""
+    return WorktreeCorpus(ROOT, corpus_roots(gates), open_snapshot(root=ROOT))
+
+
+def affected(gates: list[Gate], changed: set[str]) -> list[tuple[Gate, set[str] | None]]:
+    """(gate, only) pairs to run; `only` is None for a full run."""
+    todo = []
+    for gate in gates:
+        hits = {rel for rel in changed if gate.covers(rel)}
+        if hits:
+            todo.append((gate, hits if all(gate.per_file(r) for r in hits) else None))
+    return todo
+
+
+# Changing these can change any gate's outcome.
+RUNNER_FILES = ("scripts/quality/gates.yaml", "scripts/quality/run_gates.py", "scripts/quality/gate_runner/")
+
+
+def changed_gates(gates: list[Gate], changed: set[str]) -> list[Gate]:
+    """The gates a change set can affect, in manifest order: those with a
+    changed path among their inputs, or all of them when the manifest or the
+    runner changed."""
+    if any(rel.startswith(RUNNER_FILES) for rel in changed):
+        return list(gates)
+    return [g for g, _ in affected(gates, changed)]
+
+
+@dataclass
+class GateState:
+    """Pass/fail bookkeeping for one gate across full and narrowed runs."""
+    failing: dict[str, list[str]] = field(default_factory=dict)
+    unattributed: bool = False  # last full run failed without naming a file
+
+    def update(self, result: GateResult, only: set[str] | None) -> None:
+        found = finding_files(result.output)
+        if only is None:
+            self.failing = found if not result.ok else {}
+            self.unattributed = not result.ok and not found
+            return
+        for rel in only:
+            self.failing.pop(rel, None)
+        if not result.ok:
+            self.failing.update(found or {rel: [f"rc={result.rc}"] for rel in only})
+
+    @property
+    def ok(self) -> bool:
+        return not self.failing and not self.unattributed
+
+
+class Watcher:
+    def __init__(self, gates: list[Gate], verbose: bool = False,
+                 emit: Callable[[str], None] = print):
+        self.gates = gates
+        self.verbose = verbose
+        self.emit = emit
+        self.corpus = corpus_for(gates)
+        self.memo = Memo()
+        self.state = {g.name: GateState() for g in gates}
+        self.advisory = {g.name for g in gates if g.advisory}
+
+    def run(self, todo: list[tuple[Gate, set[str] | None]]) -> None:
+        start = time.perf_counter()
+        for gate, only in todo:
+            result = run_gate(gate, only, self.memo)
+            self.state.setdefault(gate.name, GateState()).update(result, only)
+            if only is not None:
+                result.name += f" [{len(only)} file(s)]"
+            self.emit(format_result(result, self.verbose))
+        failing = self.failing()
+        state = f"{len(failing)} gate(s) failing" if failing else "all green"
+        self.emit(f"-- {len(todo)} gate(s) in {time.perf_counter() - start:.2f}s, {state}")
+
+    def failing(self) -> list[str]:
+        return [n for n, s in self.state.items() if not s.ok and n not in self.advisory]
+
+    def poll(self) -> bool:
+        """One watch cycle; True when something was re-run."""
+        changed = self.corpus.rescan()
+        if not changed:
+            return False
+        if MANIFEST.relative_to(ROOT).as_posix() in changed:
+            names = [g.name for g in self.gates]
+            self.gates = [g for g in load_manifest() if g.name in names]
+        todo = affected(self.gates, changed)
+        shown = ", ".join(sorted(changed)[:3]) + (" ..." if len(changed) > 3 else "")
+        self.emit(f"-- changed: {shown}")
+        if todo:
+            self.run(todo)
+        return bool(todo)
+
+
+def watch(names: list[str] | None, interval: float = 0.5, verbose: bool = False,
+          emit: Callable[[str], None] = print) -> int:
+    """Initial run of every selected gate, then poll until interrupted.
+
+    Returns 1 while any blocking gate fails, like a full run would.
+    """
+    watcher = Watcher(select(load_manifest(), names), verbose, emit)
+    emit(f"watching {len(watcher.corpus.stats)} files in {len(watcher.corpus.roots)} root(s)")
+    with served_from(watcher.corpus):
+        watcher.run([(g, None) for g in watcher.gates])
+        try:
+            while True:
+                time.sleep(interval)
+                watcher.poll()
+        except KeyboardInterrupt:
+            pass
+    return 1 if watcher.failing() else 0
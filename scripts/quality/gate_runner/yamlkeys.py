@@ -0,0 +1,190 @@
+"""Line-indexed key table of a YAML mapping file, for the translation gates.
+
+PyYAML keeps the last of two equal keys and forgets the line numbers, so
+the gates that care about the source layout (duplicate parents, overridden
+leaves, top-level keys out of place) used to walk the indentation
+themselves. scan() does that walk once per file and returns one Entry per
+mapping key:
+
+    path     dotted key path (`risk.form.title`)
+    line     1-based line of the key
+    end      last line of its span (children, block / multi-line scalar)
+    depth    nesting level, 0 for top-level keys
+    parent   the key opens a nested mapping (no scalar on its line)
+    nth      0 for the first key with this path, 1 for the second, ...
+
+Lines inside a block scalar (`|`, `>`), the continuation of a multi-line
+scalar and sequence items are part of the key above them, never keys. A
+one-line flow mapping (`key: { label: X, desc: Y }`) makes `key` a parent
+whose children share its line.
+
+table() maps scan() over files through gate_runner.facts, so a file is
+only rescanned when its content changes; duplicates(), top_level() and
+leaves() are the queries the gates run on the table.
+"""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from .facts import map_files
+
+_KEY = re.compile(
+    r"""(?P<indent>[ ]*)
+        (?:'(?P<sq>(?:[^']|'')*)'|"(?P<dq>(?:[^"\\]|\\.)*)"|(?P<plain>[^\s#'"\-?:&*!|>%@`{\[](?:[^:\n]|:(?=\S))*?))
+        [ \t]*:(?:[ \t]+(?P<value>.*?))?[ \t]*$""",
+    re.VERBOSE,
+)
+_COMMENT = re.compile(r"(?:^|[ \t])#.*$")
+_FLOW_KEY = re.compile(r"""\s*(?:'((?:[^']|'')*)'|"((?:[^"\\]|\\.)*)"|([^\s'"{}\[\],:][^{}\[\],:]*?))\s*:(?:\s+|$)""")
+
+
+class Entry(NamedTuple):
+    path: str
+    line: int
+    end: int
+    depth: int
+    parent: bool
+    nth: int
+    value: str = ""
+
+
+def _key(m: re.Match) -> str:
+    if m.group("sq") is not None:
+        return m.group("sq").replace("''", "'")
+    if m.group("dq") is not None:
+        return m.group("dq").replace('\\"', '"')
+    return m.group("plain").rstrip()
+
+
+def _value(raw: str | None) -> str:
+    if not raw:
+        return ""
+    if raw[0] in "'\"":
+        return raw  # a ` #` inside quotes is text
+    return _COMMENT.sub("", raw).strip()
+
+
+def _split_flow(body: str) -> list[str]:
+    """Top-level comma-separated items of a flow collection's body."""
+    items, depth, quote, start = [], 0, "", 0
+    for i, ch in enumerate(body):
+        if quote:
+            if ch == quote:
+                quote = ""
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            items.append(body[start:i])
+            start = i + 1
+    items.append(body[start:])
+    return [item.strip() for item in items if item.strip()]
+
+
+def _flow(value: str) -> list[tuple[str, str]] | None:
+    """[(key, value)] of a one-line flow mapping, None if `value` is not one."""
+    if not (value.startswith("{") and value.endswith("}")):
+        return None
+    pairs = []
+    for item in _split_flow(value[1:-1]):
+        m = _FLOW_KEY.match(item)
+        if m is None:
+            return None
+        sq, dq, plain = m.groups()
+        key = sq.replace("''", "'") if sq is not None else dq if dq is not None else plain.rstrip()
+        pairs.append((key, item[m.end():].strip()))
+    return pairs
+
+
+def scan(text: str) -> tuple[Entry, ...]:
+    """The key table of one YAML file (see the module docstring)."""
+    rows: list[list] = []  # [path, line, end, depth, parent, nth, value]
+    stack: list[tuple[int, int]] = []  # (indent, row index) of the open parents
+    seen: dict[str, int] = {}
+    scalar_indent = -1  # lines deeper than this continue the last leaf
+    last = 0
+    for number, raw in enumerate(text.splitlines(), 1):
+        stripped = raw.lstrip(" ")
+        if not stripped.strip() or stripped.startswith("#"):
+            continue
+        indent = len(raw) - len(stripped)
+        if scalar_indent >= 0 and indent > scalar_indent:
+            rows[-1][2] = number
+            last = number
+            continue
+        scalar_indent = -1
+        m = _KEY.match(raw) if not stripped.startswith(("- ", "-\t")) and stripped != "-" else None
+        if m is None:  # sequence item, document marker, stray text: belongs to what is open
+            if rows:
+                rows[-1][2] = number
+            last = number
+            continue
+        while stack and stack[-1][0] >= indent:
+            rows[stack.pop()[1]][2] = last
+        key = _key(m)
+        path = ".".join([rows[i][0] for _, i in stack[-1:]] + [key])
+        value = _value(m.group("value"))
+        nth = seen.get(path, -1) + 1
+        seen[path] = nth
+        parent = not value or (value[0] in "&!" and " " not in value)  # `key: &anchor`
+        flow = None if parent else _flow(value)
+        rows.append([path, number, number, len(stack), parent or flow is not None, nth, value])
+        if flow is not None:
+            _add_flow(rows, seen, path, flow, number, len(stack) + 1)
+            scalar_indent = indent
+        elif parent:
+            stack.append((indent, len(rows) - 1))
+        else:
+            scalar_indent = indent
+        last = number
+    for _, i in stack:
+        rows[i][2] = last
+    return tuple(Entry(*row) for row in rows)
+
+
+def _add_flow(rows: list[list], seen: dict[str, int], parent: str, pairs: list[tuple[str, str]],
+              number: int, depth: int) -> None:
+    for key, value in pairs:
+        path = f"{parent}.{key}"
+        nth = seen.get(path, -1) + 1
+        seen[path] = nth
+        nested = _flow(value)
+        rows.append([path, number, number, depth, nested is not None, nth, value])
+        if nested is not None:
+            _add_flow(rows, seen, path, nested, number, depth + 1)
+
+
+def table(paths: Iterable[Path]) -> dict[Path, tuple[Entry, ...]]:
+    """{path: scan() of it}, rescanning only files whose content changed."""
+    return map_files(scan, paths)
+
+
+def duplicates(entries: Iterable[Entry], parents_only: bool = False) -> dict[str, list[Entry]]:
+    """{path: every Entry of it} for the paths defined more than once (the
+    last one wins when the file is loaded). parents_only keeps the paths of
+    which at least one occurrence opens a mapping."""
+    found: dict[str, list[Entry]] = {}
+    for entry in entries:
+        if entry.nth:
+            found.setdefault(entry.path, [])
+    if not found:
+        return {}
+    for entry in entries:
+        if entry.path in found:
+            found[entry.path].append(entry)
+    if parents_only:
+        found = {path: occ for path, occ in found.items() if any(e.parent for e in occ)}
+    return found
+
+
+def top_level(entries: Iterable[Entry]) -> list[Entry]:
+    return [e for e in entries if e.depth == 0]
+
+
+def leaves(entries: Iterable[Entry]) -> list[Entry]:
+    return [e for e in entries if not e.parent]
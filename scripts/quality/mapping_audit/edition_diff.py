@@ -0,0 +1,220 @@
+"""Diff two editions of a requirement catalogue via content fingerprints.
+
+An edition is flattened to {requirement_id: {"title", "text"}}. Every requirement
+gets a fingerprint pair: a hash of its normalized title and one of its normalized
+text. Requirements present under the same ID are 'unchanged' or 'changed';
+the leftovers are matched across IDs through hash indexes (exact pair first,
+then text, then title) and reported as 'moved' (renumbered). What still has
+no partner is 'added' / 'removed'. Every step is a dict lookup, so the diff is
+linear in the catalogue size.
+
+diff_editions() is pure. load_edition() reads the on-disk formats under
+fixtures/library (catalogue directories and framework YAMLs); it needs PyYAML
+and imports it lazily so the rest of mapping_audit stays stdlib-only.
+propose_decomposition() turns a diff into suggested entries for the matching
+fixtures/library/decompositions/decomp_<old>_<new>.json.
+"""
+import hashlib
+import json
+import os
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[\W_]+", re.U)
+_LANG_SUFFIX = re.compile(r"-(de|en)$")
+
+
+def normalize(text):
+    """NFKC + casefold + collapse punctuation/whitespace to single spaces."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _digest(text):
+    norm = normalize(text)
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()[:16] if norm else None
+
+
+def fingerprint(req):
+    """(title_hash, text_hash); an empty field hashes to None and never matches."""
+    return _digest(req.get("title")), _digest(req.get("text"))
+
+
+def _match_leftovers(removed, added, old_fp, new_fp):
+    """Pair removed with added IDs through hash indexes, one-to-one, in order."""
+    moved = []
+    for kind, key in (("exact", lambda fp: fp if None not in fp else None),
+                      ("text", lambda fp: fp[1]),
+                      ("title", lambda fp: fp[0])):
+        index = {}
+        for rid in removed:
+            k = key(old_fp[rid])
+            if k is not None:
+                index.setdefault(k, []).append(rid)
+        still_added = []
+        for rid in added:
+            candidates = index.get(key(new_fp[rid]))
+            if candidates:
+                src = candidates.pop(0)
+                moved.append({"from": src, "to": rid, "match": kind,
+                              "changed": not _same(old_fp[src], new_fp[rid])})
+            else:
+                still_added.append(rid)
+        matched = {m["from"] for m in moved}
+        removed = [rid for rid in removed if rid not in matched]
+        added = still_added
+    return moved, removed, added
+
+
+def _same(a, b):
+    """Fingerprints agree; a side without text (title-only inventory) compares by title."""
+    return a[0] == b[0] and (a[1] == b[1] or a[1] is None or b[1] is None)
+
+
+def diff_editions(old, new):
+    """Return {'unchanged','changed','moved','added','removed'} for two editions."""
+    old_fp = {rid: fingerprint(r) for rid, r in old.items()}
+    new_fp = {rid: fingerprint(r) for rid, r in new.items()}
+    unchanged, changed = [], []
+    for rid in new:
+        if rid in old:
+            (unchanged if _same(old_fp[rid], new_fp[rid]) else changed).append(rid)
+    removed = [rid for rid in old if rid not in new]
+    added = [rid for rid in new if rid not in old]
+    moved, removed, added = _match_leftovers(removed, added, old_fp, new_fp)
+    return {"unchanged": unchanged, "changed": changed, "moved": moved,
+            "added": added, "removed": removed}
+
+
+# ----------------------------- decomposition --------------------------------
+
+def decomposition_path(decomp_dir, old_name, new_name):
+    """decomp_<old>_<new>.json, with a trailing -de/-en language tag dropped."""
+    strip = lambda n: _LANG_SUFFIX.sub("", n)
+    return os.path.join(decomp_dir, f"decomp_{strip(old_name)}_{strip(new_name)}.json")
+
+
+def propose_decomposition(diff, existing, new_label):
+    """Suggest decomposition entries the diff implies but `existing` lacks.
+
+    Returns (proposals, stale). Proposals use the decomposition schema
+    (source/target/relationship/rationale) and are meant for human review.
+    Stale entries reference a source ID the diff does not know as old, or a
+    target ID it does not know as new.
+    """
+    pairs = {(e.get("source"), e.get("target")) for e in existing}
+    sources = {e.get("source") for e in existing}
+    targets = {e.get("target") for e in existing}
+    proposals = []
+
+    def add(source, target, relationship, rationale):
+        covered = (source, target) in pairs if source and target else (
+            source in sources if source else target in targets)
+        if not covered:
+            proposals.append({"source": source, "target": target,
+                              "relationship": relationship, "rationale": rationale})
+
+    for rid in diff["unchanged"]:
+        add(rid, rid, "equivalent", "Unchanged: title and text fingerprints match.")
+    for rid in diff["changed"]:
+        add(rid, rid, "related", "Same ID, wording changed — review relationship.")
+    for m in diff["moved"]:
+        if m["match"] == "title":
+            add(m["from"], m["to"], "related",
+                f"Renumbered {m['from']}->{m['to']} (title match, text changed) — review relationship.")
+        else:
+            note = "content equivalent" if not m["changed"] else "title changed, text identical"
+            add(m["from"], m["to"], "equivalent", f"Renumbered {m['from']}->{m['to']}; {note}.")
+    for rid in diff["added"]:
+        add(None, rid, "additive", f"ADDITIVE — new in {new_label}.")
+    for rid in diff["removed"]:
+        add(rid, None, "n/a", f"Withdrawn in {new_label}; no successor found by fingerprint.")
+
+    old_ids = set(diff["unchanged"]) | set(diff["changed"]) | set(diff["removed"])
+    old_ids |= {m["from"] for m in diff["moved"]}
+    new_ids = set(diff["unchanged"]) | set(diff["changed"]) | set(diff["added"])
+    new_ids |= {m["to"] for m in diff["moved"]}
+    stale = [e for e in existing
+             if (e.get("source") and e.get("source") not in old_ids)
+             or (e.get("target") not in (None, "n/a") and e.get("target") not in new_ids)]
+    return proposals, stale
+
+
+# ----------------------------- loaders --------------------------------------
+
+def _criterion_text(entry):
+    """C5 criterion: concatenate basic + additional criterion texts."""
+    parts = []
+    for key in ("basic", "additional_sharpen", "additional_complement"):
+        for sub in entry.get(key) or []:
+            parts.append(str(sub.get("criterion") or ""))
+    return "\n".join(parts)
+
+
+def _from_grundschutz_layer(doc, out):
+    for b in doc.get("bausteine") or []:
+        anf = b.get("anforderungen") or {}
+        items = anf if isinstance(anf, list) else [
+            it for tier in ("basis", "standard", "hoch") for it in anf.get(tier) or []]
+        for it in items:
+            out[str(it["id"])] = {"title": it.get("title", ""),
+                                  "text": it.get("requirement_text") or it.get("text") or ""}
+
+
+def _lenient_loader():
+    """SafeLoader that lets a later anchor redefine an earlier one.
+
+    The upstream C5:2026 YAML reuses anchor names within one file (OPS.yml);
+    YAML 1.2 permits that, PyYAML's composer does not.
+    """
+    import yaml
+
+    class LenientLoader(yaml.SafeLoader):
+        def compose_node(self, parent, index):
+            event = self.peek_event()
+            if not isinstance(event, yaml.AliasEvent) and getattr(event, "anchor", None):
+                self.anchors.pop(event.anchor, None)
+            return super().compose_node(parent, index)
+
+    return LenientLoader
+
+
+def load_edition(path):
+    """Flatten a catalogue directory or framework YAML to {id: {title, text}}."""
+    import yaml
+
+    out = {}
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as fh:
+            doc = yaml.safe_load(fh) or {}
+        for req in doc.get("requirements") or []:
+            rid = req.get("controlId") or req.get("id")
+            out[str(rid)] = {"title": req.get("title", ""),
+                             "text": req.get("description") or req.get("text") or ""}
+        _from_grundschutz_layer(doc, out)
+        return out
+
+    for fn in sorted(os.listdir(path)):
+        if not fn.endswith(".json"):
+            continue
+        # inventory.json {id: {area, title}} or a flat {id: title} list (CSF 2.0)
+        with open(os.path.join(path, fn), encoding="utf-8") as fh:
+            data = json.load(fh)
+        for rid, val in (data.items() if isinstance(data, dict) else []):
+            title = val.get("title", "") if isinstance(val, dict) else str(val)
+            out[rid] = {"title": title, "text": ""}
+    for fn in sorted(os.listdir(path)):
+        if not fn.endswith((".yml", ".yaml")):
+            continue
+        with open(os.path.join(path, fn), encoding="utf-8") as fh:
+            doc = yaml.load(fh, Loader=_lenient_loader())
+        if isinstance(doc, list):  # C5 domain file: '01' in AM.yml -> AM-01
+            prefix = os.path.splitext(fn)[0]
+            for entry in doc:
+                # GC.yml carries full ids + a single 'condition' text instead
+                rid = entry.get("id") or f"{prefix}-{entry['identifier']}"
+                out[rid] = {"title": entry.get("name", ""),
+                            "text": entry.get("condition") or _criterion_text(entry)}
+        elif isinstance(doc, dict):
+            _from_grundschutz_layer(doc, out)
+    return out
@@ -0,0 +1,101 @@
+"""Content-addressed input manifest for the EU mapping audit. Stdlib only.
+
+Every dossier the CLI writes is recorded with the sha256 of each input file
+(mapping CSVs, catalog manifest, library YAML, workbooks), the CLI parameters
+that shaped it and the version of the code that produced it. A rerun rebuilds
+a dossier only when one of those changed or an output file is gone, so the
+audit is cheap enough to run on every commit.
+
+Digests are keyed by (size, mtime_ns) so unchanged files are not re-read; a
+fresh CI checkout (new mtimes) simply re-hashes, which is still cheap.
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".input_manifest.json"
+_SCHEMA = 1
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_version(paths):
+    """One digest over the producing source files (order-insensitive)."""
+    h = hashlib.sha256()
+    for path in sorted(paths):
+        h.update(os.path.basename(path).encode("utf-8"))
+        h.update(file_digest(path).encode("ascii"))
+    return h.hexdigest()[:16]
+
+
+class InputManifest:
+    """Per-output record of input hashes; `fresh()` decides, `record()` stores."""
+
+    def __init__(self, path, version, force=False):
+        self.path = path
+        self.version = version
+        self.force = force
+        self.hits = 0
+        self.built = 0
+        self._entries = {}
+        self._stat_cache = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("schema") == _SCHEMA:
+                self._entries = data.get("entries", {})
+                self._stat_cache = data.get("stat_cache", {})
+
+    def _digest(self, path):
+        """sha256 of an input, or None when the file does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = [st.st_size, st.st_mtime_ns]
+        cached = self._stat_cache.get(path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        digest = file_digest(path)
+        self._stat_cache[path] = stamp + [digest]
+        return digest
+
+    def _fingerprint(self, inputs, params):
+        return {
+            "code_version": self.version,
+            "params": [str(p) for p in params],
+            "inputs": {p: self._digest(p) for p in inputs},
+        }
+
+    def fresh(self, outputs, inputs, params=()):
+        """True (and counted as a cache hit) when outputs[0] is up to date."""
+        if self.force:
+            return False
+        entry = self._entries.get(outputs[0])
+        if entry is None or not all(os.path.exists(o) for o in outputs):
+            return False
+        if entry != {**self._fingerprint(inputs, params), "outputs": list(outputs)}:
+            return False
+        self.hits += 1
+        return True
+
+    def record(self, outputs, inputs, params=()):
+        self._entries[outputs[0]] = {**self._fingerprint(inputs, params), "outputs": list(outputs)}
+        self.built += 1
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"schema": _SCHEMA, "entries": self._entries,
+                       "stat_cache": self._stat_cache}, fh, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
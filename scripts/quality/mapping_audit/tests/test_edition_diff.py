@@ -0,0 +1,69 @@
+from scripts.quality.mapping_audit import edition_diff as ed
+
+
+OLD = {
+    "OIS-01": {"title": "ISMS", "text": "An ISMS is operated."},
+    "BC-01": {"title": "Applicable law", "text": "Jurisdiction is disclosed."},
+    "BC-02": {"title": "Availability", "text": "Old availability text."},
+    "IDM-09": {"title": "Emergency users", "text": "Gone in the new edition."},
+}
+NEW = {
+    "OIS-01": {"title": "ISMS ", "text": "An  ISMS is operated!"},  # whitespace/punct only
+    "GC-01": {"title": "Applicable law", "text": "Jurisdiction is disclosed."},
+    "GC-02": {"title": "Availability", "text": "Reworded availability text."},
+    "OIS-05": {"title": "Threat intelligence", "text": "New criterion."},
+}
+
+
+def test_normalize_ignores_case_punctuation_and_spacing():
+    assert ed.normalize("  Informations-Sicherheit:  ISMS ") == "informations sicherheit isms"
+
+
+def test_diff_classifies_unchanged_moved_added_removed():
+    d = ed.diff_editions(OLD, NEW)
+    assert d["unchanged"] == ["OIS-01"]
+    assert d["changed"] == []
+    moved = {(m["from"], m["to"]): m for m in d["moved"]}
+    assert moved[("BC-01", "GC-01")]["match"] == "exact"
+    assert moved[("BC-02", "GC-02")]["match"] == "title"
+    assert moved[("BC-02", "GC-02")]["changed"] is True
+    assert d["added"] == ["OIS-05"]
+    assert d["removed"] == ["IDM-09"]
+
+
+def test_title_only_inventory_compares_by_title():
+    d = ed.diff_editions({"A-1": {"title": "X", "text": ""}}, {"A-1": {"title": "x", "text": "body"}})
+    assert d["unchanged"] == ["A-1"]
+
+
+def test_proposals_skip_covered_entries_and_flag_stale():
+    d = ed.diff_editions(OLD, NEW)
+    existing = [
+        {"source": "BC-01", "target": "GC-01", "relationship": "equivalent", "rationale": "x"},
+        {"source": None, "target": "OIS-05", "relationship": "additive", "rationale": "x"},
+        {"source": "SP-99", "target": "SP-99", "relationship": "equivalent", "rationale": "x"},
+    ]
+    proposals, stale = ed.propose_decomposition(d, existing, "bsi-c5-2026-en")
+    keyed = {(p["source"], p["target"]): p for p in proposals}
+    assert ("BC-01", "GC-01") not in keyed and (None, "OIS-05") not in keyed
+    assert keyed[("OIS-01", "OIS-01")]["relationship"] == "equivalent"
+    assert keyed[("BC-02", "GC-02")]["relationship"] == "related"
+    assert keyed[("IDM-09", None)]["relationship"] == "n/a"
+    assert stale == [existing[2]]
+
+
+def test_decomposition_path_drops_language_suffix(tmp_path):
+    path = ed.decomposition_path(str(tmp_path), "bsi-c5-2020-de", "bsi-c5-2026-en")
+    assert path.endswith("decomp_bsi-c5-2020_bsi-c5-2026.json")
+
+
+def test_load_edition_reads_c5_domain_files_with_reused_anchors(tmp_path):
+    (tmp_path / "OPS.yml").write_text(
+        "-\n  identifier: &ID_X '01'\n  name: 'Patch'\n  basic:\n    -\n      criterion: 'a'\n"
+        "-\n  identifier: &ID_X '02'\n  name: 'Patch again'\n  basic:\n    -\n      criterion: 'b'\n",
+        encoding="utf-8")
+    (tmp_path / "GC.yml").write_text("-\n  id: 'GC-01'\n  name: 'Law'\n  condition: 'c'\n", encoding="utf-8")
+    ed_ = ed.load_edition(str(tmp_path))
+    assert ed_["OPS-01"] == {"title": "Patch", "text": "a"}
+    assert ed_["OPS-02"]["title"] == "Patch again"
+    assert ed_["GC-01"] == {"title": "Law", "text": "c"}
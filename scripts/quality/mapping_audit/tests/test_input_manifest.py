@@ -0,0 +1,51 @@
+from scripts.quality.mapping_audit import input_manifest as im
+
+
+def test_fresh_only_after_record_and_until_an_input_changes(tmp_path):
+    src = tmp_path / "nis2_iso27001_v1.csv"
+    src.write_text("a,b\n1,2\n", encoding="utf-8")
+    out = tmp_path / "nis2_dossier.json"
+    out.write_text("{}", encoding="utf-8")
+    path = str(tmp_path / im.MANIFEST_NAME)
+
+    m = im.InputManifest(path, "v1")
+    assert not m.fresh([str(out)], [str(src)])
+    m.record([str(out)], [str(src)])
+    m.save()
+
+    again = im.InputManifest(path, "v1")
+    assert again.fresh([str(out)], [str(src)])
+    assert again.hits == 1
+
+    src.write_text("a,b\n1,3\n", encoding="utf-8")
+    assert not im.InputManifest(path, "v1").fresh([str(out)], [str(src)])
+
+
+def test_code_version_params_missing_output_and_force_invalidate(tmp_path):
+    src = tmp_path / "in.yaml"
+    src.write_text("x", encoding="utf-8")
+    out = tmp_path / "out.json"
+    out.write_text("{}", encoding="utf-8")
+    path = str(tmp_path / im.MANIFEST_NAME)
+    m = im.InputManifest(path, "v1")
+    m.record([str(out)], [str(src)], ["Informationssicherheit"])
+    m.save()
+
+    assert not im.InputManifest(path, "v2").fresh([str(out)], [str(src)], ["Informationssicherheit"])
+    assert not im.InputManifest(path, "v1").fresh([str(out)], [str(src)], ["Information Security"])
+    assert not im.InputManifest(path, "v1", force=True).fresh([str(out)], [str(src)], ["Informationssicherheit"])
+    out.unlink()
+    assert not im.InputManifest(path, "v1").fresh([str(out)], [str(src)], ["Informationssicherheit"])
+
+
+def test_missing_input_is_part_of_the_fingerprint(tmp_path):
+    out = tmp_path / "out.json"
+    out.write_text("{}", encoding="utf-8")
+    later = tmp_path / "kritis_nis2_v1.csv"
+    path = str(tmp_path / im.MANIFEST_NAME)
+    m = im.InputManifest(path, "v1")
+    m.record([str(out)], [str(later)])
+    m.save()
+    assert im.InputManifest(path, "v1").fresh([str(out)], [str(later)])
+    later.write_text("a\n", encoding="utf-8")
+    assert not im.InputManifest(path, "v1").fresh([str(out)], [str(later)])
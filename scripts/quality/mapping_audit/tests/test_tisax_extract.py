@@ -57,3 +57,66 @@ def test_build_records_uses_located_columns():
     # build_records returns raw labels; normalization is a downstream concern
     assert ("ISO 27001:2022", "A.5.1") in rec["references"]
     assert rec["evidence"] == ["Richtlinie", "Intranet"]
+
+
+def _write_xlsx(path, sheets, shared):
+    """Minimal OOXML zip: `sheets` maps sheet name -> rows of {col: shared-index}."""
+    import zipfile
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("xl/sharedStrings.xml", "<sst>" + "".join(
+            f"<si><t>{s}</t></si>" for s in shared) + "</sst>")
+        z.writestr("xl/workbook.xml", "<workbook><sheets>" + "".join(
+            f'<sheet name="{nm}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, nm in enumerate(sheets, 1)) + "</sheets></workbook>")
+        z.writestr("xl/_rels/workbook.xml.rels", "<Relationships>" + "".join(
+            f'<Relationship Id="rId{i}" Type="ws" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(sheets) + 1)) + "</Relationships>")
+        for i, rows in enumerate(sheets.values(), 1):
+            z.writestr(f"xl/worksheets/sheet{i}.xml", "<worksheet><sheetData>" + "".join(
+                f'<row r="{n}">' + "".join(
+                    f'<c r="{col}{n}" t="s"><v>{idx}</v></c>' for col, idx in row.items())
+                + "</row>" for n, row in enumerate(rows, 1)) + "</sheetData></worksheet>")
+
+
+def test_extract_batch_shares_strings_and_merges_editions(tmp_path):
+    shared = ["Verweisung auf andere Normen", "1.1.1", "ISO 27001:2022: A.5.1", "1.2.1"]
+    header = {"K": 0}
+    de = tmp_path / "ISA6_DE_6.0.2.xlsx"
+    new = tmp_path / "ISA_DE_7.0.xlsx"
+    _write_xlsx(str(de), {"Informationssicherheit": [header, {"B": 1, "K": 2}],
+                          "Prototypenschutz": [header, {"B": 3, "K": 2}]}, shared)
+    _write_xlsx(str(new), {"Informationssicherheit": [header, {"B": 1, "K": 2}]}, shared)
+
+    results, missing = tx.extract_batch(
+        [str(de), str(new)], ["Informationssicherheit", "Prototypenschutz"], workers=1)
+    assert missing == [(str(new), "Prototypenschutz")]
+    assert results[(str(de), "Prototypenschutz")][0]["criterion"] == "1.2.1"
+
+    rows = {r["source_requirement_id"]: r for r in tx.merge_candidates(results)}
+    assert len(rows) == 2  # 1.1.1 seen in both workbooks collapses into one row
+    assert rows["1.1.1"]["catalogs"] == ["vda_isa_6.0.2_de_workbook", "vda_isa_7.0_de_workbook"]
+    assert rows["1.2.1"]["catalogs"] == ["vda_isa_6.0.2_de_prototypenschutz_workbook"]
+    assert rows["1.1.1"]["target_framework"] == "ISO27001"
+
+
+def test_catalog_label_keeps_language_and_sheet():
+    assert tx.catalog_label("/x/ISA6_DE_6.0.2.xlsx") == "vda_isa_6.0.2_de_workbook"
+    assert tx.catalog_label("/x/ISA6_EN_6.0.2.xlsx") == "vda_isa_6.0.2_en_workbook"
+    assert tx.catalog_label("/x/ISA6_DE_6.0.2.xlsx", "Informationssicherheit") == "vda_isa_6.0.2_de_workbook"
+    assert tx.catalog_label("/x/ISA6_DE_6.0.2.xlsx", "Datenschutz") == "vda_isa_6.0.2_de_datenschutz_workbook"
+    assert tx.catalog_label("/x/isa-draft.xlsx") == "vda_isa_isa-draft_workbook"
+
+
+def test_merge_candidates_keeps_same_version_workbooks_apart(tmp_path):
+    shared = ["Verweisung auf andere Normen", "1.1.1", "ISO 27001:2022: A.5.1"]
+    header = {"K": 0}
+    de = tmp_path / "ISA6_DE_6.0.2.xlsx"
+    en = tmp_path / "ISA6_EN_6.0.2.xlsx"
+    _write_xlsx(str(de), {"Informationssicherheit": [header, {"B": 1, "K": 2}]}, shared)
+    _write_xlsx(str(en), {"Information Security": [header, {"B": 1, "K": 2}]}, shared)
+
+    results, _ = tx.extract_batch([str(de), str(en)], ["Informationssicherheit", "Information Security"],
+                                  workers=1)
+    rows = tx.merge_candidates(results)
+    assert len(rows) == 1
+    assert rows[0]["catalogs"] == ["vda_isa_6.0.2_de_workbook", "vda_isa_6.0.2_en_workbook"]
@@ -2,7 +2,8 @@
 
 The xlsx reader (added in a later task) uses zipfile + xml only (no openpyxl)
 because the workbook is a standard OOXML zip. Pure functions below are
-unit-tested with string fixtures.
+unit-tested with string fixtures. extract_batch() handles several workbooks x
+sheets in one run (one zip open + one sharedStrings parse per workbook).
 """
 import re
 
@@ -59,7 +60,9 @@ def parse_evidence(cell):
     return [p.strip() for p in parts if p.strip()]
 
 
+import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 
 _CRIT_RX = re.compile(r"^\d+(\.\d+)+$")  # e.g. 1.1.1
 
@@ -109,26 +112,33 @@ def _col_letter(cell_ref):
     return re.match(r"([A-Z]+)", cell_ref).group(1)
 
 
-def read_sheet_grid(xlsx_path, sheet_name):
-    """Return list of {col_letter: value} dicts for every row of a sheet.
-    Stdlib-only OOXML reader."""
-    z = zipfile.ZipFile(xlsx_path)
+def _read_shared_strings(z):
+    """Parse xl/sharedStrings.xml once per workbook into an index -> text list."""
     shared = []
     if "xl/sharedStrings.xml" in z.namelist():
         ss = z.read("xl/sharedStrings.xml").decode("utf-8", "ignore")
         # each <si> may hold multiple <t> runs -> concatenate per <si>
         for si in re.findall(r"<si>(.*?)</si>", ss, re.S):
             shared.append("".join(re.findall(r"<t[^>]*>(.*?)</t>", si, re.S)))
+    return shared
+
+
+def _sheet_targets(z):
+    """Map sheet name -> zip member path (e.g. 'xl/worksheets/sheet1.xml')."""
     wb = z.read("xl/workbook.xml").decode("utf-8", "ignore")
     rels = dict(re.findall(r'<Relationship Id="(rId\d+)"[^>]*Target="([^"]+)"',
                            z.read("xl/_rels/workbook.xml.rels").decode("utf-8", "ignore")))
-    target = None
-    for nm, rid in re.findall(r'<sheet [^>]*name="([^"]+)"[^>]*r:id="(rId\d+)"', wb):
-        if nm == sheet_name:
-            target = rels[rid]
-    if target is None:
-        raise ValueError(f"sheet {sheet_name!r} not found")
-    data = z.read("xl/" + target).decode("utf-8", "ignore")
+    return {nm: "xl/" + rels[rid]
+            for nm, rid in re.findall(r'<sheet [^>]*name="([^"]+)"[^>]*r:id="(rId\d+)"', wb)
+            if rid in rels}
+
+
+def parse_sheet_xml(data, shared):
+    """Turn one worksheet XML string into a list of {col_letter: value} rows.
+
+    `shared` is the workbook's shared-strings table; it is read-only here so a
+    single parsed table can serve every sheet of the workbook.
+    """
     grid = []
     for row_xml in re.findall(r"<row[^>]*>(.*?)</row>", data, re.S):
         row = {}
@@ -160,6 +170,16 @@ def read_sheet_grid(xlsx_path, sheet_name):
     return grid
 
 
+def read_sheet_grid(xlsx_path, sheet_name):
+    """Return list of {col_letter: value} dicts for every row of a sheet.
+    Stdlib-only OOXML reader."""
+    with zipfile.ZipFile(xlsx_path) as z:
+        target = _sheet_targets(z).get(sheet_name)
+        if target is None:
+            raise ValueError(f"sheet {sheet_name!r} not found")
+        return parse_sheet_xml(z.read(target).decode("utf-8", "ignore"), _read_shared_strings(z))
+
+
 def _prev_col(letter):
     """Return the column letter immediately to the left (e.g. P -> O, AA -> Z)."""
     if not letter:
@@ -197,10 +217,126 @@ def _anchor_cols_to_data(cols, data_grid):
     return anchored
 
 
-def extract_workbook(xlsx_path, sheet_name="Informationssicherheit"):
-    """High-level: grid -> located columns -> records."""
-    grid = read_sheet_grid(xlsx_path, sheet_name)
+def records_from_grid(grid):
+    """Located columns -> anchored columns -> records for one sheet grid."""
     header_grid = grid[:8]   # VDA-ISA header band
     cols = locate_columns(header_grid)
     cols = _anchor_cols_to_data(cols, grid)
     return build_records(grid, cols)
+
+
+def extract_workbook(xlsx_path, sheet_name="Informationssicherheit"):
+    """High-level: grid -> located columns -> records."""
+    return records_from_grid(read_sheet_grid(xlsx_path, sheet_name))
+
+
+# ----------------------------- batch extraction ------------------------------
+# Several workbooks (DE/EN, ISA 6.0.x vs. a newer catalogue) x several sheets in
+# one run. Each zip is opened once; its sharedStrings table is parsed once and
+# handed to every sheet of that workbook. Sheet parsing is the expensive part,
+# so it fans out over worker processes; the shared tables reach each worker once
+# through the pool initializer instead of being pickled with every task.
+
+_WORKER_SHARED = {}
+
+
+def _init_worker(shared_by_workbook):
+    _WORKER_SHARED.clear()
+    _WORKER_SHARED.update(shared_by_workbook)
+
+
+def _extract_sheet_task(task):
+    xlsx_path, sheet_name, data = task
+    return xlsx_path, sheet_name, records_from_grid(parse_sheet_xml(data, _WORKER_SHARED[xlsx_path]))
+
+
+# The main ISA sheet of the DE / EN workbook; other sheets label as their own catalogue.
+MAIN_SHEETS = ("Informationssicherheit", "Information Security")
+
+
+def _slug(text):
+    return re.sub(r"[^0-9a-z]+", "_", text.lower()).strip("_")
+
+
+def catalog_label(xlsx_path, sheet_name=None):
+    """'ISA6_DE_6.0.2.xlsx' -> 'vda_isa_6.0.2_de_workbook' (falls back to the file stem).
+
+    Every stem token besides the ISA prefix and the version stays in the label,
+    so the DE and EN workbook of one version are two catalogues. A sheet other
+    than the main one (MAIN_SHEETS) is a catalogue of its own too
+    ('..._6.0.2_de_prototypenschutz_workbook').
+    """
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    m = re.search(r"(\d+(?:\.\d+)+)", stem)
+    if m:
+        rest = [t for t in re.split(r"[\s_\-]+", stem.replace(m.group(1), " "))
+                if t and not re.fullmatch(r"isa\d*", t, re.I)]
+        label = "_".join([m.group(1)] + [_slug(t) for t in rest])
+    else:
+        label = stem.lower()
+    if sheet_name and sheet_name not in MAIN_SHEETS:
+        label += "_" + _slug(sheet_name)
+    return f"vda_isa_{label}_workbook"
+
+
+def extract_batch(xlsx_paths, sheet_names=("Informationssicherheit",), workers=None):
+    """Extract records for every (workbook, sheet) pair.
+
+    Returns (results, missing): results maps (xlsx_path, sheet_name) -> records in
+    input order; missing lists the (xlsx_path, sheet_name) pairs the workbook does
+    not contain (DE and EN workbooks name their sheets differently, so asking for
+    both sheet names across both workbooks is the normal case, not an error).
+    """
+    tasks, missing, shared_by_workbook = [], [], {}
+    for path in dict.fromkeys(xlsx_paths):
+        with zipfile.ZipFile(path) as z:
+            shared_by_workbook[path] = _read_shared_strings(z)
+            targets = _sheet_targets(z)
+            for sheet in dict.fromkeys(sheet_names):
+                if sheet not in targets:
+                    missing.append((path, sheet))
+                    continue
+                tasks.append((path, sheet, z.read(targets[sheet]).decode("utf-8", "ignore")))
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        _init_worker(shared_by_workbook)
+        done = [_extract_sheet_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared_by_workbook,)) as pool:
+            done = list(pool.map(_extract_sheet_task, tasks))
+    return {(path, sheet): recs for path, sheet, recs in done}, missing
+
+
+def merge_candidates(results):
+    """Flatten batch results into deduplicated candidate rows.
+
+    One row per (criterion, framework code, clause). The same anchor seen in
+    several sheets or workbooks collapses into one row whose `catalogs` list
+    names every catalogue carrying it (catalog_label(), input order), so an
+    edition comparison is a filter on that list. Evidence comes from the
+    first hit. (audit_eu_mappings.write_tisax_candidate joins `catalogs`
+    into the CSV's '|'-separated source_catalog column.)
+    """
+    merged = {}
+    for (path, sheet), recs in results.items():
+        label = catalog_label(path, sheet)
+        for rec in recs:
+            for std_label, clause in rec["references"]:
+                code = normalize_standard(std_label)
+                if code is None:
+                    continue
+                key = (rec["criterion"], code, clause)
+                row = merged.get(key)
+                if row is None:
+                    merged[key] = row = {
+                        "source_requirement_id": rec["criterion"],
+                        "target_framework": code,
+                        "target_requirement_id": clause,
+                        "catalogs": [],
+                        "evidence_hint": " | ".join(rec["evidence"]),
+                    }
+                if label not in row["catalogs"]:
+                    row["catalogs"].append(label)
+    return list(merged.values())
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Run the repo quality gates (scripts/quality/check_*.py) from one process.
+
+The gate list, CI arguments and declared inputs live in
+scripts/quality/gates.yaml. Gates run in-process against a shared in-memory
+corpus, so files read by several gates are read from disk once.
+
+Usage:
+    python3 scripts/quality/run_gates.py                 # all gates, like CI
+    python3 scripts/quality/run_gates.py --gates twig_macro_scope,form_render_completeness
+    python3 scripts/quality/run_gates.py --jobs 4        # spread over 4 processes
+    python3 scripts/quality/run_gates.py --watch         # re-run affected gates on save
+    python3 scripts/quality/run_gates.py --serve         # socket server for gate_client.py
+    python3 scripts/quality/run_gates.py --shard 2/4     # this machine's quarter of the work
+    python3 scripts/quality/run_gates.py --merge var/cache/quality/shard-*-of-4.json
+    python3 scripts/quality/run_gates.py --staged        # what is staged, not the worktree
+    python3 scripts/quality/run_gates.py --rev origin/main --rev HEAD
+    python3 scripts/quality/run_gates.py --since origin/main  # only gates the diff can affect
+    git diff --name-only HEAD~1 | python3 scripts/quality/run_gates.py --changed -
+    python3 scripts/quality/run_gates.py --gates fixture_unread_keys --profile
+    python3 scripts/quality/run_gates.py --regex-bench   # probe every pattern for backtracking
+    python3 scripts/quality/run_gates.py --check-inputs  # gates reading files outside their inputs
+
+Watch mode keeps the corpus warm: it polls the input trees with os.scandir,
+compares (mtime_ns, size) against its stat cache and re-runs only the gates
+whose inputs cover a changed path.
+
+Serve mode keeps the same warm state behind a Unix socket so editors and
+pre-commit hooks can ask for single files or unsaved buffers
+(see gate_runner/daemon.py for the protocol, gate_client.py for a client).
+
+Sharding (see gate_runner/shard.py) partitions gates and per-file buckets of
+split gates over N machines, longest first, using the timings recorded by
+earlier runs in var/cache/quality/gate_timings.json. Every shard must see the
+same tree and timings file (restore it from the CI cache before the shards
+start); the merge step checks that, prints the single-node report and
+records the new timings for the next run. Serial full runs record timings too.
+
+--jobs N schedules by history (see gate_runner/schedule.py): every full run
+appends its gate times to var/cache/quality/gate_history.jsonl, gates start
+longest first, a split gate that would outlast a worker's fair share runs as
+per-directory sub-tasks, and the run ends with its parallel efficiency
+(recorded serial time / (N * wall time)). Gate times measured in a --jobs run
+are contended, so only serial runs feed the timings and the history medians.
+
+Before a --jobs run starts its workers it writes the scanned corpus to
+var/cache/quality/corpus.snap (see gate_runner/snapshot.py). Workers map it
+instead of walking and reading the tree; later runs, --watch and --serve
+read every file whose stat still matches its record from the mapping.
+
+--changed FILE... and --since REV run only the gates whose declared inputs
+(gates.yaml `inputs`, plus the gate script and its baseline files) cover a
+changed path; a change to gates.yaml or the runner selects every gate. The
+selected gates run in full, so their verdict matches a full run. --watch and
+--serve select per change themselves and reject --changed/--since.
+
+--staged and --rev read the gate inputs from the git object store (see
+gate_runner/gitcorpus.py) instead of the worktree; the gate scripts
+themselves always come from the worktree. Several revisions share one blob
+cache and one memo, so blobs common to them are read and parsed once.
+
+Cross-file gates (form_render_completeness, bool_accessor_usage,
+compliance_catalog, macro_arg_arity) map each file to small facts with
+gate_runner/facts.py and join them afterwards; the facts are cached by
+content hash in var/cache/quality/facts/, so any run re-maps only the files
+whose content it has not seen. GATE_JOBS=N maps cold files in N processes.
+
+--profile runs each gate under cProfile plus a stack sampler and prints its
+slowest files (seconds, bytes) and hottest functions; per gate it writes
+<gate>.pstats (python -m pstats) and <gate>.collapsed (flamegraph.pl,
+speedscope) to var/cache/quality/profile/. Profiled runs do not record
+timings: the profiler overhead would skew shard planning. The report also
+lists each gate's slowest regular expressions (calls, time, longest input).
+
+--regex-bench runs every literal pattern of scripts/quality/ against inputs
+built to make it backtrack and flags those whose time grows super-linearly
+with the input (see gate_runner/regexes.py). Exit 1 when any is flagged.
+
+--check-inputs runs the gates against the whole tree and lists every file a
+gate reads that its gates.yaml inputs do not cover (see
+gate_runner/inputs.py): --changed, --since and --watch would miss a change to
+it. Exit 1 when any gate has such a read.
+
+Exit 0 = every blocking gate passed, 1 = at least one failed. Advisory gates
+(continue-on-error in CI) are reported as WARN and never fail the run.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+from scripts.quality.gate_runner.corpus import WorktreeCorpus  # noqa: E402
+from scripts.quality.gate_runner.daemon import serve  # noqa: E402
+from scripts.quality.gate_runner.execute import (  # noqa: E402
+    GateResult, Memo, blocking_failures, format_result, run_gate,
+)
+from scripts.quality.gate_runner.gitcorpus import (  # noqa: E402
+    INDEX, BlobStore, GitCorpus, GitError, changed_since,
+)
+from scripts.quality.gate_runner.inputs import undeclared_reads  # noqa: E402
+from scripts.quality.gate_runner.manifest import ROOT, Gate, load_manifest, select  # noqa: E402
+from scripts.quality.gate_runner.profiling import PROFILE_DIR  # noqa: E402
+from scripts.quality.gate_runner.regexes import bench, collect_sites  # noqa: E402
+from scripts.quality.gate_runner.schedule import (  # noqa: E402
+    History, efficiency, plan_jobs, serial_estimate,
+)
+from scripts.quality.gate_runner.shard import (  # noqa: E402
+    SHARD_DIR, TIMINGS, Timings, combine, merge, parse_shard, plan, plan_digest, write_report,
+)
+from scripts.quality.gate_runner.snapshot import Snapshot, write_snapshot  # noqa: E402
+from scripts.quality.gate_runner.vfs import served_from  # noqa: E402
+from scripts.quality.gate_runner.watch import (  # noqa: E402
+    changed_gates, corpus_for, corpus_roots, watch,
+)
+
+_WORKER_STACK = contextlib.ExitStack()
+
+
+def _init_worker(gates: list[Gate], snapshot: Path | None) -> None:
+    corpus = WorktreeCorpus.from_snapshot(Snapshot(snapshot)) if snapshot else corpus_for(gates)
+    _WORKER_STACK.enter_context(served_from(corpus))
+
+
+def run_all(gates: list[Gate], jobs: int, verbose: bool, timings: Timings,
+            profile_dir: Path | None = None,
+            profile_top: int = 5) -> tuple[list[GateResult], list[GateResult], float | None]:
+    """Run every gate; return (one result per gate, the per-unit results,
+    the serial estimate of a --jobs plan or None)."""
+    run = functools.partial(run_gate, profile_dir=profile_dir, profile_top=profile_top)
+    if jobs <= 1:
+        results = []
+        with served_from(corpus_for(gates)):
+            for gate in gates:
+                results.append(run(gate))
+                print(format_result(results[-1], verbose), flush=True)
+        return results, results, None
+    by_name = {g.name: g for g in gates}
+    corpus = corpus_for(gates)
+    try:
+        snapshot = write_snapshot(corpus)
+    except OSError as exc:
+        print(f"run_gates: no corpus snapshot ({exc}); workers scan the tree", file=sys.stderr)
+        snapshot = None
+    medians = History().medians()
+    units = plan_jobs(gates, corpus, timings, medians, jobs)
+    split = sum(1 for u in units if u.files is not None)
+    print(f"{len(units)} unit(s) on {jobs} workers, longest first"
+          + (f" ({split} per-directory sub-tasks)" if split else ""), flush=True)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(gates, snapshot)) as pool:
+        futures = [(u, pool.submit(run, by_name[u.gate], set(u.files) if u.files is not None else None))
+                   for u in units]
+        done = [(u, f.result()) for u, f in futures]
+    parts: dict[str, list] = {}
+    for unit, result in done:
+        parts.setdefault(unit.gate, []).append((unit.files, result))
+    results = [combine(g, parts[g.name]) if len(parts[g.name]) > 1 else parts[g.name][0][1]
+               for g in gates]
+    for r in results:
+        print(format_result(r, verbose))
+    return results, [r for _, r in done], serial_estimate(gates, timings, medians)
+
+
+def run_revs(gates: list[Gate], revs: list[str | None], verbose: bool) -> list[GateResult]:
+    """Run every gate against each revision (None = the index) in turn."""
+    results = []
+    memo = Memo()
+    with BlobStore(ROOT) as store:
+        for rev in revs:
+            corpus = GitCorpus(ROOT, corpus_roots(gates), rev, store)
+            print(f"== {corpus.label}: {len(corpus.stats)} files", flush=True)
+            with served_from(corpus):
+                for gate in gates:
+                    results.append(run_gate(gate, memo=memo))
+                    if len(revs) > 1:
+                        results[-1].name += f"@{rev or 'index'}"
+                    print(format_result(results[-1], verbose), flush=True)
+    return results
+
+
+def run_shard(gates: list[Gate], index: int, n: int, timings: Timings,
+              out: Path, verbose: bool) -> list[GateResult]:
+    corpus = corpus_for(gates)
+    shards = plan(gates, corpus, timings, n)
+    by_name = {g.name: g for g in gates}
+    mine = shards[index - 1]
+    print(f"shard {index}/{n}: {len(mine)} unit(s), "
+          f"estimated {sum(u.cost for u in mine):.1f}s of {sum(u.cost for s in shards for u in s):.1f}s")
+    done = []
+    with served_from(corpus):
+        for unit in mine:
+            only = set(unit.files) if unit.files is not None else None
+            result = run_gate(by_name[unit.gate], only)
+            done.append((unit, result))
+            label = f"{result.name} [{len(unit.files)} file(s)]" if unit.files else result.name
+            print(format_result(GateResult(label, result.rc, result.output, result.seconds,
+                                           result.advisory), verbose), flush=True)
+    write_report(out, index, n, plan_digest(shards), done)
+    print(f"shard report: {out}")
+    return [r for _, r in done]
+
+
+def _changed_paths(args: list[str], since: str | None) -> set[str]:
+    paths = [line for a in args for line in (sys.stdin.read().splitlines() if a == "-" else [a])]
+    changed = {p.strip().removeprefix("./") for p in paths if p.strip()}
+    return changed | (changed_since(ROOT, since) if since else set())
+
+
+def regex_bench(timeout: float) -> int:
+    start = time.perf_counter()
+    sites = collect_sites()
+    verdicts = bench(sites, timeout, emit=lambda line: print(line, flush=True))
+    flagged = [v for v in verdicts if v.flagged]
+    print(f"\n{len(sites)} pattern(s) probed in {time.perf_counter() - start:.2f}s, "
+          f"{len(flagged)} super-linear")
+    return 1 if flagged else 0
+
+
+def check_inputs(gates: list[Gate]) -> int:
+    missed = undeclared_reads(gates)
+    for name, paths in missed.items():
+        print(f"FAIL {name}: reads {len(paths)} file(s) its inputs do not cover")
+        for rel in paths:
+            print(f"    {rel}")
+    print(f"{len(missed)} of {len(gates)} gate(s) read undeclared inputs")
+    return 1 if missed else 0
+
+
+def summarize(results: list[GateResult], start: float) -> int:
+    failing = blocking_failures(results)
+    print(f"\n{len(results)} gate(s) in {time.perf_counter() - start:.2f}s, "
+          f"{len(failing)} failing" + (": " + ", ".join(r.name for r in failing) if failing else ""))
+    return 1 if failing else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--gates", default="",
+                    help="comma-separated gate names (default: all in gates.yaml)")
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes for a full run")
+    ap.add_argument("--watch", action="store_true", help="re-run affected gates on change")
+    ap.add_argument("--interval", type=float, default=0.5, help="watch poll interval (seconds)")
+    ap.add_argument("--serve", action="store_true", help="answer gate_client.py requests on a socket")
+    ap.add_argument("--socket", type=Path, default=None,
+                    help="socket path for --serve (default: per-user path in the temp dir)")
+    ap.add_argument("--verbose", action="store_true", help="show output of passing gates too")
+    ap.add_argument("--shard", metavar="I/N", help="run only shard I of N (1-based)")
+    ap.add_argument("--shard-out", type=Path, default=None,
+                    help="shard report path (default: var/cache/quality/shard-I-of-N.json)")
+    ap.add_argument("--merge", nargs="+", type=Path, metavar="REPORT",
+                    help="combine shard reports into the single-node report and exit code")
+    ap.add_argument("--timings", type=Path, default=TIMINGS, help="recorded gate/file timings")
+    ap.add_argument("--staged", action="store_true", help="check the staged index instead of the worktree")
+    ap.add_argument("--rev", action="append", default=[], metavar="REV",
+                    help="check a commit/branch/tree (repeatable) instead of the worktree")
+    ap.add_argument("--changed", nargs="+", metavar="FILE",
+                    help="run only gates affected by these repo-relative paths ('-' reads them from stdin)")
+    ap.add_argument("--since", metavar="REV",
+                    help="run only gates affected by the difference between REV and the worktree")
+    ap.add_argument("--profile", nargs="?", type=Path, const=PROFILE_DIR, default=None, metavar="DIR",
+                    help="profile each gate; write .pstats/.collapsed files to DIR "
+                         "(default: var/cache/quality/profile)")
+    ap.add_argument("--profile-top", type=int, default=5, metavar="N",
+                    help="slowest files / functions listed per gate with --profile")
+    ap.add_argument("--regex-bench", action="store_true",
+                    help="probe every regex of the gate scripts for super-linear backtracking")
+    ap.add_argument("--regex-timeout", type=float, default=5.0, metavar="SECONDS",
+                    help="per-pattern limit for --regex-bench; slower counts as catastrophic")
+    ap.add_argument("--check-inputs", action="store_true",
+                    help="list files each gate reads that its gates.yaml inputs do not cover")
+    args = ap.parse_args()
+
+    names = [n.strip() for n in args.gates.split(",") if n.strip()]
+    try:
+        gates = select(load_manifest(), names)
+    except ValueError as exc:
+        print(f"run_gates: {exc}", file=sys.stderr)
+        return 2
+
+    if args.changed is not None or args.since:
+        if args.watch or args.serve:
+            # watch/serve pick the affected gates per change themselves; a
+            # one-off change set would only narrow (or end) them silently
+            print("run_gates: --changed/--since cannot be combined with --watch or --serve",
+                  file=sys.stderr)
+            return 2
+        try:
+            changed = _changed_paths(args.changed or [], args.since)
+        except GitError as exc:
+            print(f"run_gates: {exc}", file=sys.stderr)
+            return 2
+        selected = changed_gates(gates, changed)
+        print(f"{len(changed)} changed file(s): {len(selected)} of {len(gates)} gate(s) affected")
+        if not selected:
+            return 0
+        gates = selected
+
+    if args.regex_bench:
+        return regex_bench(args.regex_timeout)
+    if args.check_inputs:
+        return check_inputs(gates)
+    if args.watch:
+        return watch(names, args.interval, args.verbose)
+    if args.serve:
+        try:
+            return serve(names, args.socket)
+        except RuntimeError as exc:
+            print(f"run_gates: {exc}", file=sys.stderr)
+            return 2
+
+    start = time.perf_counter()
+    timings = Timings.load(args.timings)
+    if args.merge:
+        try:
+            results = merge(args.merge, gates)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"run_gates: cannot merge shard reports: {exc}", file=sys.stderr)
+            return 2
+        for r in results:
+            print(format_result(r, args.verbose))
+        timings.record(results)
+        timings.save(args.timings)
+        return summarize(results, start)
+    if args.staged or args.rev:
+        revs = ([INDEX] if args.staged else []) + args.rev
+        try:
+            results = run_revs(gates, revs, args.verbose)
+        except GitError as exc:
+            print(f"run_gates: {exc}", file=sys.stderr)
+            return 2
+        return summarize(results, start)
+    if args.shard:
+        try:
+            index, n = parse_shard(args.shard)
+        except ValueError as exc:
+            print(f"run_gates: {exc}", file=sys.stderr)
+            return 2
+        out = args.shard_out or SHARD_DIR / f"shard-{index}-of-{n}.json"
+        return summarize(run_shard(gates, index, n, timings, out, args.verbose), start)
+
+    results, parts, serial = run_all(gates, args.jobs, args.verbose, timings, args.profile, args.profile_top)
+    wall = time.perf_counter() - start
+    if args.jobs > 1 and serial is None:
+        print("parallel efficiency unknown: some gates have no serial timing yet (run once without --jobs)")
+    elif args.jobs > 1:
+        print(f"parallel efficiency {efficiency(serial, wall, args.jobs):.0%}: "
+              f"{serial / wall:.1f}x speedup over the recorded serial {serial:.2f}s "
+              f"on {args.jobs} workers in {wall:.2f}s")
+    if args.profile:
+        return summarize(results, start)
+    if args.jobs <= 1:  # times measured under contention would skew later plans
+        timings.record(parts)
+        timings.save(args.timings)
+    History().append(results, wall, args.jobs)
+    return summarize(results, start)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
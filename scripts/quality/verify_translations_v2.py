@@ -9,6 +9,8 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
+from gate_runner.yamlkeys import duplicates, table
+
 
 def load_yaml_file(filepath):
     """Load YAML file and return parsed content"""
@@ -28,23 +30,12 @@ def extract_all_keys(data, prefix=''):
     return keys
 
 
-def check_actual_duplicates(data, path=''):
-    """Check for actual duplicate keys in the same parent"""
-    duplicates = []
-
-    def check_dict(d, current_path):
-        if not isinstance(d, dict):
-            return
-
-        # Check for duplicate keys in this dictionary (shouldn't happen if YAML parses correctly)
-        # But we can check by trying to parse raw YAML
-        for key, value in d.items():
-            new_path = f"{current_path}.{key}" if current_path else key
-            if isinstance(value, dict):
-                check_dict(value, new_path)
-
-    check_dict(data, path)
-    return duplicates
+def check_actual_duplicates(file_path):
+    """Keys defined more than once in the file (the YAML loader silently
+    keeps the last one), from the gate_runner.yamlkeys table"""
+    entries = table([Path(file_path)]).get(Path(file_path), ())
+    return [(path, [e.line for e in occurrences])
+            for path, occurrences in duplicates(entries).items()]
 
 
 def verify_merged_sections(data, section_checks):
@@ -115,11 +106,18 @@ def main():
     print("1. DUPLICATE PARENT KEY DETECTION")
     print("=" * 80)
     print()
-    print("Note: If YAML parses successfully, there are NO duplicate keys at")
-    print("the same level (YAML parser would fail or overwrite duplicates).")
+    print("Note: the YAML parser silently keeps the LAST of two equal keys,")
+    print("so duplicates are found on the raw file, not the parsed data.")
     print()
-    print("✓ No duplicate parent keys in DE file (YAML parsed successfully)")
-    print("✓ No duplicate parent keys in EN file (YAML parsed successfully)")
+    de_duplicates = check_actual_duplicates(de_file)
+    en_duplicates = check_actual_duplicates(en_file)
+    for lang, found in (('DE', de_duplicates), ('EN', en_duplicates)):
+        if not found:
+            print(f"✓ No duplicate keys in {lang} file")
+            continue
+        print(f"✗ {len(found)} duplicate key(s) in {lang} file:")
+        for key, lines in found:
+            print(f"    {key} (lines {', '.join(map(str, lines))})")
     print()
 
     # 2. KEY CONSISTENCY CHECK
@@ -254,6 +252,10 @@ def main():
         if result.get('expected') is not None and result['status'] == '✗':
             total_issues += 1
 
+    if de_duplicates or en_duplicates:
+        print(f"⚠ Duplicate keys: {len(de_duplicates)} in DE, {len(en_duplicates)} in EN")
+        total_issues += 1
+
     # Key consistency issues
     if only_in_de or only_in_en:
         print(f"⚠ Key mismatch: {len(only_in_de)} keys only in DE, {len(only_in_en)} keys only in EN")
@@ -271,7 +273,7 @@ def main():
         print("=" * 80)
         print()
         print("All verification checks passed:")
-        print("  ✓ Zero duplicate parent keys (YAML syntax valid)")
+        print("  ✓ Zero duplicate keys")
         print(f"  ✓ DE and EN have identical key counts ({len(de_keys)} keys each)")
         print(f"  ✓ Key consistency: {consistency_percentage:.2f}%")
         print("  ✓ All critical merged sections verified")
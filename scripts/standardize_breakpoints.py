@@ -3,10 +3,14 @@
 Standardize CSS breakpoints to Bootstrap 5.3 standards
 Issue 12.1 from UI/UX Audit - Consistent breakpoint usage
 
-WARNING: This script modifies CSS files. Review changes carefully before committing.
+WARNING: This script modifies CSS files. Preview with --dry-run (unified diff)
+and review changes carefully before committing.
 """
+import argparse
 import re
-from pathlib import Path
+import sys
+
+from codemod import ROOT, Rule, parse_args, report, run
 
 # Bootstrap 5.3 standard breakpoints
 BREAKPOINT_REPLACEMENTS = {
@@ -22,12 +26,8 @@ BREAKPOINT_REPLACEMENTS = {
     r'min-width:\s*1024px': 'min-width: 992px',  # Should be 992px (or 1200px)
 }
 
-def standardize_breakpoints(file_path):
+def standardize_breakpoints(content, file_path=None):
     """Standardize breakpoints in CSS file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
     modifications = 0
 
     for pattern, replacement in BREAKPOINT_REPLACEMENTS.items():
@@ -36,19 +36,9 @@ def standardize_breakpoints(file_path):
             content = re.sub(pattern, replacement, content)
             modifications += len(matches)
 
-    if content != original_content:
-        # Create backup
-        backup_path = file_path.with_suffix('.css.bak')
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
+    return content, modifications
 
-        # Write standardized version
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        return modifications
-
-    return 0
+RULES = [Rule('bootstrap-breakpoints', 'assets/styles', '*.css', standardize_breakpoints, recursive=False)]
 
 def audit_breakpoints(file_path):
     """Audit breakpoints without modifying"""
@@ -74,16 +64,18 @@ def audit_breakpoints(file_path):
     return issues
 
 def main():
-    import sys
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--audit', action='store_true', help='report non-standard breakpoints, change nothing')
+    args = parse_args(__doc__, ap=ap)
 
-    styles_dir = Path('assets/styles')
+    styles_dir = ROOT / 'assets/styles'
 
-    if '--audit' in sys.argv:
+    if args.audit:
         # Audit mode: report issues without fixing
         print("=== Breakpoint Audit ===\n")
 
         total_issues = 0
-        for css_file in styles_dir.glob('*.css'):
+        for css_file in sorted(styles_dir.glob('*.css')):
             issues = audit_breakpoints(css_file)
             if issues:
                 print(f"\n{css_file.name}:")
@@ -92,35 +84,25 @@ def main():
                     total_issues += 1
 
         print(f"\n\nTotal non-standard breakpoints found: {total_issues}")
-        print("\nRun without --audit flag to fix automatically (creates .bak files)")
+        print("\nRun without --audit flag to fix automatically (--dry-run shows the diff first)")
+        return 0
 
-    else:
-        # Fix mode: apply standardization
-        print("=== Standardizing Breakpoints ===\n")
-        print("⚠️  This will modify CSS files. Backups will be created (.css.bak)\n")
+    # Fix mode: apply standardization
+    print("=== Standardizing Breakpoints ===\n")
+    if not args.dry_run:
+        print("⚠️  This will modify CSS files (preview with --dry-run)\n")
 
         response = input("Continue? (y/n): ")
         if response.lower() != 'y':
             print("Aborted.")
-            return
-
-        total_modifications = 0
-        files_modified = 0
-
-        for css_file in styles_dir.glob('*.css'):
-            modifications = standardize_breakpoints(css_file)
-            if modifications > 0:
-                print(f"✓ {css_file.name}: {modifications} breakpoints standardized")
-                total_modifications += modifications
-                files_modified += 1
-
-        print(f"\n\nTotal: {total_modifications} breakpoints standardized in {files_modified} files")
-        print("\nStandards applied:")
-        print("- max-width: 768px → 767.98px")
-        print("- max-width: 576px → 575.98px")
-        print("- min-width: 769px → 768px")
-        print("\nBackup files created with .bak extension")
-        print("Review changes and delete .bak files when satisfied")
+            return 0
+
+    rc = report(run(RULES, dry_run=args.dry_run, jobs=args.jobs), RULES, dry_run=args.dry_run)
+    print("\nStandards applied:")
+    print("- max-width: 768px → 767.98px")
+    print("- max-width: 576px → 575.98px")
+    print("- min-width: 769px → 768px")
+    return rc
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
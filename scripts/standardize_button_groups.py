@@ -4,14 +4,12 @@ Standardize button groups in table action columns
 Issue 1.2 from UI/UX Audit - Make button groups consistent
 """
 import re
-from pathlib import Path
+import sys
 
-def standardize_button_groups(file_path):
-    """Standardize button group usage in tables"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from codemod import Rule, main as codemod_main
 
-    original_content = content
+def standardize_button_groups(content, file_path=None):
+    """Standardize button group usage in tables"""
     modifications = 0
 
     # Pattern 1: Multiple buttons in table cells without btn-group wrapper
@@ -48,34 +46,13 @@ def standardize_button_groups(file_path):
 
     content = re.sub(pattern_group_no_role, add_role_to_group, content)
 
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return modifications
-
-    return 0
-
-def main():
-    templates_dir = Path('templates')
-    total_modifications = 0
-    files_modified = 0
-
-    # Process all Twig templates
-    for twig_file in templates_dir.rglob('*.twig'):
-        # Skip PDF and component templates that are already standardized
-        if 'pdf' in str(twig_file).lower():
-            continue
-
-        modifications = standardize_button_groups(twig_file)
-        if modifications > 0:
-            print(f"Standardized {twig_file.relative_to(templates_dir)}: {modifications} changes")
-            total_modifications += modifications
-            files_modified += 1
+    return content, modifications
 
-    print(f"\nTotal: {total_modifications} button group fixes in {files_modified} files")
-    print("\nStandards applied:")
-    print("- Added btn-group-sm when containing btn-sm buttons")
-    print("- Added role='group' and aria-label for accessibility")
+RULES = [
+    # Skip PDF and component templates that are already standardized
+    Rule('button-group-sm-role', 'templates', '*.twig', standardize_button_groups,
+         skip=lambda rel: 'pdf' in str(rel).lower()),
+]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
@@ -4,13 +4,12 @@ Standardize card styling classes
 Issue 3.1 from UI/UX Audit - Make card styles consistent
 """
 import re
-from pathlib import Path
+import sys
 
-def standardize_cards(file_path):
-    """Standardize card class usage"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from codemod import Rule, main as codemod_main
 
+def standardize_cards(content, file_path=None):
+    """Standardize card class usage"""
     original_content = content
     modifications = 0
 
@@ -55,35 +54,13 @@ def standardize_cards(file_path):
         # This is complex, skip for now - too many edge cases
         pass
 
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return modifications
-
-    return 0
-
-def main():
-    templates_dir = Path('templates')
-    total_modifications = 0
-    files_modified = 0
-
-    # Process all Twig templates
-    for twig_file in templates_dir.rglob('*.twig'):
-        # Skip PDF and component templates
-        if 'pdf' in str(twig_file).lower() or '_components' in str(twig_file):
-            continue
-
-        modifications = standardize_cards(twig_file)
-        if modifications > 0:
-            print(f"Standardized {twig_file.relative_to(templates_dir)}: {modifications} changes")
-            total_modifications += modifications
-            files_modified += 1
+    return content, modifications
 
-    print(f"\nTotal: {total_modifications} card styling fixes in {files_modified} files")
-    print("\nStandards applied:")
-    print("- Removed redundant 'shadow' class (Bootstrap default has shadow)")
-    print("- Standardized border-left-* to card-border-left-*")
-    print("- Removed inline styles (except login card max-width)")
+RULES = [
+    # Skip PDF and component templates
+    Rule('card-classes', 'templates', '*.twig', standardize_cards,
+         skip=lambda rel: 'pdf' in str(rel).lower() or '_components' in str(rel)),
+]
 
 if __name__ == '__main__':
-    main()
+    sys.exit(codemod_main(RULES, __doc__))
@@ -0,0 +1,30 @@
+from scripts import translation_memory as tm
+
+
+def _memory():
+    return tm.Memory({
+        "dpa": ({"dpa.contract.title": "DPA under Art. 28 GDPR", "form.save_changes": "Save changes"},
+                {"dpa.contract.title": "Auftragsverarbeitungsvertrag gemäß Art. 28 DSGVO",
+                 "form.save_changes": "Änderungen speichern"}),
+    })
+
+
+def test_key_match_needs_two_segments():
+    memory = _memory()
+    assert memory.for_key("supplier.digest.title") is None
+    assert memory.translate("Unseen english sentence", "supplier.digest.title") is None
+    assert memory.for_key("risk.form.save_changes") == "Änderungen speichern"
+
+
+def test_translate_prefers_the_exact_message():
+    memory = _memory()
+    assert memory.translate("Save changes", "supplier.digest.title") == "Änderungen speichern"
+
+
+def test_trie_longest_respects_minimum():
+    trie = tm.Trie()
+    trie.add(["title"], "Titel")
+    trie.add(["title", "form"], "Formulartitel")
+    assert trie.longest(["title", "digest"]) == (1, "Titel")
+    assert trie.longest(["title", "digest"], minimum=2) is None
+    assert trie.longest(["title", "form", "x"], minimum=2) == (2, "Formulartitel")
@@ -2,9 +2,21 @@
 r"""
 Translate \0NoFill\ placeholders in YAML translation files.
 Generates context-aware translations based on key names and ISO standards.
+
+German placeholders reuse existing wording first: the translation memory
+(translation_memory.py) is asked for the EN message stored under the same
+key, then for the longest known key suffix of two or more segments; only
+what it cannot answer falls back to the word tables below.
+
+Usage:
+    python3 translate_nofill.py <file.yaml> [lang]
+    python3 translate_nofill.py --all        # every translations/*.yaml, one memory
 """
 import re
 import sys
+from pathlib import Path
+
+import translation_memory
 
 # Translation mappings based on key patterns - ISO 27001/27005/22301 compliant
 TRANSLATIONS_DE = {
@@ -372,6 +384,21 @@ TRANSLATIONS_EN = {
     'configuration': 'Configuration',
 }
 
+# Multi-word keys that read better as one German phrase than word by word
+SPECIFIC_TRANSLATIONS_DE = {
+    'edit_suffix': 'Bearbeitungssuffix',
+    'save_changes': 'Änderungen speichern',
+    'by_action': 'Nach Aktion',
+    'created_at': 'Erstellt am',
+    'updated_at': 'Aktualisiert am',
+    'last_login': 'Letzte Anmeldung',
+    'auth_provider': 'Authentifizierungsanbieter',
+    'new_user': 'Neuer Benutzer',
+    'active_users': 'Aktive Benutzer',
+    'logins_today': 'Anmeldungen heute',
+    'today_active': 'Heute aktiv',
+}
+
 def translate_key(key, lang='de'):
     """Generate translation based on key name."""
     translations = TRANSLATIONS_DE if lang == 'de' else TRANSLATIONS_EN
@@ -389,22 +416,8 @@ def translate_key(key, lang='de'):
         if len(words) >= 2:
             # Check common compound patterns
             combined_key = '_'.join(words)
-            # Add more specific translations for common patterns
-            specific_translations = {
-                'edit_suffix': 'Bearbeitungssuffix',
-                'save_changes': 'Änderungen speichern',
-                'by_action': 'Nach Aktion',
-                'created_at': 'Erstellt am',
-                'updated_at': 'Aktualisiert am',
-                'last_login': 'Letzte Anmeldung',
-                'auth_provider': 'Authentifizierungsanbieter',
-                'new_user': 'Neuer Benutzer',
-                'active_users': 'Aktive Benutzer',
-                'logins_today': 'Anmeldungen heute',
-                'today_active': 'Heute aktiv',
-            }
-            if combined_key in specific_translations:
-                return specific_translations[combined_key]
+            if combined_key in SPECIFIC_TRANSLATIONS_DE:
+                return SPECIFIC_TRANSLATIONS_DE[combined_key]
 
     # Try to translate each word
     translated_words = []
@@ -427,10 +440,23 @@ def translate_key(key, lang='de'):
     result = ' '.join(translated_words)
     return result
 
-def process_file(filename, lang='de'):
+def translate_entry(domain, key, full_path, lang='de', memory=None):
+    """DE from the translation memory where it knows the message, else from the key name."""
+    if lang == 'de' and memory is not None:
+        translation = memory.translate(memory.source(domain, full_path), full_path)
+        if translation:
+            return translation
+    # For dotted keys like "title.edit", extract the last part for translation
+    return translate_key(key.split('.')[-1], lang)
+
+
+def process_file(filename, lang='de', memory=None):
     """Process a YAML file and replace NoFill placeholders."""
     with open(filename, 'r', encoding='utf-8') as f:
         content = f.read()
+    if '\\0NoFill\\0' not in content:
+        return 0
+    domain = Path(filename).name.split('.')[0]
 
     # Pattern 1: Regular YAML keys including dotted like "key: "\0NoFill\0path"" or "title.edit: "\0NoFill\0path""
     pattern1 = r'(\s+)([\w.]+):\s*"\\0NoFill\\0([^"]+)"'
@@ -443,17 +469,11 @@ def process_file(filename, lang='de'):
         key = match.group(2)
         full_path = match.group(3)
 
-        # For dotted keys like "title.edit", extract the last part for translation
-        if '.' in key:
-            key_parts = key.split('.')
-            last_part = key_parts[-1]
-            translation = translate_key(last_part, lang)
-        else:
-            # Generate translation
-            translation = translate_key(key, lang)
+        translation = translate_entry(domain, key, full_path, lang, memory)
 
         # Return replaced line with proper quoting
-        if any(c in translation for c in [':',  '/', '-', '(']):
+        if any(c in translation for c in [':',  '/', '-', '(', '"', '%', '#']):
+            translation = translation.replace('\\', '\\\\').replace('"', '\\"')
             return f'{indent}{key}: "{translation}"'
         else:
             return f'{indent}{key}: {translation}'
@@ -476,18 +496,33 @@ def process_file(filename, lang='de'):
     count1 = content.count('\\0NoFill\\0') - count2 - new_content.count('\\0NoFill\\0')
 
     # Write back
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    if new_content != content:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(new_content)
 
     return count1 + count2
 
+def file_lang(filename):
+    return 'en' if '.en.yaml' in str(filename) else 'de'
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("Usage: python3 translate_nofill.py <file.yaml> [lang]")
+        print("Usage: python3 translate_nofill.py <file.yaml> [lang] | --all")
         sys.exit(1)
 
+    memory = translation_memory.load()
+    if sys.argv[1] == '--all':
+        total = 0
+        for path in sorted(translation_memory.TRANSLATIONS.glob('*.yaml')):
+            count = process_file(path, file_lang(path), memory)
+            if count:
+                print(f"Translated {count} NoFill placeholders in {path.name}")
+                total += count
+        print(f"Total: {total} NoFill placeholders")
+        sys.exit(0)
+
     filename = sys.argv[1]
-    lang = sys.argv[2] if len(sys.argv) > 2 else ('en' if '.en.yaml' in filename else 'de')
+    lang = sys.argv[2] if len(sys.argv) > 2 else file_lang(filename)
 
-    count = process_file(filename, lang)
+    count = process_file(filename, lang, memory)
     print(f"Translated {count} NoFill placeholders in {filename} ({lang})")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+r"""
+Translation memory over the translations/ catalogue.
+
+Every domain's *.en.yaml and *.de.yaml are flattened to key paths and paired
+key by key. A pair is approved when the DE message exists, is not a
+\0NoFill\ placeholder, is not just the EN text copied over and uses the
+same %placeholders% as the EN message. From the
+approved pairs the memory serves:
+
+  exact      EN message -> DE message (the wording most domains agree on)
+  phrases    trie over EN word sequences; a new EN string is covered
+             greedily by the longest known phrases
+  key        trie over reversed key segments; `x.form.save_changes` gets the
+             DE of the longest known suffix of at least KEY_SUFFIX segments
+             (`form.save_changes`); a lone last segment (`title`, `label`)
+             names no particular message, so it never matches
+
+The parsed catalogue is pickled to var/cache/translation_memory.pickle with
+each file's (mtime_ns, size); load() re-parses only the domains whose files
+changed since, so a fill run that rewrites a few domains feeds straight into
+the next one.
+
+Usage:
+    python3 scripts/translation_memory.py --stats
+    python3 scripts/translation_memory.py --lookup "Save Changes" [--key form.save]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+TRANSLATIONS = ROOT / 'translations'
+CACHE = ROOT / 'var' / 'cache' / 'translation_memory.pickle'
+FORMAT = 1
+MAX_PHRASE = 6  # words; the phrase trie holds labels, not sentences
+KEY_SUFFIX = 2  # segments a key match must share
+
+NOFILL = ('\x00NoFill', '\\0NoFill')
+# Words, with Symfony placeholders (%name%, {name}) kept whole.
+TOKEN = re.compile(r"%\w+%|\{\w+\}|\w+|[^\w\s]")
+PLACEHOLDER = re.compile(r"%\w+%|\{\w+\}")
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def flatten(data, prefix=''):
+    """{dotted.key: message} for every scalar leaf of a parsed catalogue."""
+    out = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(value, dict):
+                out.update(flatten(value, path))
+            elif isinstance(value, str):
+                out[path] = value
+    return out
+
+
+def read_catalogue(path):
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return flatten(yaml.load(fh, Loader=_Loader) or {})
+    except (OSError, yaml.YAMLError):
+        return {}
+
+
+def is_placeholder(message):
+    return any(marker in message for marker in NOFILL)
+
+
+def tokens(text):
+    return TOKEN.findall(text.lower())
+
+
+def placeholders(text):
+    return sorted(PLACEHOLDER.findall(text))
+
+
+class Trie:
+    """Nested-dict trie; a node's value sits under the key None (a Counter
+    of candidates until the first lookup picks the most common)."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, seq, value):
+        node = self.root
+        for item in seq:
+            node = node.setdefault(item, {})
+        node.setdefault(None, Counter())[value] += 1
+
+    def longest(self, seq, start=0, minimum=1):
+        """(end, value) of the longest stored prefix of seq[start:] that is
+        at least `minimum` items long, or None."""
+        node, best = self.root, None
+        for i in range(start, len(seq)):
+            node = node.get(seq[i])
+            if node is None:
+                break
+            votes = node.get(None)
+            if votes is not None and i + 1 - start >= minimum:
+                if isinstance(votes, Counter):  # resolved on first use
+                    votes = node[None] = votes.most_common(1)[0][0]
+                best = (i + 1, votes)
+        return best
+
+
+class Memory:
+    def __init__(self, domains):
+        self.domains = domains  # domain -> (en {key: msg}, de {key: msg})
+        votes = {}
+        self.phrases, self.keys = Trie(), Trie()
+        for domain in sorted(domains):
+            en, de = domains[domain]
+            for key, source in en.items():
+                target = de.get(key)
+                if (not target or target == source or is_placeholder(target) or is_placeholder(source)
+                        or placeholders(target) != placeholders(source)):
+                    continue
+                votes.setdefault(source, Counter())[target] += 1
+                words = tokens(source)
+                if len(words) <= MAX_PHRASE:  # longer messages only match exactly
+                    self.phrases.add(words, target)
+                self.keys.add(reversed(key.split('.')), target)
+        self.exact = {source: c.most_common(1)[0][0] for source, c in votes.items()}
+
+    def source(self, domain, key):
+        """The EN message stored for `key` in `domain`, if any."""
+        en = self.domains.get(domain, ({}, {}))[0].get(key)
+        return None if en is None or is_placeholder(en) else en
+
+    def phrase(self, text):
+        """DE for `text` composed of known phrases, or None if a word is unknown."""
+        seq, parts, i = tokens(text), [], 0
+        while i < len(seq):
+            hit = self.phrases.longest(seq, i)
+            if hit is None:
+                return None
+            i, target = hit
+            parts.append(target)
+        return ' '.join(parts) or None
+
+    def for_key(self, key):
+        hit = self.keys.longest(key.split('.')[::-1], minimum=KEY_SUFFIX)
+        return hit[1] if hit else None
+
+    def translate(self, source=None, key=None):
+        """Best DE for an EN message and/or key path: exact wording first,
+        then a phrase cover, then the longest known key suffix."""
+        if source:
+            target = self.exact.get(source) or self.phrase(source)
+            if target:
+                return target
+        return self.for_key(key) if key else None
+
+
+def _stamp(path):
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load(translations=TRANSLATIONS, cache=CACHE):
+    """The memory for `translations`, re-parsing only domains changed since
+    the cached copy was written."""
+    translations, cache = Path(translations), Path(cache)
+    stamps, domains = {}, {}
+    try:
+        with open(cache, 'rb') as fh:
+            fmt, where, stamps, domains = pickle.load(fh)
+        if fmt != FORMAT or where != str(translations):
+            stamps, domains = {}, {}
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+        pass
+
+    current = {}
+    for path in translations.glob('*.en.yaml'):
+        domain = path.name[:-len('.en.yaml')]
+        current[domain] = (_stamp(path), _stamp(translations / f"{domain}.de.yaml"))
+    dirty = {d for d, stamp in current.items() if stamps.get(d) != stamp} | (domains.keys() - current.keys())
+    for domain in dirty:
+        domains.pop(domain, None)
+        if domain in current:
+            domains[domain] = (read_catalogue(translations / f"{domain}.en.yaml"),
+                               read_catalogue(translations / f"{domain}.de.yaml"))
+    if dirty:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as fh:
+            pickle.dump((FORMAT, str(translations), current, domains), fh, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    return Memory(domains)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--stats', action='store_true', help='print the size of the memory')
+    ap.add_argument('--lookup', metavar='EN', help='translate an EN message')
+    ap.add_argument('--key', help='key path to fall back on for --lookup')
+    args = ap.parse_args()
+
+    memory = load()
+    if args.stats or not (args.lookup or args.key):
+        print(f"{len(memory.domains)} domains, {len(memory.exact)} approved EN -> DE messages")
+    if args.lookup or args.key:
+        target = memory.translate(args.lookup, args.key)
+        if target is None:
+            print('no match', file=sys.stderr)
+            return 1
+        print(target)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Run every template/CSS fixer in one pass (codemod.py).
+
+Each file under templates/ and assets/styles/ is read once; the rules that
+apply to it run in the order of SWEEP below (markup migrations first, then
+card/heading structure, then accessibility attributes, then CSS), and a
+changed file is written once, atomically.
+
+Usage:
+    python3 scripts/ui_audit_sweep.py --dry-run            # unified diff only
+    python3 scripts/ui_audit_sweep.py --rules badge-bs5-syntax,card-classes
+    python3 scripts/ui_audit_sweep.py --list
+"""
+import argparse
+import importlib
+import sys
+
+from codemod import parse_args, report, run
+
+SWEEP = [
+    'fix_fa_alert_body',
+    'fix_badge_syntax',
+    'standardize_card_classes',
+    'fix_card_headers',
+    'fix_heading_hierarchy',
+    'standardize_button_groups',
+    'fix_aria_labels',
+    'add_sticky_headers',
+    'fix_dark_mode_colors',
+    'standardize_breakpoints',
+]
+
+
+def sweep_rules() -> list:
+    return [rule for module in SWEEP for rule in importlib.import_module(module).RULES]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--rules', default='', help='comma-separated rule names (default: all, in sweep order)')
+    ap.add_argument('--list', action='store_true', help='list the rules in sweep order')
+    args = parse_args(__doc__, ap=ap)
+
+    rules = sweep_rules()
+    if args.list:
+        for rule in rules:
+            print(f"{rule.name:24} {rule.root}/{'**/' if rule.recursive else ''}{rule.pattern}")
+        return 0
+    if args.rules:
+        wanted = [n.strip() for n in args.rules.split(',') if n.strip()]
+        unknown = set(wanted) - {r.name for r in rules}
+        if unknown:
+            print(f"ui_audit_sweep: unknown rule(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+        rules = [r for r in rules if r.name in wanted]
+
+    return report(run(rules, dry_run=args.dry_run, jobs=args.jobs), rules, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -27,13 +27,25 @@ EXISTING catalogue fixtures (fixtures/library/catalogues/bsi-it-grundschutz-2023
 NO hand-transcription, NO LLM-generated requirement text. All Anforderung titles and
 requirement texts come verbatim from the XML <para> nodes (whitespace-normalised).
 Real umlauts from the XML are preserved. ENTFALLEN/withdrawn requirements are skipped.
+
+The XML is streamed with iterparse (see iter_layer_chapters): each layer chapter
+is handed to a worker process as soon as it has been read (layers are built in
+parallel) and released. Each worker compares the content hash of its YAML with
+the existing fixture and only rewrites files that changed; the summary lists
+added/removed/changed Anforderungen per Baustein. All paths are CLI
+arguments; the /tmp/gs constants below are only their defaults:
+
+  python3 var/panel/gs_xml_parse.py --xml XML_Kompendium_2023.xml \
+      --inventory baustein_inventory.json --src-tmpl 'src_{}.yml' --out-tmpl ''
 """
+import hashlib
 import json
 import os
 import re
 import sys
 import xml.etree.ElementTree as ET
 
+# CLI defaults (override with --xml / --src-tmpl / --inventory / --out-tmpl).
 XML_PATH = "/tmp/gs/XML_Kompendium_2023.xml"
 SRC_TMPL = "/tmp/gs/src_{}.yml"
 INVENTORY_PATH = "/tmp/gs/baustein_inventory.json"
@@ -123,6 +135,39 @@ def find_layer_chapters(root):
     return out
 
 
+def _chapter_layer(chap):
+    title_el = chap.find(DB + "title")
+    if title_el is None or not title_el.text:
+        return None
+    code = title_el.text.strip().split()[0]
+    return code if code in LAYERS else None
+
+
+def iter_layer_chapters(xml_path):
+    """Stream (layer-code, chapter element) pairs straight from the XML file.
+
+    iterparse-driven alternative to ET.parse + find_layer_chapters: a layer
+    chapter is yielded as soon as its end tag is read, then cleared and detached
+    from its parent, so peak memory is bounded by the largest chapter rather
+    than the whole Kompendium. Non-layer chapters are dropped the same way.
+    The yielded element is only valid until the generator resumes.
+    """
+    stack = []
+    for event, el in ET.iterparse(xml_path, events=("start", "end")):
+        if event == "start":
+            stack.append(el)
+            continue
+        stack.pop()
+        if el.tag != DB + "chapter":
+            continue
+        code = _chapter_layer(el)
+        if code is not None:
+            yield code, el
+        el.clear()
+        if stack:
+            stack[-1].remove(el)
+
+
 def iter_sections(parent):
     """Yield direct-child <section> elements."""
     for child in parent:
@@ -319,76 +364,199 @@ def emit_layer_yaml(header_lines, layer_meta, bausteine, layer):
     return "\n".join(lines).rstrip() + "\n"
 
 
-def main():
-    import yaml
+def load_official_by_layer(inventory_path):
+    """Return (official {baustein_id: title}, {layer: [baustein_id, ...]})."""
     from collections import defaultdict
 
-    tree = ET.parse(XML_PATH)
-    root = tree.getroot()
-    chapters = find_layer_chapters(root)
-
-    inventory = json.load(open(INVENTORY_PATH, encoding="utf-8"))
+    with open(inventory_path, encoding="utf-8") as fh:
+        inventory = json.load(fh)
     official = inventory["official"]  # {baustein_id: title} — the 111 authoritative Bausteine
 
     # group official Bausteine by layer, preserving inventory order
     official_by_layer = defaultdict(list)
     for bid in official:
         official_by_layer[bid.split(".")[0]].append(bid)
+    return official, official_by_layer
 
-    report = {}
-    for layer in LAYERS:
-        # preserve layer-level meta + header comments from the EXISTING fixture
-        fixture_path = FIXTURE_TMPL.format(layer)
-        header_lines = _header_comment_lines(fixture_path)
-        existing = {}
-        if os.path.exists(fixture_path):
-            existing = yaml.safe_load(open(fixture_path, encoding="utf-8")) or {}
-        layer_meta = {
-            "layer": existing.get("layer", layer),
-            "title": existing.get("title", layer),
-            "description": existing.get("description", ""),
+
+def _load_fixture(fixture_path):
+    import yaml
+
+    if not os.path.exists(fixture_path):
+        return {}
+    with open(fixture_path, encoding="utf-8") as fh:
+        return yaml.safe_load(fh) or {}
+
+
+def build_layer(layer, chap, official, official_ids, fixture_path, src_path, existing=None):
+    """Parse one layer chapter into (yaml_text, bausteine).
+
+    `existing` is the already-loaded fixture document (loaded here when None).
+    """
+    import yaml
+
+    # preserve layer-level meta + header comments from the EXISTING fixture
+    header_lines = _header_comment_lines(fixture_path)
+    if existing is None:
+        existing = _load_fixture(fixture_path)
+    layer_meta = {
+        "layer": existing.get("layer", layer),
+        "title": existing.get("title", layer),
+        "description": existing.get("description", ""),
+    }
+    # build a lookup of old src descriptions by baustein id (to reuse where present)
+    src_desc = {}
+    try:
+        with open(src_path, encoding="utf-8") as fh:
+            src_doc = yaml.safe_load(fh)
+        for b in src_doc.get("bausteine", []):
+            src_desc[b["id"]] = b.get("description", "")
+    except FileNotFoundError:
+        pass
+
+    bindex = build_baustein_index(chap, layer)
+
+    bausteine = []
+    for bid in official_ids:
+        bsec = bindex.get(bid)
+        tiers = parse_baustein(bsec, bid) if bsec is not None else {"basis": [], "standard": [], "hoch": []}
+        # description: reuse old src description if present, else derive from XML
+        desc = src_desc.get(bid, "").strip()
+        if not desc:
+            desc = baustein_description(bsec)
+        bausteine.append({
+            "id": bid,
+            "title": official[bid],
+            "description": desc,
+            "tiers": tiers,
+        })
+
+    return emit_layer_yaml(header_lines, layer_meta, bausteine, layer), bausteine
+
+
+def anforderung_diff(existing, bausteine):
+    """Per-Baustein {added, removed, changed} Anforderung ids vs. the old fixture.
+
+    'changed' means same id but a different title or requirement_text. Bausteine
+    without any difference are omitted.
+    """
+    def index(bs):
+        out = {}
+        for b in bs or []:
+            anf = {}
+            for tier in ("basis", "standard", "hoch"):
+                for it in (b.get("tiers") or b.get("anforderungen") or {}).get(tier) or []:
+                    anf[it["id"]] = (it.get("title"), it.get("requirement_text"))
+            out[b["id"]] = anf
+        return out
+
+    old, new = index(existing.get("bausteine")), index(bausteine)
+    diff = {}
+    for bid in list(new) + [b for b in old if b not in new]:
+        o, n = old.get(bid, {}), new.get(bid, {})
+        entry = {
+            "added": [a for a in n if a not in o],
+            "removed": [a for a in o if a not in n],
+            "changed": [a for a in n if a in o and n[a] != o[a]],
         }
-        # build a lookup of old src descriptions by baustein id (to reuse where present)
-        src_desc = {}
-        try:
-            src_doc = yaml.safe_load(open(SRC_TMPL.format(layer), encoding="utf-8"))
-            for b in src_doc.get("bausteine", []):
-                src_desc[b["id"]] = b.get("description", "")
-        except FileNotFoundError:
-            pass
-
-        chap = chapters.get(layer)
-        if chap is None:
+        if any(entry.values()):
+            diff[bid] = entry
+    return diff
+
+
+def _write_if_changed(path, data):
+    """Write only when the content hash differs from what is on disk."""
+    new_digest = hashlib.sha256(data).hexdigest()
+    try:
+        with open(path, "rb") as fh:
+            if hashlib.sha256(fh.read()).hexdigest() == new_digest:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as fh:
+        fh.write(data)
+    return True
+
+
+def layer_job(job):
+    """Pool worker: rebuild one layer from its serialized chapter.
+
+    Returns (layer, bausteine, fixture_written, diff). The chapter travels as
+    XML bytes so the parent can release its element right after submitting.
+    """
+    layer, chapter_xml, official, official_ids, fixture_path, src_path, out_path = job
+    existing = _load_fixture(fixture_path)
+    out, bausteine = build_layer(layer, ET.fromstring(chapter_xml), official, official_ids,
+                                 fixture_path, src_path, existing=existing)
+    data = out.encode("utf-8")
+    if out_path:
+        _write_if_changed(out_path, data)
+    written = _write_if_changed(fixture_path, data)
+    return layer, bausteine, written, anforderung_diff(existing, bausteine) if written else {}
+
+
+def parse_args(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Regenerate BSI IT-Grundschutz layer YAMLs from the Kompendium XML.")
+    ap.add_argument("--xml", default=XML_PATH, help="DocBook Kompendium XML")
+    ap.add_argument("--inventory", default=INVENTORY_PATH, help="baustein_inventory.json ('official' map)")
+    ap.add_argument("--src-tmpl", default=SRC_TMPL, help="old src fixture per layer ('{}' = layer code)")
+    ap.add_argument("--out-tmpl", default=OUT_TMPL, help="scratch copy per layer; '' to skip")
+    ap.add_argument("--fixture-tmpl", default=FIXTURE_TMPL, help="repository fixture per layer")
+    ap.add_argument("--workers", type=int, default=0, help="layer worker processes (0 = CPU count, 1 = inline)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    """Returns (report {layer: bausteine}, changes {layer: diff or None if unchanged})."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    args = parse_args(argv)
+    official, official_by_layer = load_official_by_layer(args.inventory)
+
+    def jobs():
+        # Stream the Kompendium: each layer chapter is serialized and handed off
+        # as soon as it has been read, then released before the next one.
+        for layer, chap in iter_layer_chapters(args.xml):
+            ids = official_by_layer[layer]
+            yield (layer, ET.tostring(chap), {bid: official[bid] for bid in ids}, ids,
+                   args.fixture_tmpl.format(layer), args.src_tmpl.format(layer),
+                   args.out_tmpl.format(layer) if args.out_tmpl else "")
+
+    workers = args.workers or min(len(LAYERS), os.cpu_count() or 1)
+    if workers <= 1:
+        results = map(layer_job, jobs())
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = [pool.submit(layer_job, job) for job in jobs()]
+        pool.shutdown(wait=True)
+        results = [f.result() for f in results]
+
+    report, changes = {}, {}
+    for layer, bausteine, written, diff in results:
+        report[layer] = bausteine
+        changes[layer] = diff if written else None
+        print("%s %s (%d bausteine)" % ("wrote" if written else "unchanged", layer, len(bausteine)),
+              file=sys.stderr)
+
+    for layer in LAYERS:
+        if layer not in report:
             print("WARN: no XML chapter for layer %s" % layer, file=sys.stderr)
-            continue
-        bindex = build_baustein_index(chap, layer)
-
-        bausteine = []
-        for bid in official_by_layer[layer]:
-            bsec = bindex.get(bid)
-            tiers = parse_baustein(bsec, bid) if bsec is not None else {"basis": [], "standard": [], "hoch": []}
-            # description: reuse old src description if present, else derive from XML
-            desc = src_desc.get(bid, "").strip()
-            if not desc:
-                desc = baustein_description(bsec)
-            bausteine.append({
-                "id": bid,
-                "title": official[bid],
-                "description": desc,
-                "tiers": tiers,
-            })
+    return report, changes
 
-        out = emit_layer_yaml(header_lines, layer_meta, bausteine, layer)
-        open(OUT_TMPL.format(layer), "w", encoding="utf-8").write(out)
-        open(fixture_path, "w", encoding="utf-8").write(out)
-        report[layer] = bausteine
 
-    return report
+def print_changes(changes):
+    """Added/removed/changed Anforderungen per Baustein for every rewritten layer."""
+    touched = [l for l in LAYERS if changes.get(l) is not None]
+    print("fixtures rewritten: %d of %d layer(s)" % (len(touched), len(changes)))
+    for layer in touched:
+        for bid, d in changes[layer].items():
+            parts = ["%s %s" % (k, ",".join(d[k])) for k in ("added", "removed", "changed") if d[k]]
+            print("  %-12s %s" % (bid, "; ".join(parts)))
 
 
-if __name__ == "__main__":
-    rep = main()
-    # summary
+def print_summary(rep):
     tb = ts = th = 0
     print("layer  bausteine  basis  standard  hoch")
     for layer in LAYERS:
@@ -402,4 +570,10 @@ if __name__ == "__main__":
         print("%-6s %9d %6d %9d %5d" % (layer, len(bs), b, s, h))
     total_b = sum(len(rep.get(l, [])) for l in LAYERS)
     print("TOTAL  %9d %6d %9d %5d   (anforderungen=%d)" % (total_b, tb, ts, th, tb + ts + th))
+
+
+if __name__ == "__main__":
+    rep, changes = main()
+    print_summary(rep)
+    print_changes(changes)
     print("done")